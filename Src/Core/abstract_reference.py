@@ -57,6 +57,12 @@ class abstact_reference(ABC, abstract_subscriber):
     def __str__(self):
         return self.unique_code
 
+    """
+    События, на которые подписана модель: изменение и проверка зависимостей
+    """
+    def events(self) -> list:
+        return [event_type.update_dependencies(), event_type.check_dependencies()]
+
     """
     Обработка событий наблюдателя
     """
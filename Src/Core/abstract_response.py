@@ -1,9 +1,25 @@
 import abc
 from Src.Core.validator import validator, operation_exception
+from Src.Core.field_projection import field_projection
+from Src.Core.query_view import query_view
+from Src.Core.column_plan import column_plan
+import itertools
 
 
 # Абстрактный класс для формирования ответов
 class abstract_response(abc.ABC):
+    __projection: field_projection = None
+
+    # Проекция полей (None - выводятся все поля модели)
+    @property
+    def projection(self) -> field_projection:
+        return self.__projection
+
+    @projection.setter
+    def projection(self, value: field_projection):
+        if value is not None:
+            validator.validate(value, field_projection)
+        self.__projection = value
 
     # Сформировать нужный ответ
     @abc.abstractmethod
@@ -13,4 +29,39 @@ class abstract_response(abc.ABC):
         if len(data) == 0:
             raise operation_exception("Нет данных!")
 
-        return ""
\ No newline at end of file
+        return ""
+
+    # Сформировать ответ частями (итератор строк).
+    # Данные проверяются сразу, части формируются по мере чтения
+    def stream(self, data):
+        items = abstract_response.iterate(data)
+        return self.chunks(items)
+
+    # Части ответа по итератору элементов (форматы переопределяют для потоковой выдачи)
+    def chunks(self, items):
+        yield self.build(list(items))
+
+    # Итератор по данным ответа с проверкой, что данные есть
+    @staticmethod
+    def iterate(data):
+        if not isinstance(data, query_view):
+            validator.validate(data, (list, tuple))
+
+        items = iter(data)
+        first = next(items, None)
+        if first is None:
+            raise operation_exception("Нет данных!")
+
+        return itertools.chain([first], items)
+
+    # Материализовать данные: ленивый запрос выполняется только при формировании ответа
+    @staticmethod
+    def materialize(data) -> list:
+        if isinstance(data, query_view):
+            return data.to_list()
+
+        return data
+
+    # План колонок ответа по образцу элемента: выбранные поля или все поля модели
+    def plan(self, item) -> column_plan:
+        return column_plan.compile(item, self.__projection)
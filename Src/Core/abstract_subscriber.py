@@ -5,11 +5,16 @@ from Src.Core.event_type import event_type
 from Src.Core.validator import validator, operation_exception
 
 class abstract_subscriber:
+    """
+    События, на которые подписывается обработчик (по умолчанию - все события)
+    """
+    def events(self) -> list:
+        return event_type.events()
+
     """
     Обработка события
     """
     def handle(self, event: str, params):
         validator.validate(event, str)
-        events = event_type.events()
-        if event not in events:
+        if not event_type.is_event(event):
             raise operation_exception(f"{event} - не является событием!")
@@ -0,0 +1,21 @@
+from enum import Enum
+
+"""
+Перечисление агрегатных функций для группировки данных
+"""
+class AggregateType(Enum):
+    COUNT = "COUNT"             # Количество элементов
+    SUM = "SUM"                 # Сумма
+    MIN = "MIN"                 # Минимум
+    MAX = "MAX"                 # Максимум
+    AVG = "AVG"                 # Среднее
+
+    @classmethod
+    def get_all_types(cls) -> list:
+        """
+        Возвращает список всех агрегатных функций
+
+        Returns:
+            list: список значений перечисления
+        """
+        return [member.value for member in cls]
@@ -0,0 +1,99 @@
+from Src.Core.validator import validator
+from Src.Core.field_projection import field_projection
+from Src.Core.common import common
+import operator
+
+"""
+Скомпилированный план колонок для табличных форматов ответа.
+Колонки определяются один раз (выбранные поля или все поля модели),
+значения читаются готовым getter'ом, а способ преобразования значения
+в текст выбирается по типу значения один раз и запоминается
+"""
+class column_plan:
+    __columns: list = []
+
+    def __init__(self, columns: list, projection: field_projection = None):
+        validator.validate(columns, list)
+        self.__columns = columns
+        self.__projection = projection
+        self.__texts = {}
+
+        if projection is not None:
+            self.__read = lambda item: [value if value is not None else "" for value in projection.values(item)]
+        elif len(columns) == 0:
+            self.__read = lambda item: []
+        elif len(columns) == 1:
+            getter = operator.attrgetter(columns[0])
+            self.__read = lambda item: [getter(item)]
+        else:
+            getter = operator.attrgetter(*columns)
+            self.__read = lambda item: list(getter(item))
+
+    @property
+    def columns(self) -> list:
+        """
+        Наименования колонок
+        """
+        return self.__columns
+
+    @staticmethod
+    def compile(item, projection: field_projection = None) -> "column_plan":
+        """
+        Построить план колонок по образцу элемента
+
+        Args:
+            item: образец элемента данных
+            projection (field_projection): проекция полей или None - все поля модели
+
+        Returns:
+            column_plan: план колонок
+        """
+        if projection is not None:
+            validator.validate(projection, field_projection)
+            projection.validate(item)
+            return column_plan(projection.fields, projection)
+
+        return column_plan(common.get_fields(item))
+
+    def values(self, item) -> list:
+        """
+        Значения колонок элемента
+        """
+        try:
+            return self.__read(item)
+        except AttributeError:
+            # У элемента нет части полей - читаем по одному
+            return [getattr(item, field, "") for field in self.__columns]
+
+    def texts(self, item) -> list:
+        """
+        Значения колонок элемента в виде строк.
+        Сложные объекты заменяются наименованием или кодом
+        """
+        converters = self.__texts
+        result = []
+        for value in self.values(item):
+            value_type = value.__class__
+            if value_type is str:
+                result.append(value)
+                continue
+
+            convert = converters.get(value_type, False)
+            if convert is False:
+                convert = column_plan.__text_convert(value)
+                converters[value_type] = convert
+            result.append(str(value) if convert is None else convert(value))
+
+        return result
+
+    @staticmethod
+    def __text_convert(value):
+        """
+        Функция преобразования значения в строку для типа значения (None - str)
+        """
+        # Преобразуем сложные объекты в строки
+        if hasattr(value, 'name'):
+            return lambda item: str(item.name)
+        if hasattr(value, 'unique_code'):
+            return lambda item: str(item.unique_code)
+        return None
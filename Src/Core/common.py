@@ -4,6 +4,7 @@ from Src.Core.validator import argument_exception
 
 # Набор статических общих методов
 class common:
+    __schemas: dict = {}
 
     """
     Получить список наименований всех моделей
@@ -26,18 +27,41 @@ class common:
         if source is None:
             raise argument_exception("Некорректно переданы аргументы!")
 
-        items = list(filter(lambda x: not x.startswith("_") , dir(source)))
+        fields = common.get_schema(source.__class__)
+        if is_common == False:
+            return list(fields)
+
         result = []
+        for item in fields:
+            value = getattr(source, item)
+
+            # Флаг. Только простые типы и модели включать
+            if isinstance(value, dict) or isinstance(value, list):
+                continue
 
-        for item in items:
-            attribute = getattr(source.__class__, item)
-            if isinstance(attribute, property):
-                value = getattr(source, item)
+            result.append(item)
 
-                # Флаг. Только простые типы и модели включать
-                if is_common == True and (isinstance(value, dict) or isinstance(value, list) ):
-                    continue
+        return result
+
+    """
+    Получить список свойств класса (вычисляется один раз для каждого класса)
+    """
+    @staticmethod
+    def get_schema(source_type: type) -> tuple:
+        schema = common.__schemas.get(source_type)
+        if schema is None:
+            items = filter(lambda x: not x.startswith("_"), dir(source_type))
+            schema = tuple(item for item in items if isinstance(getattr(source_type, item), property))
+            common.__schemas[source_type] = schema
 
-                result.append(item)
+        return schema
 
-        return result
\ No newline at end of file
+    """
+    Сбросить список свойств класса после его изменения (без аргумента - для всех классов)
+    """
+    @staticmethod
+    def reset_schema(source_type: type = None):
+        if source_type is None:
+            common.__schemas.clear()
+        else:
+            common.__schemas.pop(source_type, None)
@@ -0,0 +1,280 @@
+from Src.Core.validator import validator
+from Src.Core.filter_type import FilterType
+from Src.Core.filter_operator import FilterOperator
+from Src.Dtos.filter_dto import filter_dto
+from Src.Dtos.filter_group_dto import filter_group_dto
+from datetime import datetime
+import operator
+
+"""
+Скомпилированный набор фильтров.
+Все фильтры разбираются один раз: путь к полю превращается в готовый getter,
+значение фильтра заранее приводится к строке, числу и дате, для каждого
+типа сравнения подбирается специализированная функция. Результат - один предикат,
+проверяющий элемент за один проход по всем фильтрам.
+Группы фильтров (И / ИЛИ / НЕ) компилируются в предикаты с ранним выходом
+"""
+class compiled_filter:
+    __checks: list = []
+
+    # Операторы для сравнений на больше / меньше
+    __operators = {
+        FilterType.GREATER: operator.gt,
+        FilterType.GREATER_EQUAL: operator.ge,
+        FilterType.LESS: operator.lt,
+        FilterType.LESS_EQUAL: operator.le
+    }
+
+    def __init__(self, filters: list):
+        validator.validate(filters, list)
+        self.__specs = [compiled_filter.__compile_spec(item) for item in filters]
+        self.__checks = [compiled_filter.__make_check(spec) for spec in self.__specs]
+
+    @property
+    def checks(self) -> list:
+        """
+        Список предикатов отдельных фильтров
+        """
+        return self.__checks
+
+    def __call__(self, item) -> bool:
+        """
+        Проверяет элемент по всем фильтрам (логическое И с ранним выходом)
+        """
+        for check in self.__checks:
+            if not check(item):
+                return False
+        return True
+
+    def apply(self, data) -> list:
+        """
+        Отбирает элементы, прошедшие все фильтры, за один проход
+
+        Args:
+            data: исходные данные
+
+        Returns:
+            list: отфильтрованные данные
+        """
+        if len(self.__checks) == 0:
+            return data if isinstance(data, list) else list(data)
+
+        check = self.matcher()
+        return [item for item in data if check(item)]
+
+    def matcher(self):
+        """
+        Создает предикат для одного прохода по данным.
+        На время прохода результаты по вложенным объектам запоминаются:
+        у тысяч транзакций обычно одна и та же номенклатура
+
+        Returns:
+            функция item -> bool
+        """
+        checks = [compiled_filter.__make_check(spec, True) for spec in self.__specs]
+
+        if len(checks) == 0:
+            return lambda item: True
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def matches(item) -> bool:
+            for check in checks:
+                if not check(item):
+                    return False
+            return True
+
+        return matches
+
+    @staticmethod
+    def getter(field_name: str):
+        """
+        Создает функцию получения значения поля (поддерживаются вложенные поля через "/")
+
+        Args:
+            field_name (str): наименование поля
+
+        Returns:
+            функция item -> значение поля
+        """
+        validator.validate(field_name, str)
+        return operator.attrgetter(".".join(field_name.split("/")))
+
+    @staticmethod
+    def compile_one(source):
+        """
+        Компилирует один фильтр или группу фильтров в предикат
+
+        Args:
+            source (filter_dto | filter_group_dto): DTO фильтра или группы
+
+        Returns:
+            функция item -> bool
+        """
+        return compiled_filter.__make_check(compiled_filter.__compile_spec(source))
+
+    @staticmethod
+    def __compile_spec(source) -> tuple:
+        """
+        Разбирает фильтр: getter первого уровня, getter остатка пути и функция сравнения.
+        Группа разбирается в пару (оператор, список разобранных элементов)
+        """
+        validator.validate(source, (filter_dto, filter_group_dto))
+        if isinstance(source, filter_group_dto):
+            return (source.operator, [compiled_filter.__compile_spec(item) for item in source.filters])
+
+        parts = source.field_name.split("/")
+        compare = compiled_filter.comparator(source.value, source.type)
+
+        if len(parts) == 1:
+            return (operator.attrgetter(parts[0]), None, compare)
+
+        return (operator.attrgetter(parts[0]), operator.attrgetter(".".join(parts[1:])), compare)
+
+    @staticmethod
+    def __make_check(spec: tuple, memoize: bool = False):
+        """
+        Создает предикат по разобранному фильтру.
+        При memoize результат для вложенного объекта вычисляется один раз
+        """
+        if isinstance(spec[0], FilterOperator):
+            return compiled_filter.__make_group_check(spec, memoize)
+
+        get_first, get_rest, compare = spec
+
+        if get_rest is None:
+            def check(item) -> bool:
+                try:
+                    return compare(get_first(item))
+                except Exception:
+                    return False
+
+            return check
+
+        def evaluate(owner) -> bool:
+            try:
+                return compare(get_rest(owner))
+            except Exception:
+                return False
+
+        if not memoize:
+            def check(item) -> bool:
+                try:
+                    owner = get_first(item)
+                except Exception:
+                    return False
+                return evaluate(owner)
+
+            return check
+
+        # id объекта -> (объект, результат): объект удерживается в памяти,
+        # поэтому его id не может достаться другому объекту, пока жив предикат
+        memo = {}
+
+        def check_memo(item) -> bool:
+            try:
+                owner = get_first(item)
+            except Exception:
+                return False
+
+            entry = memo.get(id(owner))
+            if entry is None or entry[0] is not owner:
+                entry = (owner, evaluate(owner))
+                memo[id(owner)] = entry
+            return entry[1]
+
+        return check_memo
+
+    @staticmethod
+    def __make_group_check(spec: tuple, memoize: bool):
+        """
+        Создает предикат группы: И / ИЛИ с ранним выходом, НЕ - отрицание
+        """
+        group_operator, items = spec
+        checks = [compiled_filter.__make_check(item, memoize) for item in items]
+
+        if group_operator == FilterOperator.NOT:
+            inner = checks[0] if len(checks) == 1 else compiled_filter.__make_group_check((FilterOperator.AND, items), memoize)
+            return lambda item: not inner(item)
+
+        if len(checks) == 1:
+            return checks[0]
+
+        if group_operator == FilterOperator.OR:
+            def check_any(item) -> bool:
+                for check in checks:
+                    if check(item):
+                        return True
+                return False
+
+            return check_any
+
+        def check_all(item) -> bool:
+            for check in checks:
+                if not check(item):
+                    return False
+            return True
+
+        return check_all
+
+    @staticmethod
+    def comparator(filter_value, filter_type: FilterType):
+        """
+        Создает функцию сравнения значения поля со значением фильтра.
+        Значение фильтра разбирается один раз
+
+        Args:
+            filter_value: значение фильтра
+            filter_type (FilterType): тип операции сравнения
+
+        Returns:
+            функция значение поля -> bool
+        """
+        text = str(filter_value)
+
+        if filter_type == FilterType.EQUALS:
+            return lambda value: (value if type(value) is str else str(value)) == text
+
+        if filter_type == FilterType.NOT_EQUAL:
+            return lambda value: (value if type(value) is str else str(value)) != text
+
+        if filter_type == FilterType.LIKE:
+            needle = text.lower()
+            return lambda value: needle in (value if type(value) is str else str(value)).lower()
+
+        compare = compiled_filter.__operators.get(filter_type)
+        if compare is None:
+            return lambda value: str(value) == text
+
+        try:
+            number = float(filter_value)
+        except (ValueError, TypeError):
+            number = None
+
+        try:
+            moment = datetime.fromisoformat(text)
+        except (ValueError, TypeError):
+            moment = None
+
+        def compare_value(value) -> bool:
+            value_type = type(value)
+
+            # Числа сравниваем напрямую
+            if number is not None and (value_type is float or value_type is int or value_type is bool):
+                return compare(value, number)
+
+            # Даты сравниваем хронологически
+            if moment is not None and value_type is datetime:
+                return compare(value, moment)
+
+            if number is not None and value_type is not datetime:
+                try:
+                    return compare(float(value), number)
+                except (ValueError, TypeError):
+                    pass
+
+            # Строковое сравнение как fallback
+            return compare(value if value_type is str else str(value), text)
+
+        return compare_value
@@ -2,6 +2,9 @@
 Типы событий для системы наблюдателей
 """
 class event_type:
+    # Наименования всех событий (вычисляются один раз)
+    __events: frozenset = None
+
     """
     Событие - смена даты блокировки
     """
@@ -70,11 +73,21 @@ class event_type:
     """
     @staticmethod
     def events() -> list:
-        result = []
-        methods = [method for method in dir(event_type) if
-                    callable(getattr(event_type, method)) and not method.startswith('__') and method != "events"]
-        for method in methods:
-            key = getattr(event_type, method)()
-            result.append(key)
+        return sorted(event_type.__names())
+
+    """
+    Проверить, что строка является событием
+    """
+    @staticmethod
+    def is_event(event: str) -> bool:
+        return event in event_type.__names()
+
+    @staticmethod
+    def __names() -> frozenset:
+        if event_type.__events is None:
+            methods = [method for method in dir(event_type) if
+                        callable(getattr(event_type, method)) and not method.startswith('_')
+                        and method not in ["events", "is_event"]]
+            event_type.__events = frozenset(getattr(event_type, method)() for method in methods)
 
-        return result
+        return event_type.__events
@@ -0,0 +1,98 @@
+from Src.Core.validator import validator, argument_exception
+from Src.Core.common import common
+import operator
+import typing
+
+"""
+Проекция полей модели для формирования ответов.
+Список выбранных полей (вложенные через "/") компилируется один раз
+в набор getter'ов, которые затем используют все форматы ответа
+"""
+class field_projection:
+    __fields: list = []
+
+    def __init__(self, fields: list):
+        validator.validate(fields, list)
+        if len(fields) == 0:
+            raise argument_exception("Не указаны поля проекции")
+
+        for field in fields:
+            validator.validate(field, str)
+            # Поле - путь из имен свойств: имена попадают в заголовки колонок и теги XML
+            if any(not name.isidentifier() or name.startswith("_") for name in field.split("/")):
+                raise argument_exception(f"Некорректное наименование поля: {field}")
+
+        self.__fields = fields
+        self.__getters = [operator.attrgetter(".".join(field.split("/"))) for field in fields]
+
+    @property
+    def fields(self) -> list:
+        """
+        Выбранные поля в порядке вывода
+        """
+        return self.__fields
+
+    @staticmethod
+    def parse(text: str):
+        """
+        Разобрать параметр запроса со списком полей через запятую
+
+        Args:
+            text (str): строка вида "unique_code,name,nomenclature/name" или None
+
+        Returns:
+            field_projection: проекция или None, если поля не указаны
+        """
+        if text is None or text.strip() == "":
+            return None
+
+        validator.validate(text, str)
+        return field_projection([field.strip() for field in text.split(",")])
+
+    def validate(self, item):
+        """
+        Проверить, что каждое звено пути поля - свойство модели
+        (вложенные звенья проверяются по модели значения или по типу свойства)
+
+        Args:
+            item: пример элемента данных
+        """
+        for field in self.__fields:
+            current = item
+            source_type = item.__class__
+            for name in field.split("/"):
+                available = common.get_schema(source_type)
+                if name not in available:
+                    raise argument_exception(f"Поле {field} отсутствует у модели {item.__class__.__name__}. Доступны у {source_type.__name__}: {list(available)}")
+
+                current = getattr(current, name, None) if current is not None else None
+                source_type = current.__class__ if current is not None else field_projection.__property_type(source_type, name)
+
+    @staticmethod
+    def __property_type(source_type: type, name: str) -> type:
+        """
+        Тип значения свойства по аннотации (если значение не задано)
+        """
+        try:
+            annotation = typing.get_type_hints(getattr(source_type, name).fget).get("return")
+        except (NameError, TypeError):
+            annotation = None
+        return annotation if isinstance(annotation, type) else type(None)
+
+    def values(self, item) -> list:
+        """
+        Значения выбранных полей элемента (None, если поле недоступно)
+
+        Args:
+            item: элемент данных
+
+        Returns:
+            list: значения в порядке полей
+        """
+        result = []
+        for getter in self.__getters:
+            try:
+                result.append(getter(item))
+            except AttributeError:
+                result.append(None)
+        return result
@@ -0,0 +1,150 @@
+from Src.Core.validator import validator, argument_exception
+from Src.Dtos.filter_dto import filter_dto
+from Src.Dtos.filter_group_dto import filter_group_dto
+from Src.Core.filter_operator import FilterOperator
+from collections import OrderedDict
+import threading
+
+"""
+Кеш результатов фильтрации данных репозитория.
+Ключ - (ключ данных, нормализованный набор фильтров, версия данных), поэтому после
+любого изменения списка старые записи не используются и вытесняются.
+Объем ограничен количеством записей и общим количеством строк в них: при переполнении
+удаляются давно не использованные записи (LRU), результат больше всего объема не сохраняется.
+Сохраненные результаты общие для всех запросов, поэтому хранятся неизменяемыми (кортежами)
+"""
+class filter_cache:
+    __capacity: int = 128
+    __max_rows: int = 100000
+
+    def __init__(self, capacity: int = 128, max_rows: int = 100000):
+        validator.validate(capacity, int)
+        validator.validate(max_rows, int)
+        if capacity <= 0 or max_rows <= 0:
+            raise argument_exception("Некорректный аргумент!")
+
+        self.__capacity = capacity
+        self.__max_rows = max_rows
+        self.__entries = OrderedDict()
+        self.__rows = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Максимальное количество записей
+        """
+        return self.__capacity
+
+    @property
+    def max_rows(self) -> int:
+        """
+        Максимальное общее количество строк в записях
+        """
+        return self.__max_rows
+
+    @staticmethod
+    def normalize(filters: list) -> tuple:
+        """
+        Нормализованное представление набора фильтров.
+        Порядок условий внутри И / ИЛИ не влияет на результат
+
+        Args:
+            filters (list): список объектов filter_dto или filter_group_dto (объединяются по И)
+
+        Returns:
+            tuple: хешируемое представление фильтров
+        """
+        validator.validate(filters, list)
+        return tuple(sorted((filter_cache.__normalize_node(item) for item in filters), key=repr))
+
+    @staticmethod
+    def __normalize_node(node) -> tuple:
+        validator.validate(node, (filter_dto, filter_group_dto))
+        if isinstance(node, filter_dto):
+            return ("FILTER", node.field_name, node.type.value, str(node.value))
+
+        items = [filter_cache.__normalize_node(item) for item in node.filters]
+        if node.operator != FilterOperator.NOT:
+            items.sort(key=repr)
+        return (node.operator.value, tuple(items))
+
+    def get(self, key: tuple):
+        """
+        Получить запись по ключу
+
+        Args:
+            key (tuple): ключ записи
+
+        Returns:
+            сохраненное значение или None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value, rows: int = 1) -> bool:
+        """
+        Сохранить запись, вытеснив давно не использованные при переполнении
+
+        Args:
+            key (tuple): ключ записи
+            value: значение (неизменяемое - его получат все запросы с этим ключом)
+            rows (int): количество строк в значении
+
+        Returns:
+            bool: False, если значение больше всего объема кеша и не сохранено
+        """
+        validator.validate(rows, int)
+        with self.__lock:
+            if rows > self.__max_rows:
+                return False
+
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__rows -= previous[1]
+
+            self.__entries[key] = (value, rows)
+            self.__rows += rows
+            while len(self.__entries) > self.__capacity or self.__rows > self.__max_rows:
+                _, (_, evicted) = self.__entries.popitem(last=False)
+                self.__rows -= evicted
+                self.__evictions += 1
+            return True
+
+    def clear(self):
+        """
+        Очистить кеш
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__rows = 0
+
+    def stats(self) -> dict:
+        """
+        Статистика использования кеша
+
+        Returns:
+            dict: размер, емкость, строки, предел строк, попадания, промахи, вытеснения и доля попаданий
+        """
+        with self.__lock:
+            requests = self.__hits + self.__misses
+            return {
+                "size": len(self.__entries),
+                "capacity": self.__capacity,
+                "rows": self.__rows,
+                "max_rows": self.__max_rows,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+                "hit_rate": round(self.__hits / requests, 4) if requests > 0 else 0.0
+            }
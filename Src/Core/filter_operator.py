@@ -0,0 +1,19 @@
+from enum import Enum
+
+"""
+Перечисление логических операторов для группировки фильтров
+"""
+class FilterOperator(Enum):
+    AND = "AND"                 # Все условия группы
+    OR = "OR"                   # Хотя бы одно условие группы
+    NOT = "NOT"                 # Отрицание условия группы
+
+    @classmethod
+    def get_all_types(cls) -> list:
+        """
+        Возвращает список всех логических операторов
+
+        Returns:
+            list: список значений перечисления
+        """
+        return [member.value for member in cls]
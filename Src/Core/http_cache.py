@@ -0,0 +1,141 @@
+from Src.Core.validator import validator
+import itertools
+import hashlib
+import uuid
+import json
+import gzip
+import zlib
+
+"""
+Условные запросы и сжатие ответов.
+    - ETag вычисляется по версии данных репозитория, параметрам запроса и эпохе процесса;
+    - совпадение с If-None-Match позволяет ответить 304 без формирования тела;
+    - тело больше порога сжимается gzip, потоковое тело сжимается по частям
+"""
+class http_cache:
+    # Минимальный размер тела для сжатия (байт)
+    __threshold: int = 1024
+
+    # Эпоха процесса: версии данных считаются заново в каждом процессе,
+    # поэтому одинаковые версии разных процессов (после перезапуска, в разных воркерах) не совпадают
+    __epoch: str = uuid.uuid4().hex
+
+    @staticmethod
+    def epoch() -> str:
+        """
+        Случайная метка процесса, входит в каждый ETag
+        """
+        return http_cache.__epoch
+
+    @staticmethod
+    def etag(*parts) -> str:
+        """
+        Слабый ETag по набору значений (версии данных, путь, параметры запроса) и эпохе процесса
+
+        Returns:
+            str: значение заголовка ETag
+        """
+        text = json.dumps([http_cache.__epoch, parts], ensure_ascii=False, sort_keys=True, default=str)
+        return 'W/"' + hashlib.sha1(text.encode("utf-8")).hexdigest() + '"'
+
+    @staticmethod
+    def matches(header: str, etag: str) -> bool:
+        """
+        Проверить заголовок If-None-Match (слабое сравнение)
+
+        Args:
+            header (str): значение заголовка или None
+            etag (str): текущий ETag
+
+        Returns:
+            bool: True если у клиента актуальная версия
+        """
+        if header is None or header.strip() == "":
+            return False
+
+        validator.validate(etag, str)
+        if header.strip() == "*":
+            return True
+
+        current = http_cache.__opaque(etag)
+        return any(http_cache.__opaque(item) == current for item in header.split(","))
+
+    @staticmethod
+    def __opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    @staticmethod
+    def accepts_gzip(header: str) -> bool:
+        """
+        Проверить, принимает ли клиент gzip (заголовок Accept-Encoding)
+        """
+        if header is None:
+            return False
+
+        for item in header.split(","):
+            parts = [part.strip() for part in item.split(";")]
+            if parts[0].lower() not in ["gzip", "*"]:
+                continue
+
+            quality = 1.0
+            for parameter in parts[1:]:
+                if parameter.startswith("q="):
+                    try:
+                        quality = float(parameter[2:])
+                    except ValueError:
+                        quality = 0.0
+            return quality > 0
+
+        return False
+
+    @staticmethod
+    def compress(body, threshold: int = None) -> tuple:
+        """
+        Сжать тело ответа, если оно больше порога
+
+        Args:
+            body: строка, байты или итератор частей (строк / байтов)
+            threshold (int): порог сжатия или None - по умолчанию
+
+        Returns:
+            tuple: (тело ответа, признак сжатия)
+        """
+        threshold = threshold if threshold is not None else http_cache.__threshold
+
+        if isinstance(body, (str, bytes)):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            if len(data) < threshold:
+                return data, False
+            return gzip.compress(data), True
+
+        # Потоковое тело: читаем части до порога, чтобы не сжимать короткие ответы
+        chunks = iter(body)
+        head = []
+        size = 0
+        for chunk in chunks:
+            data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            head.append(data)
+            size += len(data)
+            if size >= threshold:
+                return http_cache.gzip_stream(itertools.chain(head, chunks)), True
+
+        return b"".join(head), False
+
+    @staticmethod
+    def gzip_stream(chunks):
+        """
+        Сжать поток частей gzip без накопления всего тела
+
+        Args:
+            chunks: итератор частей (строк / байтов)
+
+        Returns:
+            генератор сжатых частей
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,20 @@
+from enum import Enum
+
+"""
+Перечисление состояний фоновых заданий формирования отчетов
+"""
+class JobStatus(Enum):
+    PENDING = "PENDING"         # Поставлено в очередь
+    RUNNING = "RUNNING"         # Выполняется
+    DONE = "DONE"               # Завершено успешно
+    FAILED = "FAILED"           # Завершено с ошибкой
+
+    @classmethod
+    def get_all_types(cls) -> list:
+        """
+        Возвращает список всех состояний заданий
+
+        Returns:
+            list: список значений перечисления
+        """
+        return [member.value for member in cls]
@@ -0,0 +1,126 @@
+from Src.Core.validator import validator, argument_exception, operation_exception
+import json
+import re
+
+"""
+Потоковое чтение JSON объекта верхнего уровня.
+Файл читается частями, элементы массивов верхнего уровня разбираются по одному
+(JSONDecoder.raw_decode), поэтому весь документ в памяти не находится
+"""
+class json_stream:
+    # Размер читаемой части (символов)
+    __chunk_size: int = 1 << 16
+
+    __spaces = re.compile(r"\s*")
+    __decoder = json.JSONDecoder()
+
+    def __init__(self, file, chunk_size: int = None):
+        if file is None or not hasattr(file, "read"):
+            raise argument_exception("Ожидается открытый файл")
+        chunk_size = chunk_size if chunk_size is not None else json_stream.__chunk_size
+        validator.validate(chunk_size, int)
+        if chunk_size <= 0:
+            raise argument_exception("Некорректный аргумент!")
+
+        self.__file = file
+        self.__size = chunk_size
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+
+    def members(self):
+        """
+        Члены объекта верхнего уровня по мере чтения
+
+        Returns:
+            генератор (имя, значение, признак элемента массива):
+            для массива верхнего уровня - по одному кортежу на элемент,
+            для остальных значений - один кортеж со значением целиком
+        """
+        self.__expect("{")
+        if self.__peek() == "}":
+            self.__position += 1
+            return
+
+        while True:
+            name = self.__decode()
+            if not isinstance(name, str):
+                raise operation_exception("Некорректный JSON: ожидается наименование поля")
+            self.__expect(":")
+
+            if self.__peek() == "[":
+                self.__position += 1
+                if self.__peek() == "]":
+                    self.__position += 1
+                else:
+                    while True:
+                        yield name, self.__decode(), True
+                        if self.__next_separator("]"):
+                            break
+            else:
+                yield name, self.__decode(), False
+
+            if self.__next_separator("}"):
+                return
+
+    def __fill(self) -> bool:
+        """
+        Дочитать следующую часть файла. False - файл прочитан полностью
+        """
+        if self.__eof:
+            return False
+
+        chunk = self.__file.read(self.__size)
+        if not chunk:
+            self.__eof = True
+            return False
+
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+        return True
+
+    def __peek(self) -> str:
+        """
+        Следующий значащий символ (пробелы пропускаются)
+        """
+        while True:
+            self.__position = json_stream.__spaces.match(self.__buffer, self.__position).end()
+            if self.__position < len(self.__buffer):
+                return self.__buffer[self.__position]
+            if not self.__fill():
+                raise operation_exception("Некорректный JSON: неожиданный конец данных")
+
+    def __expect(self, symbol: str):
+        if self.__peek() != symbol:
+            raise operation_exception(f"Некорректный JSON: ожидается '{symbol}'")
+        self.__position += 1
+
+    def __next_separator(self, closing: str) -> bool:
+        """
+        Прочитать запятую или закрывающий символ. True - достигнут закрывающий символ
+        """
+        symbol = self.__peek()
+        self.__position += 1
+        if symbol == closing:
+            return True
+        if symbol != ",":
+            raise operation_exception(f"Некорректный JSON: ожидается ',' или '{closing}'")
+        return False
+
+    def __decode(self):
+        """
+        Разобрать очередное значение. Значение принимается, только если за ним уже есть
+        данные: иначе число на границе части могло бы быть прочитано не полностью
+        """
+        self.__peek()
+        while True:
+            try:
+                value, end = json_stream.__decoder.raw_decode(self.__buffer, self.__position)
+                if end < len(self.__buffer) or self.__eof:
+                    self.__position = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.__eof:
+                    raise operation_exception(f"Некорректный JSON: {str(e)}")
+
+            self.__fill()
@@ -0,0 +1,254 @@
+from Src.Core.validator import argument_exception, operation_exception
+import struct
+
+"""
+Кодирование и декодирование данных в формате MessagePack.
+Поддерживаются None, bool, int (до 64 бит), float, str, bytes, list / tuple и dict.
+Реализация самодостаточна и совместима со стандартными библиотеками MessagePack
+"""
+class msgpack_codec:
+
+    # Упаковщики чисел фиксированной длины
+    __uint8 = struct.Struct(">B")
+    __uint16 = struct.Struct(">H")
+    __uint32 = struct.Struct(">I")
+    __uint64 = struct.Struct(">Q")
+    __int8 = struct.Struct(">b")
+    __int16 = struct.Struct(">h")
+    __int32 = struct.Struct(">i")
+    __int64 = struct.Struct(">q")
+    __float64 = struct.Struct(">d")
+    __float32 = struct.Struct(">f")
+
+    # Коды чисел и их упаковщики
+    __numbers = {
+        0xcc: __uint8, 0xcd: __uint16, 0xce: __uint32, 0xcf: __uint64,
+        0xd0: __int8, 0xd1: __int16, 0xd2: __int32, 0xd3: __int64,
+        0xca: __float32, 0xcb: __float64
+    }
+
+    # Коды строк, двоичных данных, массивов и словарей с длиной
+    __sizes = {
+        0xd9: ("str", __uint8), 0xda: ("str", __uint16), 0xdb: ("str", __uint32),
+        0xc4: ("bin", __uint8), 0xc5: ("bin", __uint16), 0xc6: ("bin", __uint32),
+        0xdc: ("array", __uint16), 0xdd: ("array", __uint32),
+        0xde: ("map", __uint16), 0xdf: ("map", __uint32)
+    }
+
+    @staticmethod
+    def encode(value) -> bytes:
+        """
+        Закодировать значение
+
+        Args:
+            value: значение поддерживаемого типа
+
+        Returns:
+            bytes: данные MessagePack
+        """
+        buffer = bytearray()
+        msgpack_codec.encode_into(buffer, value)
+        return bytes(buffer)
+
+    @staticmethod
+    def encode_into(buffer: bytearray, value):
+        """
+        Дописать закодированное значение в буфер
+        """
+        value_type = value.__class__
+
+        if value is None:
+            buffer.append(0xc0)
+        elif value_type is bool:
+            buffer.append(0xc3 if value else 0xc2)
+        elif value_type is int:
+            msgpack_codec.__encode_int(buffer, value)
+        elif value_type is float:
+            buffer.append(0xcb)
+            buffer += msgpack_codec.__float64.pack(value)
+        elif value_type is str:
+            data = value.encode("utf-8")
+            size = len(data)
+            if size < 32:
+                buffer.append(0xa0 | size)
+            else:
+                msgpack_codec.__encode_size(buffer, size, 0xd9, 0xda, 0xdb)
+            buffer += data
+        elif value_type is bytes or value_type is bytearray:
+            msgpack_codec.__encode_size(buffer, len(value), 0xc4, 0xc5, 0xc6)
+            buffer += value
+        elif isinstance(value, (list, tuple)):
+            msgpack_codec.encode_array_header(buffer, len(value))
+            for item in value:
+                msgpack_codec.encode_into(buffer, item)
+        elif isinstance(value, dict):
+            size = len(value)
+            if size < 16:
+                buffer.append(0x80 | size)
+            elif size < 0x10000:
+                buffer.append(0xde)
+                buffer += msgpack_codec.__uint16.pack(size)
+            else:
+                buffer.append(0xdf)
+                buffer += msgpack_codec.__uint32.pack(size)
+            for key, item in value.items():
+                msgpack_codec.encode_into(buffer, key)
+                msgpack_codec.encode_into(buffer, item)
+        elif isinstance(value, int):
+            msgpack_codec.__encode_int(buffer, int(value))
+        else:
+            raise argument_exception(f"Тип {value_type.__name__} не поддерживается MessagePack")
+
+    @staticmethod
+    def encode_array_header(buffer: bytearray, size: int):
+        """
+        Дописать заголовок массива указанного размера
+        """
+        if size < 16:
+            buffer.append(0x90 | size)
+        elif size < 0x10000:
+            buffer.append(0xdc)
+            buffer += msgpack_codec.__uint16.pack(size)
+        else:
+            buffer.append(0xdd)
+            buffer += msgpack_codec.__uint32.pack(size)
+
+    @staticmethod
+    def __encode_size(buffer: bytearray, size: int, code8: int, code16: int, code32: int):
+        if size < 0x100:
+            buffer.append(code8)
+            buffer.append(size)
+        elif size < 0x10000:
+            buffer.append(code16)
+            buffer += msgpack_codec.__uint16.pack(size)
+        else:
+            buffer.append(code32)
+            buffer += msgpack_codec.__uint32.pack(size)
+
+    @staticmethod
+    def __encode_int(buffer: bytearray, value: int):
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -32 <= value < 0:
+            buffer.append(value & 0xff)
+        elif value >= 0:
+            if value < 0x100:
+                buffer.append(0xcc)
+                buffer += msgpack_codec.__uint8.pack(value)
+            elif value < 0x10000:
+                buffer.append(0xcd)
+                buffer += msgpack_codec.__uint16.pack(value)
+            elif value < 0x100000000:
+                buffer.append(0xce)
+                buffer += msgpack_codec.__uint32.pack(value)
+            elif value < 0x10000000000000000:
+                buffer.append(0xcf)
+                buffer += msgpack_codec.__uint64.pack(value)
+            else:
+                raise argument_exception("Целое число не помещается в 64 бита")
+        else:
+            if value >= -0x80:
+                buffer.append(0xd0)
+                buffer += msgpack_codec.__int8.pack(value)
+            elif value >= -0x8000:
+                buffer.append(0xd1)
+                buffer += msgpack_codec.__int16.pack(value)
+            elif value >= -0x80000000:
+                buffer.append(0xd2)
+                buffer += msgpack_codec.__int32.pack(value)
+            elif value >= -0x8000000000000000:
+                buffer.append(0xd3)
+                buffer += msgpack_codec.__int64.pack(value)
+            else:
+                raise argument_exception("Целое число не помещается в 64 бита")
+
+    @staticmethod
+    def decode(data: bytes):
+        """
+        Декодировать значение
+
+        Args:
+            data (bytes): данные MessagePack
+
+        Returns:
+            декодированное значение (массивы - списки, словари - dict)
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise argument_exception("Ожидаются двоичные данные")
+
+        view = memoryview(data)
+        try:
+            value, offset = msgpack_codec.__decode(view, 0)
+        except (IndexError, struct.error):
+            raise operation_exception("Данные MessagePack обрезаны")
+
+        if offset != len(view):
+            raise operation_exception("Лишние данные после значения MessagePack")
+        return value
+
+    @staticmethod
+    def __decode(view: memoryview, offset: int) -> tuple:
+        code = view[offset]
+        offset += 1
+
+        if code < 0x80:
+            return code, offset
+        if code >= 0xe0:
+            return code - 0x100, offset
+        if 0xa0 <= code <= 0xbf:
+            return msgpack_codec.__read_str(view, offset, code & 0x1f)
+        if 0x90 <= code <= 0x9f:
+            return msgpack_codec.__read_array(view, offset, code & 0x0f)
+        if 0x80 <= code <= 0x8f:
+            return msgpack_codec.__read_map(view, offset, code & 0x0f)
+
+        if code == 0xc0:
+            return None, offset
+        if code == 0xc2:
+            return False, offset
+        if code == 0xc3:
+            return True, offset
+
+        number = msgpack_codec.__numbers.get(code)
+        if number is not None:
+            return number.unpack_from(view, offset)[0], offset + number.size
+
+        entry = msgpack_codec.__sizes.get(code)
+        if entry is not None:
+            kind, reader = entry
+            size = reader.unpack_from(view, offset)[0]
+            offset += reader.size
+            if kind == "str":
+                return msgpack_codec.__read_str(view, offset, size)
+            if kind == "bin":
+                if offset + size > len(view):
+                    raise IndexError()
+                return bytes(view[offset:offset + size]), offset + size
+            if kind == "array":
+                return msgpack_codec.__read_array(view, offset, size)
+            return msgpack_codec.__read_map(view, offset, size)
+
+        raise operation_exception(f"Неподдерживаемый код MessagePack: {hex(code)}")
+
+    @staticmethod
+    def __read_str(view: memoryview, offset: int, size: int) -> tuple:
+        if offset + size > len(view):
+            raise IndexError()
+        return bytes(view[offset:offset + size]).decode("utf-8"), offset + size
+
+    @staticmethod
+    def __read_array(view: memoryview, offset: int, size: int) -> tuple:
+        result = []
+        for _ in range(size):
+            item, offset = msgpack_codec.__decode(view, offset)
+            result.append(item)
+        return result, offset
+
+    @staticmethod
+    def __read_map(view: memoryview, offset: int, size: int) -> tuple:
+        result = {}
+        for _ in range(size):
+            key, offset = msgpack_codec.__decode(view, offset)
+            value, offset = msgpack_codec.__decode(view, offset)
+            result[key] = value
+        return result, offset
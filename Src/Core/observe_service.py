@@ -1,10 +1,15 @@
 """
-Реализация шаблона Наблюдатель для управления подписками и событиями
+Реализация шаблона Наблюдатель для управления подписками и событиями.
+Подписчики хранятся по типам событий, поэтому событие получают только
+подписчики, которые его обрабатывают
 """
 from Src.Core.abstract_subscriber import abstract_subscriber
+from Src.Core.event_type import event_type
+from Src.Core.validator import operation_exception
 
 class observe_service:
-    handlers = []
+    # Подписчики по событиям: событие -> {id подписчика: подписчик} (порядок подписки сохраняется)
+    __handlers: dict = {}
 
     """
     Добавить объект под наблюденние
@@ -16,8 +21,8 @@ class observe_service:
         if not isinstance(instance, abstract_subscriber): 
             return
 
-        if instance not in observe_service.handlers:
-            observe_service.handlers.append(instance)
+        for event in instance.events():
+            observe_service.__handlers.setdefault(event, {})[id(instance)] = instance
 
     """
     Удалить из под наблюдения
@@ -29,13 +34,24 @@ class observe_service:
         if not isinstance(instance, abstract_subscriber): 
             return
 
-        if instance in observe_service.handlers:
-            observe_service.handlers.remove(instance)
+        for handlers in observe_service.__handlers.values():
+            handlers.pop(id(instance), None)
+
+    """
+    Подписчики события
+    """
+    @staticmethod
+    def handlers(event: str) -> list:
+        return list(observe_service.__handlers.get(event, {}).values())
 
     """
     Вызвать событие
     """
     @staticmethod
     def create_event(event: str, params):
-        for instance in observe_service.handlers:
+        if not event_type.is_event(event):
+            raise operation_exception(f"{event} - не является событием!")
+
+        # Копия списка: обработчики могут создавать новых подписчиков во время события
+        for instance in observe_service.handlers(event):
             instance.handle(event, params)
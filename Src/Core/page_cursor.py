@@ -0,0 +1,91 @@
+from Src.Core.validator import validator, argument_exception
+from datetime import datetime
+import base64
+import json
+
+"""
+Курсор постраничного вывода.
+Хранит поле сортировки, направление и последний выданный элемент (значение, код элемента, позиция).
+Код, в отличие от позиции, не сдвигается при удалении предшествующих элементов;
+позиция различает только элементы с одинаковыми значением и кодом.
+Для клиента курсор - непрозрачная строка
+"""
+class page_cursor:
+    __field: str = ""
+    __descending: bool = False
+    __value = None
+    __code: str = ""
+    __position: int = None
+
+    def __init__(self, field: str, descending: bool, value, code: str, position: int = None):
+        validator.validate(field, str)
+        validator.validate(descending, bool)
+        validator.validate(code, str)
+        if position is not None:
+            validator.validate(position, int)
+        self.__field = field
+        self.__descending = descending
+        self.__value = value
+        self.__code = code
+        self.__position = position
+
+    @property
+    def field(self) -> str:
+        """
+        Поле сортировки
+        """
+        return self.__field
+
+    @property
+    def descending(self) -> bool:
+        """
+        Признак сортировки по убыванию
+        """
+        return self.__descending
+
+    @property
+    def after(self) -> tuple:
+        """
+        Последний выданный элемент: (значение, код элемента, позиция)
+        """
+        return (self.__value, self.__code, self.__position)
+
+    def encode(self) -> str:
+        """
+        Закодировать курсор в строку
+
+        Returns:
+            str: непрозрачная строка курсора
+        """
+        if isinstance(self.__value, datetime):
+            value = {"datetime": self.__value.isoformat()}
+        else:
+            value = {"value": self.__value}
+
+        data = {"field": self.__field, "descending": self.__descending, "code": self.__code,
+                "position": self.__position}
+        data.update(value)
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(text: str) -> "page_cursor":
+        """
+        Разобрать строку курсора
+
+        Args:
+            text (str): строка курсора
+
+        Returns:
+            page_cursor: курсор
+        """
+        validator.validate(text, str)
+        try:
+            padding = "=" * (-len(text) % 4)
+            data = json.loads(base64.urlsafe_b64decode(text + padding).decode("utf-8"))
+            value = datetime.fromisoformat(data["datetime"]) if "datetime" in data else data["value"]
+            return page_cursor(data["field"], data["descending"], value, data["code"], data.get("position"))
+        except argument_exception:
+            raise
+        except Exception:
+            raise argument_exception("Некорректный курсор")
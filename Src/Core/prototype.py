@@ -2,6 +2,8 @@ from Src.Core.validator import validator, argument_exception
 from Src.Dtos.filter_dto import filter_dto
 from Src.Core.filter_type import FilterType
 from Src.Core.abstract_model import abstact_model
+from Src.Core.compiled_filter import compiled_filter
+from Src.Core.query_view import query_view
 from datetime import datetime
 
 """
@@ -32,6 +34,16 @@ class prototype:
         inner_data = data if data is not None else self.__data
         return prototype(inner_data)
 
+    def query(self) -> query_view:
+        """
+        Создает ленивый запрос к данным прототипа.
+        Шаги filter / map / sort / limit выполняются только при материализации
+
+        Returns:
+            query_view: ленивое представление данных
+        """
+        return query_view(self.__data)
+
     @staticmethod
     def filter(data: list, filters: list) -> list:
         """
@@ -39,7 +51,7 @@ class prototype:
         
         Args:
             data (list): исходные данные
-            filters (list): список объектов filter_dto
+            filters (list): список объектов filter_dto или filter_group_dto (объединяются по И)
             
         Returns:
             list: отфильтрованные данные
@@ -50,18 +62,21 @@ class prototype:
         if len(filters) == 0:
             return data
 
-        result = data
-
-        for filter_dto in filters:
-            filtered_result = []
+        # Фильтры компилируются один раз и применяются за один проход
+        return prototype.compile(filters).apply(data)
 
-            for item in result:
-                if prototype._apply_filter(item, filter_dto):
-                    filtered_result.append(item)
+    @staticmethod
+    def compile(filters: list) -> compiled_filter:
+        """
+        Компилирует список фильтров в единый предикат
 
-            result = filtered_result
+        Args:
+            filters (list): список объектов filter_dto или filter_group_dto
 
-        return result
+        Returns:
+            compiled_filter: скомпилированный предикат
+        """
+        return compiled_filter(filters)
 
     @staticmethod
     def _apply_filter(item, filter_dto: filter_dto) -> bool:
@@ -0,0 +1,117 @@
+from Src.Core.validator import validator, argument_exception
+from Src.Core.compiled_filter import compiled_filter
+import itertools
+import heapq
+
+"""
+Ленивое представление запроса к данным.
+Цепочка filter / where / map / sort / limit только запоминает шаги,
+данные перебираются генераторами при материализации (обычно - форматом ответа).
+Промежуточные списки не создаются, limit прекращает перебор досрочно,
+а sort с последующим limit выбирает первые элементы без полной сортировки
+"""
+class query_view:
+
+    def __init__(self, source, stages: tuple = ()):
+        if source is None:
+            raise argument_exception("Некорректно переданы аргументы!")
+        validator.validate(stages, tuple)
+        self.__source = source
+        self.__stages = stages
+
+    def __extend(self, stage: tuple) -> "query_view":
+        return query_view(self.__source, self.__stages + (stage,))
+
+    def filter(self, filters: list) -> "query_view":
+        """
+        Отбор по списку фильтров (filter_dto / filter_group_dto, объединяются по И)
+        """
+        validator.validate(filters, list)
+        if len(filters) == 0:
+            return self
+        return self.__extend(("filter", compiled_filter(filters)))
+
+    def where(self, predicate) -> "query_view":
+        """
+        Отбор по произвольному предикату item -> bool
+        """
+        if not callable(predicate):
+            raise argument_exception("Ожидается функция")
+        return self.__extend(("where", predicate))
+
+    def map(self, function) -> "query_view":
+        """
+        Преобразование элементов
+        """
+        if not callable(function):
+            raise argument_exception("Ожидается функция")
+        return self.__extend(("map", function))
+
+    def sort(self, key, descending: bool = False) -> "query_view":
+        """
+        Сортировка по полю (вложенные поля через "/") или по функции item -> ключ
+        """
+        validator.validate(descending, bool)
+        if isinstance(key, str):
+            key = compiled_filter.getter(key)
+        elif not callable(key):
+            raise argument_exception("Ожидается наименование поля или функция")
+        return self.__extend(("sort", (key, descending)))
+
+    def limit(self, count: int) -> "query_view":
+        """
+        Ограничение количества элементов
+        """
+        validator.validate(count, int)
+        if count < 0:
+            raise argument_exception("Некорректный аргумент!")
+        return self.__extend(("limit", count))
+
+    def __iter__(self):
+        items = iter(self.__source)
+        stages = self.__stages
+        index = 0
+
+        while index < len(stages):
+            kind, argument = stages[index]
+
+            if kind == "filter":
+                items = filter(argument.matcher(), items)
+            elif kind == "where":
+                items = filter(argument, items)
+            elif kind == "map":
+                items = map(argument, items)
+            elif kind == "limit":
+                items = itertools.islice(items, argument)
+            elif kind == "sort":
+                key, descending = argument
+                following = stages[index + 1] if index + 1 < len(stages) else None
+                if following is not None and following[0] == "limit":
+                    # Первые элементы выбираются кучей без сортировки всех данных
+                    select = heapq.nlargest if descending else heapq.nsmallest
+                    items = iter(select(following[1], items, key=key))
+                    index += 2
+                    continue
+                items = iter(sorted(items, key=key, reverse=descending))
+
+            index += 1
+
+        return items
+
+    def to_list(self) -> list:
+        """
+        Материализовать результат запроса
+        """
+        return list(self)
+
+    def first(self):
+        """
+        Первый элемент результата или None
+        """
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """
+        Количество элементов результата без создания списка
+        """
+        return sum(1 for _ in self)
@@ -0,0 +1,388 @@
+from Src.Core.validator import validator
+from Src.Core.trigram_index import trigram_index
+from bisect import bisect_left, bisect_right, insort
+import operator
+
+"""
+Индексы списка данных репозитория.
+    - хеш-индексы: строковое значение поля -> позиции элементов (для EQUALS)
+    - упорядоченные индексы: значения поля по возрастанию с позициями (для диапазонов и постраничного вывода)
+    - триграммные индексы: поиск подстроки без учета регистра (для LIKE)
+Позиции всегда возрастают в порядке исходного списка, в упорядоченных индексах
+равные значения идут по возрастанию кода элемента (unique_code): код не меняется при сдвиге
+позиций, поэтому курсор постраничного вывода остается точным. Коды не обязаны быть уникальными,
+поэтому элементы с равными значением и кодом упорядочены по позиции. Дописывание в конец списка
+и замена элемента обновляют индексы инкрементально, любое другое изменение требует перестроения
+"""
+class repository_index:
+    __hash_fields: list = []
+    __sorted_fields: list = []
+    __text_fields: list = []
+
+    def __init__(self, hash_fields: list, sorted_fields: list = None, text_fields: list = None):
+        validator.validate(hash_fields, list)
+        self.__hash_fields = hash_fields
+        self.__sorted_fields = sorted_fields if sorted_fields is not None else []
+        self.__text_fields = text_fields if text_fields is not None else []
+        self.__getters = {field: operator.attrgetter(".".join(field.split("/")))
+                          for field in self.__hash_fields + self.__sorted_fields + self.__text_fields}
+        self.__code = operator.attrgetter("unique_code")
+        self.__size = 0
+        self.__valid = False
+        self.__hashes = {}
+        self.__sorted = {}
+        self.__sorted_valid = {}
+        self.__texts = {}
+
+    @property
+    def hash_fields(self) -> list:
+        """
+        Поля с хеш-индексом
+        """
+        return self.__hash_fields
+
+    @property
+    def sorted_fields(self) -> list:
+        """
+        Поля с упорядоченным индексом
+        """
+        return self.__sorted_fields
+
+    @property
+    def text_fields(self) -> list:
+        """
+        Поля с триграммным индексом
+        """
+        return self.__text_fields
+
+    @property
+    def valid(self) -> bool:
+        """
+        Признак актуальности индекса
+        """
+        return self.__valid
+
+    @property
+    def size(self) -> int:
+        """
+        Количество проиндексированных элементов
+        """
+        return self.__size
+
+    def invalidate(self):
+        """
+        Пометить индекс как неактуальный
+        """
+        self.__valid = False
+
+    def rebuild(self, data: list):
+        """
+        Полностью перестроить индекс по списку данных
+        """
+        self.__hashes = {field: {} for field in self.__hash_fields}
+        self.__sorted = {field: ([], [], []) for field in self.__sorted_fields}
+        self.__sorted_valid = {field: True for field in self.__sorted_fields}
+        self.__texts = {field: trigram_index() for field in self.__text_fields}
+        self.__size = 0
+        self.__valid = True
+        self.extend(data, 0)
+
+    def extend(self, items: list, start: int):
+        """
+        Добавить в индекс элементы, дописанные в конец списка
+
+        Args:
+            items (list): новые элементы
+            start (int): позиция первого нового элемента
+        """
+        if not self.__valid:
+            return
+
+        if start != self.__size:
+            self.__valid = False
+            return
+
+        for field in self.__hash_fields:
+            getter = self.__getters[field]
+            buckets = self.__hashes[field]
+            position = start
+            for item in items:
+                try:
+                    value = getter(item)
+                    key = value if type(value) is str else str(value)
+                    bucket = buckets.get(key)
+                    if bucket is None:
+                        buckets[key] = [position]
+                    else:
+                        bucket.append(position)
+                except Exception:
+                    pass
+                position += 1
+
+        for field in self.__sorted_fields:
+            getter = self.__getters[field]
+            keys, codes, positions = self.__sorted[field]
+            position = start
+            for item in items:
+                try:
+                    value = getter(item)
+                    code = self.__code_of(item)
+                    if keys and (value, code) < (keys[-1], codes[-1]):
+                        self.__sorted_valid[field] = False
+                    keys.append(value)
+                    codes.append(code)
+                    positions.append(position)
+                except Exception:
+                    # Элемент без значения - упорядоченный индекс по полю недоступен
+                    self.__sorted_valid[field] = False
+                    keys.clear()
+                    codes.clear()
+                    positions.clear()
+                    break
+                position += 1
+
+        for field in self.__text_fields:
+            self.__texts[field].extend([self.__value(field, item) for item in items])
+
+        self.__size = start + len(items)
+
+    def replace(self, position: int, old, new):
+        """
+        Обновить индекс после замены элемента на указанной позиции
+
+        Args:
+            position (int): позиция элемента
+            old: прежний элемент
+            new: новый элемент
+        """
+        if not self.__valid:
+            return
+
+        if position < 0 or position >= self.__size:
+            self.__valid = False
+            return
+
+        for field in self.__hash_fields:
+            getter = self.__getters[field]
+            buckets = self.__hashes[field]
+            try:
+                old_value = getter(old)
+                key = old_value if type(old_value) is str else str(old_value)
+                bucket = buckets.get(key)
+                if bucket is not None and position in bucket:
+                    bucket.remove(position)
+                    if len(bucket) == 0:
+                        del buckets[key]
+            except Exception:
+                pass
+
+            try:
+                new_value = getter(new)
+                key = new_value if type(new_value) is str else str(new_value)
+                insort(buckets.setdefault(key, []), position)
+            except Exception:
+                pass
+
+        for field in self.__sorted_fields:
+            if not self.__replace_sorted(field, position, new):
+                self.__valid = False
+                return
+
+        for field in self.__text_fields:
+            self.__texts[field].replace(position, self.__value(field, new))
+
+    def __replace_sorted(self, field: str, position: int, new) -> bool:
+        """
+        Заменить значение элемента в упорядоченном индексе.
+        Значения одного поля упорядочены по тройке (значение, код элемента, позиция)
+
+        Returns:
+            bool: False, если индекс требует перестроения
+        """
+        keys, codes, positions = self.__sorted[field]
+        if len(keys) != self.__size:
+            # Упорядоченный индекс по полю недоступен
+            return True
+
+        try:
+            value = self.__getters[field](new)
+        except Exception:
+            return False
+        code = self.__code_of(new)
+
+        if not self.__sorted_valid[field]:
+            found = positions.index(position)
+            keys[found] = value
+            codes[found] = code
+            return True
+
+        # Старое значение может быть изменено на месте, поэтому ищем по позиции
+        found = positions.index(position)
+        del keys[found]
+        del codes[found]
+        del positions[found]
+
+        try:
+            begin, end = repository_index.__code_range(keys, codes, value, code)
+        except TypeError:
+            return False
+
+        target = bisect_right(positions, position, begin, end)
+        keys.insert(target, value)
+        codes.insert(target, code)
+        positions.insert(target, position)
+        return True
+
+    @staticmethod
+    def __code_range(keys: list, codes: list, value, code: str) -> tuple:
+        """
+        Границы элементов с указанными значением и кодом (внутри них - по возрастанию позиции)
+        """
+        begin = bisect_left(keys, value)
+        end = bisect_right(keys, value, begin)
+        return bisect_left(codes, code, begin, end), bisect_right(codes, code, begin, end)
+
+    def __code_of(self, item) -> str:
+        """
+        Код элемента для упорядочивания равных значений ("" - если кода нет)
+        """
+        try:
+            code = self.__code(item)
+        except Exception:
+            return ""
+        return code if type(code) is str else ("" if code is None else str(code))
+
+    def search(self, field: str, needle: str) -> list:
+        """
+        Позиции элементов, значение поля которых содержит подстроку (без учета регистра)
+
+        Args:
+            field (str): поле с триграммным индексом
+            needle (str): искомая подстрока
+
+        Returns:
+            list: позиции по возрастанию
+        """
+        return self.__texts[field].search(needle)
+
+    def __value(self, field: str, item):
+        """
+        Значение поля элемента или None, если поле недоступно
+        """
+        try:
+            return self.__getters[field](item)
+        except Exception:
+            return None
+
+    def lookup(self, field: str, value: str) -> list:
+        """
+        Позиции элементов с указанным строковым значением поля
+
+        Args:
+            field (str): поле с хеш-индексом
+            value (str): значение
+
+        Returns:
+            list: позиции по возрастанию
+        """
+        return self.__hashes[field].get(value, [])
+
+    def range(self, field: str, low=None, high=None, low_inclusive: bool = True, high_inclusive: bool = True) -> list:
+        """
+        Позиции элементов, значения поля которых попадают в диапазон
+
+        Args:
+            field (str): поле с упорядоченным индексом
+            low: нижняя граница или None
+            high: верхняя граница или None
+            low_inclusive (bool): включать нижнюю границу
+            high_inclusive (bool): включать верхнюю границу
+
+        Returns:
+            list: позиции (в порядке значений поля)
+        """
+        keys, _, positions = self.__ordered(field)
+        begin = 0
+        end = len(keys)
+        if low is not None:
+            begin = bisect_left(keys, low) if low_inclusive else bisect_right(keys, low)
+        if high is not None:
+            end = bisect_right(keys, high) if high_inclusive else bisect_left(keys, high)
+
+        return positions[begin:end] if begin < end else []
+
+    def count_range(self, field: str, low=None, high=None, low_inclusive: bool = True, high_inclusive: bool = True) -> int:
+        """
+        Количество элементов в диапазоне без формирования списка позиций
+        """
+        keys, _, _ = self.__ordered(field)
+        begin = 0
+        end = len(keys)
+        if low is not None:
+            begin = bisect_left(keys, low) if low_inclusive else bisect_right(keys, low)
+        if high is not None:
+            end = bisect_right(keys, high) if high_inclusive else bisect_left(keys, high)
+
+        return max(end - begin, 0)
+
+    def scan(self, field: str, after: tuple = None, descending: bool = False):
+        """
+        Позиции элементов в порядке значения поля, начиная после указанного элемента.
+        Порядок задается тройкой (значение, код элемента, позиция), поэтому продолжение просмотра
+        стоит O(log n) независимо от того, сколько элементов уже пройдено. Позиция различает
+        только элементы с одинаковыми значением и кодом, для остальных сдвиг позиций не важен
+
+        Args:
+            field (str): поле с упорядоченным индексом
+            after (tuple): тройка (значение, код элемента, позиция), после которой начинать, или None.
+                Позиция None - после всех элементов с этими значением и кодом
+            descending (bool): просмотр по убыванию
+
+        Returns:
+            генератор (значение, код элемента, позиция)
+        """
+        keys, codes, positions = self.__ordered(field)
+
+        if descending:
+            index = len(keys)
+            if after is not None:
+                value, code, position = after
+                begin, end = repository_index.__code_range(keys, codes, value, code)
+                index = begin if position is None else bisect_left(positions, position, begin, end)
+
+            for current in range(index - 1, -1, -1):
+                yield keys[current], codes[current], positions[current]
+            return
+
+        index = 0
+        if after is not None:
+            value, code, position = after
+            begin, end = repository_index.__code_range(keys, codes, value, code)
+            index = end if position is None else bisect_right(positions, position, begin, end)
+
+        for current in range(index, len(keys)):
+            yield keys[current], codes[current], positions[current]
+
+    def has_sorted(self, field: str) -> bool:
+        """
+        Признак наличия упорядоченного индекса по полю
+        """
+        if field not in self.__sorted:
+            return False
+        keys, _, _ = self.__sorted[field]
+        return len(keys) == self.__size
+
+    def __ordered(self, field: str) -> tuple:
+        """
+        Упорядоченные значения поля, коды и позиции (сортировка выполняется при необходимости)
+        """
+        keys, codes, positions = self.__sorted[field]
+        if not self.__sorted_valid[field]:
+            rows = sorted(zip(keys, codes, positions), key=lambda row: (row[0], row[1], row[2]))
+            keys = [row[0] for row in rows]
+            codes = [row[1] for row in rows]
+            positions = [row[2] for row in rows]
+            self.__sorted[field] = (keys, codes, positions)
+            self.__sorted_valid[field] = True
+
+        return keys, codes, positions
@@ -6,6 +6,7 @@ class ResponseFormat(Enum):
     MARKDOWN = "markdown"
     JSON = "json"
     XML = "xml"
+    MSGPACK = "msgpack"
 
     @staticmethod
     def csv() -> str:
@@ -21,4 +22,8 @@ class ResponseFormat(Enum):
 
     @staticmethod
     def xml() -> str:
-        return "xml"
\ No newline at end of file
+        return "xml"
+
+    @staticmethod
+    def msgpack() -> str:
+        return "msgpack"
\ No newline at end of file
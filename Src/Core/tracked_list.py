@@ -0,0 +1,106 @@
+"""
+Коллекции с отслеживанием изменений.
+Сообщают владельцу о каждом изменении состава, что позволяет версионировать данные репозитория
+"""
+
+
+class tracked_list(list):
+    """
+    Список, уведомляющий владельца об изменениях.
+    Обработчик вызывается с аргументами (added, removed, append_only, position):
+        - added: добавленные элементы
+        - removed: удаленные элементы
+        - append_only: True если элементы только дописаны в конец списка
+        - position: позиция замененного элемента при замене одного элемента, иначе None
+    """
+
+    def __init__(self, items=(), callback=None):
+        super().__init__(items)
+        self.__callback = callback
+
+    def __notify(self, added: list, removed: list, append_only: bool = False, position: int = None):
+        if self.__callback is not None:
+            self.__callback(added, removed, append_only, position)
+
+    def append(self, item):
+        super().append(item)
+        self.__notify([item], [], True)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self.__notify(items, [], True)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.__notify([item], [])
+
+    def remove(self, item):
+        index = self.index(item)
+        removed = self[index]
+        super().__delitem__(index)
+        self.__notify([], [removed])
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.__notify([], [item])
+        return item
+
+    def clear(self):
+        removed = list(self)
+        super().clear()
+        self.__notify([], removed)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            removed = super().__getitem__(index)
+            value = list(value)
+            super().__setitem__(index, value)
+            self.__notify(value, removed)
+        else:
+            removed = super().__getitem__(index)
+            super().__setitem__(index, value)
+            self.__notify([value], [removed], False, index if index >= 0 else len(self) + index)
+
+    def __delitem__(self, index):
+        removed = super().__getitem__(index)
+        super().__delitem__(index)
+        self.__notify([], removed if isinstance(index, slice) else [removed])
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.__notify([], [])
+
+    def reverse(self):
+        super().reverse()
+        self.__notify([], [])
+
+
+class tracked_dict(dict):
+    """
+    Словарь списков репозитория.
+    Любой присвоенный список оборачивается в tracked_list, замена списка считается изменением
+    """
+
+    def __init__(self, callback=None):
+        super().__init__()
+        self.__callback = callback
+
+    def __setitem__(self, key, value):
+        old = super().get(key)
+        removed = list(old) if old is not None else []
+        items = tracked_list(value, self.__make_callback(key))
+        super().__setitem__(key, items)
+        if self.__callback is not None:
+            self.__callback(key, list(items), removed, False, None)
+
+    def __make_callback(self, key):
+        def callback(added: list, removed: list, append_only: bool, position: int):
+            if self.__callback is not None:
+                self.__callback(key, added, removed, append_only, position)
+
+        return callback
@@ -0,0 +1,104 @@
+from Src.Core.validator import validator
+
+"""
+Инвертированный индекс по триграммам строкового поля для поиска подстроки (LIKE).
+Хранит для каждой триграммы множество позиций элементов. Поиск сужает кандидатов
+пересечением множеств триграмм искомой строки, затем проверяет вхождение подстроки
+"""
+class trigram_index:
+    __size: int = 3
+
+    def __init__(self):
+        self.__texts = []
+        self.__postings = {}
+
+    @property
+    def count(self) -> int:
+        """
+        Количество проиндексированных элементов
+        """
+        return len(self.__texts)
+
+    @staticmethod
+    def grams(text: str) -> set:
+        """
+        Множество триграмм строки
+        """
+        size = trigram_index.__size
+        return {text[index:index + size] for index in range(len(text) - size + 1)}
+
+    def rebuild(self, values: list):
+        """
+        Перестроить индекс по списку значений (None - значение отсутствует)
+        """
+        self.__texts = []
+        self.__postings = {}
+        self.extend(values)
+
+    def extend(self, values: list):
+        """
+        Добавить значения для элементов, дописанных в конец списка
+        """
+        postings = self.__postings
+        position = len(self.__texts)
+        for value in values:
+            text = None if value is None else (value if type(value) is str else str(value)).lower()
+            self.__texts.append(text)
+            if text is not None:
+                for gram in trigram_index.grams(text):
+                    bucket = postings.get(gram)
+                    if bucket is None:
+                        postings[gram] = {position}
+                    else:
+                        bucket.add(position)
+            position += 1
+
+    def replace(self, position: int, value):
+        """
+        Заменить значение элемента на указанной позиции
+        """
+        validator.validate(position, int)
+        old_text = self.__texts[position]
+        if old_text is not None:
+            for gram in trigram_index.grams(old_text):
+                bucket = self.__postings.get(gram)
+                if bucket is not None:
+                    bucket.discard(position)
+                    if len(bucket) == 0:
+                        del self.__postings[gram]
+
+        text = None if value is None else (value if type(value) is str else str(value)).lower()
+        self.__texts[position] = text
+        if text is not None:
+            for gram in trigram_index.grams(text):
+                self.__postings.setdefault(gram, set()).add(position)
+
+    def search(self, needle: str) -> list:
+        """
+        Позиции элементов, содержащих подстроку (без учета регистра)
+
+        Args:
+            needle (str): искомая подстрока
+
+        Returns:
+            list: позиции по возрастанию
+        """
+        needle = str(needle).lower()
+        texts = self.__texts
+
+        # Короткую подстроку ищем прямым просмотром заранее приведенных строк
+        if len(needle) < trigram_index.__size:
+            return [position for position, text in enumerate(texts) if text is not None and needle in text]
+
+        postings = []
+        for gram in trigram_index.grams(needle):
+            bucket = self.__postings.get(gram)
+            if bucket is None:
+                return []
+            postings.append(bucket)
+
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+
+        # Пересечение триграмм не гарантирует вхождение подстроки - проверяем
+        return sorted(position for position in candidates if needle in texts[position])
@@ -0,0 +1,99 @@
+from Src.Core.abstract_dto import abstact_dto
+from Src.Core.validator import validator, argument_exception
+from Src.Core.aggregate_type import AggregateType
+from Src.Dtos.filter_group_dto import filter_group_dto
+
+"""
+DTO модель запроса агрегации данных.
+Поле группировки по дате может быть усечено до дня или месяца: "date:day", "date:month"
+Пример использования:
+{
+    "filters": [
+        {"field_name": "date", "value": "2024-01-01", "type": "GREATER_EQUAL"}
+    ],
+    "group_by": ["nomenclature/group/name", "date:month"],
+    "aggregates": ["COUNT", "SUM", "AVG"],
+    "field": "quantity"
+}
+"""
+class aggregation_dto(abstact_dto):
+    __filters: list = []
+    __group_by: list = []
+    __aggregates: list = []
+    __field: str = "quantity"
+
+    # Допустимые варианты усечения даты
+    __truncations = ["day", "month"]
+
+    @property
+    def filters(self) -> list:
+        return self.__filters
+
+    @filters.setter
+    def filters(self, value: list):
+        validator.validate(value, list)
+        self.__filters = value
+
+    @property
+    def group_by(self) -> list:
+        return self.__group_by
+
+    @group_by.setter
+    def group_by(self, value: list):
+        validator.validate(value, list)
+        for item in value:
+            validator.validate(item, str)
+            parts = item.split(":")
+            if parts[0].strip() == "" or len(parts) > 2 or \
+                    (len(parts) == 2 and parts[1] not in aggregation_dto.__truncations):
+                raise argument_exception(f"Некорректное поле группировки {item}. Усечение даты: {aggregation_dto.__truncations}")
+        self.__group_by = value
+
+    @property
+    def aggregates(self) -> list:
+        return self.__aggregates
+
+    @aggregates.setter
+    def aggregates(self, value: list):
+        validator.validate(value, list)
+        for item in value:
+            validator.validate(item, AggregateType)
+        self.__aggregates = value
+
+    @property
+    def field(self) -> str:
+        return self.__field
+
+    @field.setter
+    def field(self, value: str):
+        validator.validate(value, str)
+        self.__field = value
+
+    def create(self, data) -> "aggregation_dto":
+        """
+        Фабричный метод для создания DTO из словаря
+
+        Args:
+            data (dict): словарь с фильтрами, полями группировки и агрегатами
+
+        Returns:
+            aggregation_dto: созданный объект DTO
+        """
+        validator.validate(data, dict)
+
+        self.filters = filter_group_dto.parse(data.get("filters", []))
+        self.group_by = data.get("group_by", [])
+        if "field" in data:
+            self.field = data["field"]
+
+        aggregates = data.get("aggregates", AggregateType.get_all_types())
+        validator.validate(aggregates, list)
+        try:
+            self.aggregates = [AggregateType[str(item).upper()] for item in aggregates]
+        except KeyError:
+            raise argument_exception(f"Неизвестная агрегатная функция. Доступны: {AggregateType.get_all_types()}")
+
+        if len(self.aggregates) == 0:
+            raise argument_exception("Не указаны агрегатные функции")
+
+        return self
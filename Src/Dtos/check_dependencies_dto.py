@@ -2,7 +2,8 @@
 DTO для проверки зависимостей перед удалением объекта
 """
 from Src.Core.abstract_dto import abstact_dto
-from Src.Models.abstract_reference import abstact_reference
+from Src.Core.abstract_reference import abstact_reference
+from Src.Core.abstract_model import abstact_model
 from Src.Core.validator import validator
 
 class check_dependencies_dto(abstact_dto):
@@ -17,5 +18,5 @@ class check_dependencies_dto(abstact_dto):
 
     @model.setter
     def model(self, value):
-        validator.validate(value, abstact_reference)
+        validator.validate(value, (abstact_model, abstact_reference))
         self.__model = value
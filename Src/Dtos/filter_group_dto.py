@@ -0,0 +1,118 @@
+from Src.Core.abstract_dto import abstact_dto
+from Src.Core.validator import validator, argument_exception
+from Src.Core.filter_operator import FilterOperator
+from Src.Dtos.filter_dto import filter_dto
+
+"""
+DTO модель группы фильтров с логическим оператором.
+Элементы группы - filter_dto или вложенные группы
+Пример использования ("мука" ИЛИ "сахар", но не из группы "Архив"):
+{
+    "operator": "AND",
+    "filters": [
+        {
+            "operator": "OR",
+            "filters": [
+                {"field_name": "name", "value": "мука", "type": "LIKE"},
+                {"field_name": "name", "value": "сахар", "type": "LIKE"}
+            ]
+        },
+        {
+            "operator": "NOT",
+            "filters": [
+                {"field_name": "group/name", "value": "Архив", "type": "EQUALS"}
+            ]
+        }
+    ]
+}
+"""
+class filter_group_dto(abstact_dto):
+    __operator: FilterOperator = FilterOperator.AND
+    __filters: list = []
+
+    @property
+    def operator(self) -> FilterOperator:
+        return self.__operator
+
+    @operator.setter
+    def operator(self, value: FilterOperator):
+        validator.validate(value, FilterOperator)
+        self.__operator = value
+
+    @property
+    def filters(self) -> list:
+        return self.__filters
+
+    @filters.setter
+    def filters(self, value: list):
+        validator.validate(value, list)
+        for item in value:
+            validator.validate(item, (filter_dto, filter_group_dto))
+        self.__filters = value
+
+    def create(self, data) -> "filter_group_dto":
+        """
+        Фабричный метод для создания группы из словаря
+
+        Args:
+            data (dict): словарь с оператором и списком фильтров
+
+        Returns:
+            filter_group_dto: созданный объект DTO
+        """
+        validator.validate(data, dict)
+
+        try:
+            self.operator = FilterOperator[str(data.get("operator", "AND")).upper()]
+        except KeyError:
+            raise argument_exception(f"Неизвестный логический оператор {data.get('operator')}. Доступны: {FilterOperator.get_all_types()}")
+
+        items = data.get("filters", [])
+        validator.validate(items, list)
+        self.filters = [filter_group_dto.create_node(item) for item in items]
+
+        if self.operator == FilterOperator.NOT and len(self.filters) != 1:
+            raise argument_exception("Оператор NOT применяется ровно к одному условию")
+
+        return self
+
+    @staticmethod
+    def create_node(data: dict):
+        """
+        Создать элемент выражения: группу (есть ключ operator) или простой фильтр
+
+        Args:
+            data (dict): словарь с описанием элемента
+
+        Returns:
+            filter_dto или filter_group_dto
+        """
+        validator.validate(data, dict)
+        if "operator" in data:
+            return filter_group_dto().create(data)
+
+        return filter_dto().create(data)
+
+    @staticmethod
+    def parse(data) -> list:
+        """
+        Разобрать выражение фильтрации из тела запроса.
+        Список - условия, объединенные по И; словарь - одно условие или группа
+
+        Args:
+            data (list | dict): выражение фильтрации
+
+        Returns:
+            list: список условий, объединенных по И
+        """
+        if isinstance(data, list):
+            return [filter_group_dto.create_node(item) for item in data]
+
+        validator.validate(data, dict)
+        node = filter_group_dto.create_node(data)
+
+        # Группа И верхнего уровня раскрывается в список условий
+        if isinstance(node, filter_group_dto) and node.operator == FilterOperator.AND:
+            return node.filters
+
+        return [node]
@@ -2,7 +2,8 @@
 DTO для обновления зависимостей при изменении объекта
 """
 from Src.Core.abstract_dto import abstact_dto
-from Src.Models.abstract_reference import abstact_reference
+from Src.Core.abstract_reference import abstact_reference
+from Src.Core.abstract_model import abstact_model
 from Src.Core.validator import validator
 
 class update_dependencies_dto(abstact_dto):
@@ -18,7 +19,7 @@ class update_dependencies_dto(abstact_dto):
 
     @old_model.setter
     def old_model(self, value):
-        validator.validate(value, abstact_reference)
+        validator.validate(value, (abstact_model, abstact_reference))
         self.__old_model = value
 
     """
@@ -30,5 +31,5 @@ class update_dependencies_dto(abstact_dto):
 
     @new_model.setter
     def new_model(self, value):
-        validator.validate(value, abstact_reference)
+        validator.validate(value, (abstact_model, abstact_reference))
         self.__new_model = value
@@ -0,0 +1,119 @@
+from Src.reposity import reposity
+from Src.Logics.query_planner import query_planner
+from Src.Dtos.aggregation_dto import aggregation_dto
+from Src.Core.aggregate_type import AggregateType
+from Src.Core.compiled_filter import compiled_filter
+from Src.Core.validator import validator, argument_exception
+from datetime import datetime
+
+"""
+Сервис агрегации данных репозитория.
+Данные отбираются через планировщик фильтров, затем за один проход
+по отобранным элементам считаются все агрегаты по каждой группе
+"""
+class aggregation_service:
+    __repo: reposity = None
+    __planner: query_planner = None
+
+    # Форматы усечения даты для группировки
+    __truncations = {
+        "day": "%Y-%m-%d",
+        "month": "%Y-%m"
+    }
+
+    def __init__(self, data: reposity, planner: query_planner = None):
+        if not isinstance(data, reposity):
+            raise argument_exception("Некорректный тип данных")
+        if planner is not None and not isinstance(planner, query_planner):
+            raise argument_exception("Некорректный тип планировщика")
+        self.__repo = data
+        self.__planner = planner if planner is not None else query_planner(data)
+
+    def aggregate(self, key: str, request: aggregation_dto) -> list:
+        """
+        Сгруппировать отфильтрованные данные и посчитать агрегаты
+
+        Args:
+            key (str): ключ данных репозитория
+            request (aggregation_dto): фильтры, поля группировки и агрегаты
+
+        Returns:
+            list: строки агрегатов, упорядоченные по значениям группировки
+        """
+        validator.validate(key, str)
+        validator.validate(request, aggregation_dto)
+
+        data = self.__planner.execute(key, request.filters)
+        keys = [aggregation_service.__make_key(field) for field in request.group_by]
+        get_value = compiled_filter.getter(request.field)
+
+        # Накопители группы: [количество, сумма, минимум, максимум, количество чисел]
+        groups = {}
+        for item in data:
+            group_key = tuple(make(item) for make in keys)
+            accumulator = groups.get(group_key)
+            if accumulator is None:
+                accumulator = [0, 0.0, None, None, 0]
+                groups[group_key] = accumulator
+
+            accumulator[0] += 1
+            try:
+                value = get_value(item)
+            except AttributeError:
+                continue
+
+            value_type = type(value)
+            if value_type is not float and value_type is not int:
+                continue
+
+            accumulator[1] += value
+            accumulator[4] += 1
+            if accumulator[2] is None or value < accumulator[2]:
+                accumulator[2] = value
+            if accumulator[3] is None or value > accumulator[3]:
+                accumulator[3] = value
+
+        result = []
+        for group_key in sorted(groups.keys(), key=lambda values: tuple("" if value is None else str(value) for value in values)):
+            count, total, minimum, maximum, numbers = groups[group_key]
+            row = dict(zip(request.group_by, group_key))
+            values = {
+                AggregateType.COUNT: count,
+                AggregateType.SUM: total,
+                AggregateType.MIN: minimum,
+                AggregateType.MAX: maximum,
+                AggregateType.AVG: total / numbers if numbers > 0 else None
+            }
+            for aggregate in request.aggregates:
+                row[aggregate.value.lower()] = values[aggregate]
+            result.append(row)
+
+        return result
+
+    @staticmethod
+    def __make_key(field: str):
+        """
+        Создает функцию получения значения группировки.
+        Даты усекаются до дня / месяца, модели заменяются наименованием
+        """
+        parts = field.split(":")
+        getter = compiled_filter.getter(parts[0])
+        date_format = aggregation_service.__truncations[parts[1]] if len(parts) == 2 else None
+
+        def make(item):
+            try:
+                value = getter(item)
+            except AttributeError:
+                return None
+
+            if isinstance(value, datetime):
+                return value.strftime(date_format) if date_format is not None else value.isoformat()
+            if value is None or isinstance(value, (str, int, float, bool)):
+                return value
+            if hasattr(value, "name"):
+                return value.name
+            if hasattr(value, "unique_code"):
+                return value.unique_code
+            return str(value)
+
+        return make
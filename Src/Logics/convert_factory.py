@@ -5,23 +5,50 @@ from Src.Logics.reference_convertor import reference_convertor
 from Src.Core.validator import validator
 from Src.Core.abstract_model import abstact_model
 from Src.Core.common import common
+import operator
 
 """
 Фабрика конвертеров по шаблону "Фабрика".
-Управляет созданием и использованием конверторов с рекурсивной обработкой
+Управляет созданием и использованием конверторов с рекурсивной обработкой.
+Для каждого класса модели один раз строится план: упорядоченный список полей
+с готовыми getter'ами. Конвертор значения выбирается по типу один раз и запоминается.
+В нормализованном режиме вложенные модели заменяются кодом, а сами модели
+конвертируются один раз в таблицу связанных моделей (references)
 """
 
 class convert_factory:
+    __plans: dict = {}
 
-    def __init__(self):
+    def __init__(self, normalized: bool = False):
         """
         Инициализация фабрики конверторов
+
+        Args:
+            normalized (bool): нормализованный режим - вложенные модели заменяются кодом
         """
+        validator.validate(normalized, bool)
         self._convertors = [
             basic_convertor(),
             datetime_convertor(), 
             reference_convertor()
         ]
+        self.__dispatch = {}
+        self.__normalized = normalized
+        self.__references = {}
+
+    @property
+    def normalized(self) -> bool:
+        """
+        Нормализованный режим
+        """
+        return self.__normalized
+
+    @property
+    def references(self) -> dict:
+        """
+        Таблица связанных моделей нормализованного режима: код -> сконвертированная модель
+        """
+        return self.__references
     
     def convert(self, obj) -> dict:
         """
@@ -38,16 +65,9 @@ class convert_factory:
             
         result = {}
 
-        # Для моделей используем common.get_fields(), для обычных объектов - dir()
-        if isinstance(obj, abstact_model):
-            fields = common.get_fields(obj)
-        else:
-            # Для обычных объектов используем dir() и фильтруем приватные поля
-            fields = [attr for attr in dir(obj) if not attr.startswith('_') and not callable(getattr(obj, attr))]
-
-        for field in fields:
+        for field, getter in self.__plan(obj):
             try:
-                value = getattr(obj, field)
+                value = getter(obj)
 
                 # Обрабатываем значение в зависимости от типа
                 converted_value = self._convert_value(value)
@@ -60,7 +80,42 @@ class convert_factory:
                 continue
 
         return result
-    
+
+    def __plan(self, obj) -> list:
+        """
+        План конвертации объекта: список пар (поле, getter)
+
+        Args:
+            obj: объект для конвертации
+
+        Returns:
+            list: пары (наименование поля, функция получения значения)
+        """
+        plan = convert_factory.__plans.get(obj.__class__)
+        if plan is not None:
+            return plan
+
+        # Для моделей используем common.get_fields(), для обычных объектов - dir()
+        if isinstance(obj, abstact_model):
+            fields = common.get_fields(obj)
+        else:
+            # Для обычных объектов используем dir() и фильтруем приватные поля.
+            # Состав полей зависит от экземпляра, поэтому план не запоминается
+            fields = [attr for attr in dir(obj) if not attr.startswith('_') and not callable(getattr(obj, attr))]
+            return [(field, operator.attrgetter(field)) for field in fields]
+
+        plan = [(field, operator.attrgetter(field)) for field in fields]
+        convert_factory.__plans[obj.__class__] = plan
+        return plan
+
+    @staticmethod
+    def reset_plans():
+        """
+        Сбросить планы конвертации (после изменения классов моделей)
+        """
+        convert_factory.__plans.clear()
+        common.reset_schema()
+
     def _convert_value(self, value) -> any:
         """
         Конвертирует значение в зависимости от типа
@@ -71,31 +126,73 @@ class convert_factory:
         Returns:
             any: сериализуемое значение
         """
+        value_type = value.__class__
+        convert = self.__dispatch.get(value_type)
+        if convert is None:
+            convert = self.__resolve(value)
+            self.__dispatch[value_type] = convert
+
+        return convert(value)
+
+    def __resolve(self, value):
+        """
+        Подбирает функцию конвертации для типа значения
+
+        Args:
+            value: пример значения
+
+        Returns:
+            функция value -> сериализуемое значение
+        """
         # Обрабатываем None
         if value is None:
-            return None
-            
+            return lambda item: None
+
         # Обрабатываем списки рекурсивно
         if isinstance(value, list):
-            converted_list = []
-            for item in value:
-                converted_item = self._convert_value(item)
-                if converted_item is not None:
-                    converted_list.append(converted_item)
-            return converted_list if converted_list else None
-        
-        # Обрабатываем модели рекурсивно
+            return self.__convert_list
+
+        # Обрабатываем модели рекурсивно (в нормализованном режиме - ссылкой по коду)
         if isinstance(value, abstact_model):
-            return self.convert(value)
-        
+            return self.__reference if self.__normalized else self.convert
+
         # Ищем подходящий конвертор через can_convert
         convertor = self._find_convertor(value)
-        if convertor:
-            result_dict = convertor.convert("field", value)
-            return list(result_dict.values())[0] if result_dict else value
-        
-        # Для остальных типов возвращаем как есть
-        return value
+        if convertor is None:
+            # Для остальных типов возвращаем как есть
+            return lambda item: item
+
+        # Простые типы базовый конвертор возвращает без изменений
+        if isinstance(convertor, basic_convertor):
+            return lambda item: item
+
+        def convert(item):
+            result_dict = convertor.convert("field", item)
+            return list(result_dict.values())[0] if result_dict else item
+
+        return convert
+
+    def __reference(self, value: abstact_model) -> str:
+        """
+        Код вложенной модели. Модель конвертируется в таблицу связанных моделей при первой встрече
+        """
+        code = value.unique_code
+        if code not in self.__references:
+            # Код заносится до конвертации, чтобы циклические ссылки не зацикливали обход
+            self.__references[code] = None
+            self.__references[code] = self.convert(value)
+        return code
+
+    def __convert_list(self, value: list):
+        """
+        Конвертирует список рекурсивно, пустой результат заменяется на None
+        """
+        converted_list = []
+        for item in value:
+            converted_item = self._convert_value(item)
+            if converted_item is not None:
+                converted_list.append(converted_item)
+        return converted_list if converted_list else None
     
     def _find_convertor(self, value) -> abstract_covertor:
         """
@@ -1,6 +1,15 @@
 import json
+import os
+import gzip
+import hmac
+import hashlib
+import tempfile
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from Src.Core.validator import validator, operation_exception
+from Src.Core.validator import validator, argument_exception, operation_exception
 from Src.reposity import reposity
 from Src.Logics.convert_factory import convert_factory
 
@@ -11,39 +20,395 @@ class export_service:
     __repo: reposity
     __convert_factory: convert_factory
 
-    def __init__(self, repository: reposity):
+    # Разделы файла экспорта и соответствующие ключи репозитория
+    __sections: list = [
+        ("ranges", reposity.range_key()),
+        ("groups", reposity.group_key()),
+        ("nomenclatures", reposity.nomenclature_key()),
+        ("storages", reposity.storage_key()),
+        ("transactions", reposity.transaction_key()),
+        ("receipts", reposity.receipt_key())
+    ]
+
+    # Количество элементов, накапливаемых перед записью в файл
+    __chunk_size: int = 500
+
+    # Количество элементов в одном задании процесса при параллельном экспорте
+    __parallel_chunk_size: int = 5000
+
+    # Цепочка резервных копий: код полной копии, версия последней копии в ее заголовке
+    # и версия данных репозитория, после которой изменения попадают в следующую копию
+    __chain: str = None
+    __label: int = None
+    __version: int = None
+
+    # Маска прав процесса для создаваемых файлов
+    __mask: int = None
+
+    # Подпись файла экспорта (HMAC-SHA256 ключом сервера) хранится рядом с ним в файле с этим окончанием
+    __signature_suffix: str = ".sig"
+
+    # Размер ключа подписи и блока чтения файла при проверке подписи (байт)
+    __secret_size: int = 32
+    __block_size: int = 1024 * 1024
+
+    # Предел количества процессов и общий пул процессов параллельного экспорта (создается один раз)
+    __max_workers: int = 4
+    __pool: ProcessPoolExecutor = None
+    __pool_workers: int = 1
+    __pool_lock = threading.Lock()
+
+    def __init__(self, repository: reposity, secret: bytes = None):
+        """
+        Args:
+            repository (reposity): репозиторий
+            secret (bytes): ключ подписи файлов экспорта (см. load_secret).
+                Без ключа используется случайный: подписи действуют только в этом процессе
+        """
+        if secret is not None:
+            validator.validate(secret, bytes)
+            if len(secret) < export_service.__secret_size:
+                raise argument_exception("Слишком короткий ключ подписи")
+
         self.__repo = repository
         self.__convert_factory = convert_factory()
+        self.__secret = secret if secret is not None else os.urandom(export_service.__secret_size)
+        self.__lock = threading.Lock()
 
-    def export_all_data(self, file_path: str) -> bool:
+    @staticmethod
+    def load_secret(file_path: str) -> bytes:
         """
-        Экспортирует все данные из репозитория в JSON файл
+        Прочитать ключ подписи файлов экспорта. При первом запуске ключ создается
+        (случайный, файл доступен только владельцу), поэтому подписи действуют после перезапуска
+
+        Args:
+            file_path (str): путь к файлу ключа
+
+        Returns:
+            bytes: ключ подписи
         """
         validator.validate(file_path, str)
+        try:
+            handle = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(file_path, "rb") as file:
+                secret = file.read()
+            if len(secret) < export_service.__secret_size:
+                raise operation_exception(f"Некорректный ключ подписи в файле {file_path}")
+            return secret
+
+        secret = os.urandom(export_service.__secret_size)
+        with os.fdopen(handle, "wb") as file:
+            file.write(secret)
+        return secret
+
+    @staticmethod
+    def signature_path(file_path: str) -> str:
+        """
+        Путь к файлу подписи файла экспорта
+        """
+        validator.validate(file_path, str)
+        return file_path + export_service.__signature_suffix
+
+    @staticmethod
+    def start_pool(workers: int) -> int:
+        """
+        Создать общий пул процессов параллельного экспорта (при запуске приложения).
+        Количество процессов ограничено; повторный вызов возвращает уже созданный пул
+
+        Args:
+            workers (int): желаемое количество процессов
+
+        Returns:
+            int: количество процессов пула (1 - пул не нужен)
+        """
+        validator.validate(workers, int)
+        if workers <= 0:
+            raise argument_exception("Некорректный аргумент!")
+
+        with export_service.__pool_lock:
+            if export_service.__pool is None:
+                count = min(workers, export_service.__max_workers)
+                if count > 1:
+                    export_service.__pool = ProcessPoolExecutor(max_workers=count)
+                    export_service.__pool_workers = count
+            return export_service.__pool_workers
+
+    @staticmethod
+    def sections() -> list:
+        """
+        Разделы файла экспорта: список (наименование раздела, ключ репозитория)
+        """
+        return list(export_service.__sections)
 
-        export_data = {
-            "export_date": datetime.now().isoformat(),
-            "ranges": self.__convert_entities(self.__repo.data.get(reposity.range_key(), [])),
-            "groups": self.__convert_entities(self.__repo.data.get(reposity.group_key(), [])),
-            "nomenclatures": self.__convert_entities(self.__repo.data.get(reposity.nomenclature_key(), [])),
-            "storages": self.__convert_entities(self.__repo.data.get(reposity.storage_key(), [])),
-            "transactions": self.__convert_entities(self.__repo.data.get(reposity.transaction_key(), [])),
-            "receipts": self.__convert_entities(self.__repo.data.get(reposity.receipt_key(), []))
-        }
+    def produced(self, file_path: str) -> bool:
+        """
+        Записан ли файл сервисом экспорта с этим ключом и не изменялся ли после записи
+        (такие резервные копии можно восстанавливать в доверенном режиме).
+        Проверяется подпись файла, поэтому признак сохраняется после перезапуска
 
+        Args:
+            file_path (str): путь к файлу
+        """
+        validator.validate(file_path, str)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            with open(export_service.signature_path(file_path), "r", encoding="ascii") as file:
+                expected = file.read().strip()
+            actual = self.__signature(file_path)
+        except (OSError, ValueError):
+            return False
+        return hmac.compare_digest(expected, actual)
+
+    def __signature(self, file_path: str) -> str:
+        """
+        Подпись содержимого файла (HMAC-SHA256 ключом сервиса)
+        """
+        digest = hmac.new(self.__secret, digestmod=hashlib.sha256)
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(export_service.__block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @property
+    def has_base(self) -> bool:
+        """
+        Есть ли полная резервная копия, к которой можно строить инкрементальные
+        """
+        return self.__chain is not None
+
+    def export_all_data(self, file_path: str, compress: bool = False, workers: int = 1) -> bool:
+        """
+        Экспортирует все данные из репозитория в JSON файл.
+        Данные пишутся по разделам и по элементам во временный файл,
+        который по окончании атомарно заменяет файл экспорта
+
+        Args:
+            file_path (str): путь к файлу экспорта
+            compress (bool): сжать файл gzip
+            workers (int): количество процессов для конвертации больших разделов (1 - без процессов).
+                Используется общий пул процессов, количество ограничено его размером
+        """
+        validator.validate(file_path, str)
+        validator.validate(compress, bool)
+        validator.validate(workers, int)
+        if workers <= 0:
+            raise argument_exception("Некорректный аргумент!")
+
+        with self.__lock:
+            # Снимок данных и версия фиксируются вместе до записи: изменения во время записи
+            # в копию не попадают и войдут в следующую
+            chain = uuid.uuid4().hex
+            version, data = self.__repo.snapshot([key for _, key in self.__sections])
+            header = {"chain": chain, "version": version}
+            sections = [(section, data[key]) for section, key in self.__sections]
+
+            # Процессы нужны только для больших разделов (на практике - для транзакций)
+            if workers > 1 and any(len(entities) > self.__parallel_chunk_size for _, entities in sections):
+                workers = min(workers, export_service.start_pool(workers))
+                self.__write(file_path, compress, self.__chunks(header, sections, None, export_service.__pool, workers))
+            else:
+                self.__write(file_path, compress, self.__chunks(header, sections))
+            self.__chain = chain
+            self.__label = version
+            self.__version = version
+            self.__repo.prune_changes(version)
+            return True
+
+    def resume(self, header: dict):
+        """
+        Продолжить цепочку резервных копий после восстановления из нее (например, после перезапуска).
+        Заголовок - заголовок последней примененной копии цепочки; данные репозитория
+        должны соответствовать ей, поэтому изменения учитываются от текущей версии данных
+
+        Args:
+            header (dict): заголовок последней резервной копии цепочки
+        """
+        validator.validate(header, dict)
+        if not isinstance(header.get("chain"), str) or not isinstance(header.get("version"), int):
+            raise argument_exception("В заголовке резервной копии нет цепочки и версии")
+
+        with self.__lock:
+            version = self.__repo.version()
+            self.__chain = header["chain"]
+            self.__label = header["version"]
+            self.__version = version
+            self.__repo.prune_changes(version)
+
+    def export_changes(self, file_path: str, compress: bool = False) -> bool:
+        """
+        Экспортирует изменения после предыдущей резервной копии (инкрементальная копия).
+        Содержит добавленные и измененные элементы по разделам и коды удаленных элементов
+
+        Args:
+            file_path (str): путь к файлу экспорта
+            compress (bool): сжать файл gzip
+        """
+        validator.validate(file_path, str)
+        validator.validate(compress, bool)
+
+        # Копии одной цепочки создаются по очереди
+        with self.__lock:
+            if self.__chain is None:
+                raise operation_exception("Нет полной резервной копии для инкрементальной!")
+
+            version, changes = self.__repo.changes_snapshot([key for _, key in self.__sections], self.__version)
+            header = {"chain": self.__chain, "base_version": self.__label, "version": version}
+            sections = []
+            deleted = {}
+            for section, key in self.__sections:
+                changed, removed = changes[key]
+                sections.append((section, changed))
+                deleted[section] = removed
+
+            # Инкрементальная копия - звено цепочки: существующий файл не заменяется,
+            # иначе изменения предыдущего звена (уже удаленные из журнала) были бы потеряны
+            self.__write(file_path, compress, self.__chunks(header, sections, deleted), False)
+            self.__label = version
+            self.__version = version
+            self.__repo.prune_changes(version)
             return True
+
+    def __write(self, file_path: str, compress: bool, chunks, overwrite: bool = True):
+        """
+        Записать части во временный файл и атомарно заменить им файл экспорта.
+        Без overwrite существующий файл не заменяется (ошибка).
+        После файла записывается его подпись (до этого файл не считается записанным сервисом)
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        handle, temp_path = tempfile.mkstemp(prefix=".export_", suffix=".tmp", dir=directory)
+        os.close(handle)
+
+        try:
+            if compress:
+                file = gzip.open(temp_path, 'wb')
+            else:
+                file = open(temp_path, 'wb')
+
+            with file:
+                for chunk in chunks:
+                    file.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+
+            # mkstemp создает файл только для владельца - права как у обычного файла (по umask)
+            os.chmod(temp_path, 0o666 & ~export_service.__umask())
+            signature = self.__signature(temp_path)
+            if overwrite:
+                os.replace(temp_path, file_path)
+            else:
+                # Жесткая ссылка создается атомарно и только если файла еще нет
+                os.link(temp_path, file_path)
+                os.unlink(temp_path)
+            self.__write_signature(file_path, signature)
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
             raise operation_exception(f"Ошибка при экспорте данных: {str(e)}")
 
-    def __convert_entities(self, entities: list) -> list:
+    @staticmethod
+    def __write_signature(file_path: str, signature: str):
+        """
+        Атомарно записать файл подписи рядом с файлом экспорта
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        handle, temp_path = tempfile.mkstemp(prefix=".signature_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(handle, "w", encoding="ascii") as file:
+                file.write(signature)
+            os.replace(temp_path, export_service.signature_path(file_path))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def __umask() -> int:
         """
-        Конвертирует список сущностей в сериализуемый формат
+        Маска прав процесса. os.umask позволяет прочитать ее только через установку,
+        поэтому она читается один раз и запоминается
         """
-        result = []
+        if export_service.__mask is None:
+            mask = os.umask(0)
+            os.umask(mask)
+            export_service.__mask = mask
+        return export_service.__mask
+
+    def __chunks(self, header: dict, sections: list, deleted: dict = None, executor=None, workers: int = 1):
+        """
+        Части файла экспорта. Результат совпадает с json.dump(..., indent=2) по всем данным
+        """
+        yield "{\n  \"export_date\": " + json.dumps(datetime.now().isoformat())
+        for name, value in header.items():
+            yield ",\n  " + json.dumps(name) + ": " + json.dumps(value)
+
+        for section, entities in sections:
+            yield ",\n  " + json.dumps(section) + ": "
+            if executor is not None and len(entities) > self.__parallel_chunk_size:
+                yield from self.__convert_parallel(entities, executor, workers)
+            else:
+                yield from self.__convert_entities(entities)
+
+        if deleted is not None:
+            text = json.dumps(deleted, ensure_ascii=False, indent=2)
+            yield ",\n  \"deleted\": " + text.replace("\n", "\n  ")
+
+        yield "\n}"
+
+    def __convert_entities(self, entities: list):
+        """
+        Конвертирует список сущностей в части JSON массива (по одному элементу)
+        """
+        if len(entities) == 0:
+            yield "[]"
+            return
+
+        batch = ["["]
+        separator = "\n    "
         for entity in entities:
             converted = self.__convert_factory.convert(entity)
-            result.append(converted)
-        return result
+            text = json.dumps(converted, ensure_ascii=False, indent=2)
+            batch.append(separator + text.replace("\n", "\n    "))
+            separator = ",\n    "
+
+            if len(batch) >= self.__chunk_size:
+                yield "".join(batch)
+                batch = []
+
+        batch.append("\n  ]")
+        yield "".join(batch)
+
+    def __convert_parallel(self, entities: list, executor, workers: int):
+        """
+        Конвертирует большой раздел в процессах: части конвертируются независимо,
+        а фрагменты записываются в исходном порядке. В работе не больше двух частей на процесс,
+        поэтому готовые фрагменты не накапливаются в памяти
+        """
+        size = self.__parallel_chunk_size
+        pending = deque()
+        separator = b"[\n    "
+
+        for start in range(0, len(entities), size):
+            pending.append(executor.submit(export_service.serialize_chunk, entities[start:start + size]))
+            if len(pending) >= workers * 2:
+                yield separator + pending.popleft().result()
+                separator = b",\n    "
+
+        while pending:
+            yield separator + pending.popleft().result()
+            separator = b",\n    "
+
+        yield b"\n  ]"
+
+    @staticmethod
+    def serialize_chunk(entities: list) -> bytes:
+        """
+        Фрагмент JSON массива раздела по части элементов (выполняется в процессе)
+
+        Args:
+            entities (list): часть элементов раздела
+
+        Returns:
+            bytes: элементы через разделитель, с отступом раздела, в UTF-8
+        """
+        factory = convert_factory()
+        texts = [json.dumps(factory.convert(entity), ensure_ascii=False, indent=2).replace("\n", "\n    ")
+                 for entity in entities]
+        return ",\n    ".join(texts).encode("utf-8")
@@ -3,6 +3,7 @@ from Src.Logics.response_csv import response_csv
 from Src.Logics.response_markdown import response_markdown
 from Src.Logics.response_json import response_json
 from Src.Logics.response_xml import response_xml
+from Src.Logics.response_msgpack import response_msgpack
 from Src.Core.validator import operation_exception
 from Src.Models.settings_model import settings_model, ResponseFormat
 
@@ -11,7 +12,8 @@ class factory_entities:
         "csv": response_csv,
         "markdown": response_markdown,
         "json": response_json,
-        "xml": response_xml
+        "xml": response_xml,
+        "msgpack": response_msgpack
     }
 
     __settings: settings_model
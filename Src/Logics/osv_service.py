@@ -4,6 +4,7 @@ from Src.Models.range_model import range_model
 from Src.Dtos.filter_dto import filter_dto
 from Src.Core.prototype import prototype
 from datetime import datetime
+from bisect import bisect_right
 from Src.Core.validator import validator, operation_exception, argument_exception
 
 
@@ -42,7 +43,8 @@ class osv_service:
         с применением прототипа внутри процесса формирования
 
         Args:
-            filters (list): список объектов filter_dto с условиями фильтрации
+            filters (list): список объектов filter_dto с условиями фильтрации.
+                Условия по номенклатуре могут быть группами filter_group_dto (И / ИЛИ / НЕ)
 
         Returns:
             list: данные отчета ОСВ
@@ -60,6 +62,97 @@ class osv_service:
 
         return report_data
 
+    def generate_osv_report_periods(self, boundaries: list, storage_id: str) -> list:
+        """
+        Генерирует сравнительную оборотно-сальдовую ведомость по нескольким
+        последовательным периодам за один проход по транзакциям.
+        Период с номером i - это интервал [boundaries[i], boundaries[i + 1])
+
+        Args:
+            boundaries (list): границы периодов (datetime) по возрастанию, не менее двух
+            storage_id (str): ID склада
+
+        Returns:
+            list: данные отчета ОСВ, по каждой номенклатуре список периодов
+        """
+        validator.validate(boundaries, list)
+        validator.validate(storage_id, str)
+
+        if len(boundaries) < 2:
+            raise operation_exception("Необходимо указать не менее двух границ периодов")
+
+        for boundary in boundaries:
+            validator.validate(boundary, datetime)
+
+        for index in range(1, len(boundaries)):
+            if boundaries[index - 1] >= boundaries[index]:
+                raise operation_exception("Границы периодов должны быть указаны по возрастанию")
+
+        transactions = self.__repo.data.get(reposity.transaction_key(), [])
+        nomenclatures = self.__repo.data.get(reposity.nomenclature_key(), [])
+        storages = self.__repo.data.get(reposity.storage_key(), [])
+
+        # Проверяем что склад существует
+        storage = next((s for s in storages if s.unique_code == storage_id), None)
+        if not storage:
+            raise operation_exception(f"Склад с ID {storage_id} не найден")
+
+        periods_count = len(boundaries) - 1
+        opening = {}
+        incomes = {}
+        outcomes = {}
+
+        # Один проход: номер периода транзакции определяется бинарным поиском по границам
+        for transaction in transactions:
+            if transaction.storage.unique_code != storage_id:
+                continue
+
+            nomenclature_id = transaction.nomenclature.unique_code
+            index = bisect_right(boundaries, transaction.date) - 1
+            if index >= periods_count:
+                continue
+
+            quantity = self.__convert_to_base_units(transaction)
+            if index < 0:
+                opening[nomenclature_id] = opening.get(nomenclature_id, 0.0) + quantity
+            elif quantity > 0:
+                incomes.setdefault(nomenclature_id, [0.0] * periods_count)[index] += quantity
+            elif quantity < 0:
+                outcomes.setdefault(nomenclature_id, [0.0] * periods_count)[index] += abs(quantity)
+
+        result = []
+        empty = [0.0] * periods_count
+
+        for nomenclature in nomenclatures:
+            nomenclature_id = nomenclature.unique_code
+            start_balance = opening.get(nomenclature_id, 0.0)
+            nomenclature_incomes = incomes.get(nomenclature_id, empty)
+            nomenclature_outcomes = outcomes.get(nomenclature_id, empty)
+
+            periods = []
+            for index in range(periods_count):
+                income = nomenclature_incomes[index]
+                outcome = nomenclature_outcomes[index]
+
+                period_item = {
+                    "start_date": boundaries[index].isoformat(),
+                    "end_date": boundaries[index + 1].isoformat()
+                }
+                period_item.update(self.__build_balances(nomenclature, start_balance, income, outcome))
+                periods.append(period_item)
+
+                start_balance = start_balance + income - outcome
+
+            result.append({
+                "nomenclature": nomenclature.name,
+                "nomenclature_name": nomenclature.name,
+                "unit_measurement": nomenclature.range.name if nomenclature.range else "",
+                "nomenclature_id": nomenclature_id,
+                "periods": periods
+            })
+
+        return result
+
     def _generate_report_data(self, start_date: datetime, end_date: datetime, storage_id: str) -> list:
         """
         Генерирует данные отчета ОСВ
@@ -96,34 +189,19 @@ class osv_service:
 
             income = sum(self.__convert_to_base_units(t)
                          for t in nom_transactions
-                         if start_date <= t.date <= end_date and t.count > 0)
+                         if start_date <= t.date <= end_date and t.quantity > 0)
 
             outcome = sum(abs(self.__convert_to_base_units(t))
                           for t in nom_transactions
-                          if start_date <= t.date <= end_date and t.count < 0)
-
-            end_balance = start_balance + income - outcome
-
-            # Конвертируем в единицы измерения номенклатуры
-            if nomenclature.range:
-                display_start_balance = self.__convert_from_base_units(start_balance, nomenclature.range)
-                display_income = self.__convert_from_base_units(income, nomenclature.range)
-                display_outcome = self.__convert_from_base_units(outcome, nomenclature.range)
-                display_end_balance = self.__convert_from_base_units(end_balance, nomenclature.range)
-            else:
-                display_start_balance = start_balance
-                display_income = income
-                display_outcome = outcome
-                display_end_balance = end_balance
+                          if start_date <= t.date <= end_date and t.quantity < 0)
 
             report_item = {
                 "nomenclature": nomenclature.name,
-                "start_balance": round(display_start_balance, 3),
-                "income": round(display_income, 3),
-                "outcome": round(display_outcome, 3),
-                "end_balance": round(display_end_balance, 3),
+                "nomenclature_name": nomenclature.name,
+                "unit_measurement": nomenclature.range.name if nomenclature.range else "",
                 "nomenclature_id": nomenclature.unique_code
             }
+            report_item.update(self.__build_balances(nomenclature, start_balance, income, outcome))
 
             result.append(report_item)
 
@@ -153,7 +231,7 @@ class osv_service:
             raise operation_exception(f"Склад с ID {storage_id} не найден")
 
         # Фильтруем номенклатуры с помощью прототипа
-        nomenclature_filters = [f for f in filters if f.field_name not in ["period", "storage"]]
+        nomenclature_filters = [f for f in filters if not isinstance(f, filter_dto) or f.field_name not in ["period", "storage"]]
 
         if nomenclature_filters:
             # Используем прототип для фильтрации номенклатур
@@ -176,34 +254,19 @@ class osv_service:
 
             income = sum(self.__convert_to_base_units(t)
                          for t in nom_transactions
-                         if start_date <= t.date <= end_date and t.count > 0)
+                         if start_date <= t.date <= end_date and t.quantity > 0)
 
             outcome = sum(abs(self.__convert_to_base_units(t))
                           for t in nom_transactions
-                          if start_date <= t.date <= end_date and t.count < 0)
-
-            end_balance = start_balance + income - outcome
-
-            # Конвертируем в единицы измерения номенклатуры
-            if nomenclature.range:
-                display_start_balance = self.__convert_from_base_units(start_balance, nomenclature.range)
-                display_income = self.__convert_from_base_units(income, nomenclature.range)
-                display_outcome = self.__convert_from_base_units(outcome, nomenclature.range)
-                display_end_balance = self.__convert_from_base_units(end_balance, nomenclature.range)
-            else:
-                display_start_balance = start_balance
-                display_income = income
-                display_outcome = outcome
-                display_end_balance = end_balance
+                          if start_date <= t.date <= end_date and t.quantity < 0)
 
             report_item = {
                 "nomenclature": nomenclature.name,
-                "start_balance": round(display_start_balance, 3),
-                "income": round(display_income, 3),
-                "outcome": round(display_outcome, 3),
-                "end_balance": round(display_end_balance, 3),
+                "nomenclature_name": nomenclature.name,
+                "unit_measurement": nomenclature.range.name if nomenclature.range else "",
                 "nomenclature_id": nomenclature.unique_code
             }
+            report_item.update(self.__build_balances(nomenclature, start_balance, income, outcome))
 
             result.append(report_item)
 
@@ -224,6 +287,10 @@ class osv_service:
         storage_id = None
 
         for filter_item in filters:
+            # Параметры отчета задаются только простыми фильтрами верхнего уровня
+            if not isinstance(filter_item, filter_dto):
+                continue
+
             if filter_item.field_name == "period":
                 try:
                     date_value = datetime.fromisoformat(filter_item.value)
@@ -255,6 +322,36 @@ class osv_service:
 
         return start_date, end_date, storage_id
 
+    def __build_balances(self, nomenclature: nomenclature_model, start_balance: float,
+                         income: float, outcome: float) -> dict:
+        """
+        Формирует остатки и обороты строки отчета в единицах измерения номенклатуры
+
+        Args:
+            nomenclature (nomenclature_model): номенклатура
+            start_balance (float): начальный остаток в базовых единицах
+            income (float): приход в базовых единицах
+            outcome (float): расход в базовых единицах
+
+        Returns:
+            dict: начальный остаток, приход, расход и конечный остаток
+        """
+        end_balance = start_balance + income - outcome
+
+        # Конвертируем в единицы измерения номенклатуры
+        if nomenclature.range:
+            start_balance = self.__convert_from_base_units(start_balance, nomenclature.range)
+            income = self.__convert_from_base_units(income, nomenclature.range)
+            outcome = self.__convert_from_base_units(outcome, nomenclature.range)
+            end_balance = self.__convert_from_base_units(end_balance, nomenclature.range)
+
+        return {
+            "start_balance": round(start_balance, 3),
+            "income": round(income, 3),
+            "outcome": round(outcome, 3),
+            "end_balance": round(end_balance, 3)
+        }
+
     def __convert_to_base_units(self, transaction) -> float:
         """
         Конвертирует количество транзакции в базовые единицы
@@ -272,15 +369,15 @@ class osv_service:
                 if hasattr(range_obj, 'base_unit') and range_obj.base_unit:
                     # Если есть коэффициент конвертации, используем его
                     if hasattr(range_obj, 'coefficient') and range_obj.coefficient:
-                        return transaction.count * range_obj.coefficient
+                        return transaction.quantity * range_obj.coefficient
                     else:
-                        return transaction.count
+                        return transaction.quantity
                 else:
-                    return transaction.count
+                    return transaction.quantity
             else:
-                return transaction.count
+                return transaction.quantity
         except Exception:
-            return transaction.count
+            return transaction.quantity
 
     def __convert_from_base_units(self, count: float, range_obj: range_model) -> float:
         """
@@ -0,0 +1,522 @@
+from Src.reposity import reposity
+from Src.Core.compiled_filter import compiled_filter
+from Src.Core.filter_cache import filter_cache
+from Src.Core.page_cursor import page_cursor
+from Src.Core.prototype import prototype
+from Src.Core.query_view import query_view
+from Src.Core.filter_type import FilterType
+from Src.Core.filter_operator import FilterOperator
+from Src.Dtos.filter_dto import filter_dto
+from Src.Dtos.filter_group_dto import filter_group_dto
+from Src.Core.validator import validator, argument_exception, operation_exception
+from datetime import datetime
+
+"""
+Планировщик выполнения фильтров по данным репозитория.
+    - выбирает самый селективный доступ через индексы репозитория
+      (хеш-индексы для EQUALS, упорядоченные индексы для диапазонов дат,
+      триграммные индексы для LIKE, объединение индексов для групп ИЛИ);
+    - остальные фильтры упорядочивает по оценке селективности и стоимости;
+    - формирует описание выбранного плана (explain);
+    - при наличии кеша повторно использует результаты для той же версии данных;
+    - выдает данные страницами по упорядоченным индексам (keyset pagination)
+"""
+class query_planner:
+    __repo: reposity = None
+    __cache: filter_cache = None
+
+    # Оценка доли прошедших элементов для фильтров без индекса
+    __selectivity = {
+        FilterType.EQUALS: 0.1,
+        FilterType.NOT_EQUAL: 0.9,
+        FilterType.LIKE: 0.25,
+        FilterType.GREATER: 0.33,
+        FilterType.GREATER_EQUAL: 0.33,
+        FilterType.LESS: 0.33,
+        FilterType.LESS_EQUAL: 0.33
+    }
+
+    # Типы фильтров, задающие нижнюю / верхнюю границу диапазона
+    __lower_bounds = {FilterType.GREATER: False, FilterType.GREATER_EQUAL: True}
+    __upper_bounds = {FilterType.LESS: False, FilterType.LESS_EQUAL: True}
+
+    def __init__(self, data: reposity, cache: filter_cache = None):
+        if not isinstance(data, reposity):
+            raise argument_exception("Некорректный тип данных")
+        if cache is not None and not isinstance(cache, filter_cache):
+            raise argument_exception("Некорректный тип кеша")
+        self.__repo = data
+        self.__cache = cache
+
+    @property
+    def cache(self) -> filter_cache:
+        """
+        Кеш результатов фильтрации (None - кеширование отключено)
+        """
+        return self.__cache
+
+    def execute(self, key: str, filters: list) -> tuple:
+        """
+        Отфильтровать данные репозитория по ключу
+
+        Args:
+            key (str): ключ данных репозитория
+            filters (list): список объектов filter_dto или filter_group_dto
+
+        Returns:
+            tuple: отфильтрованные данные в исходном порядке
+        """
+        result, _ = self.run(key, filters)
+        return result
+
+    def run(self, key: str, filters: list) -> tuple:
+        """
+        Отфильтровать данные репозитория по ключу и вернуть выполненный план
+
+        Args:
+            key (str): ключ данных репозитория
+            filters (list): список объектов filter_dto или filter_group_dto
+
+        Returns:
+            tuple: (отфильтрованные данные - кортеж в исходном порядке, описание плана).
+                Результат из кеша общий для запросов, поэтому выдается без копирования
+        """
+        validator.validate(key, str)
+        validator.validate(filters, list)
+        for item in filters:
+            validator.validate(item, (filter_dto, filter_group_dto))
+
+        cache_key = None
+        if self.__cache is not None:
+            cache_key = (key, filter_cache.normalize(filters), self.__data_version(key, filters))
+            cached = self.__cache.get(cache_key)
+            if cached is not None:
+                result, plan = cached
+                return result, dict(plan, cache="hit")
+
+        data = self.__repo.data.get(key, [])
+        access, residual = self.plan(key, filters)
+
+        if access is None:
+            candidates = data
+        else:
+            positions = access["positions"]
+            if access["method"] == "range_index":
+                positions = sorted(positions)
+            candidates = [data[position] for position in positions]
+
+        ordered = [entry["filter"] for entry in residual]
+        result = tuple(compiled_filter(ordered).apply(candidates) if ordered else candidates)
+
+        plan = self.__describe(key, len(data), access, residual, len(result))
+        if cache_key is None:
+            return result, plan
+
+        # Слишком большой результат не кешируется
+        stored = self.__cache.put(cache_key, (result, plan), len(result))
+        return result, dict(plan, cache="miss" if stored else "skip")
+
+    def page(self, key: str, filters: list, order_by: str = None, limit: int = 100, cursor: str = None) -> tuple:
+        """
+        Получить страницу данных в порядке упорядоченного индекса.
+        Продолжение с курсора стоит O(log n) плюс размер страницы
+        (при фильтрах - плюс количество пропущенных элементов)
+
+        Args:
+            key (str): ключ данных репозитория
+            filters (list): список объектов filter_dto или filter_group_dto
+            order_by (str): поле сортировки, "-" в начале - по убыванию.
+                По умолчанию - первое упорядоченное поле модели
+            limit (int): размер страницы
+            cursor (str): курсор, полученный с предыдущей страницей
+
+        Returns:
+            tuple: (элементы страницы, курсор следующей страницы или None)
+        """
+        validator.validate(key, str)
+        validator.validate(filters, list)
+        validator.validate(limit, int)
+        if limit <= 0:
+            raise argument_exception("Некорректный размер страницы")
+
+        sorted_fields = reposity.indexed_fields(key)[1]
+        after = None
+        if order_by is not None and order_by.strip() != "":
+            validator.validate(order_by, str)
+            descending = order_by.startswith("-")
+            field = order_by.lstrip("-").strip()
+        elif len(sorted_fields) > 0:
+            descending = False
+            field = sorted_fields[0]
+        else:
+            raise argument_exception(f"Для данных {key} нет упорядоченных полей")
+
+        if cursor is not None and cursor.strip() != "":
+            position = page_cursor.decode(cursor)
+            if (order_by is not None and order_by.strip() != "") and \
+                    (position.field != field or position.descending != descending):
+                raise argument_exception("Курсор получен для другой сортировки")
+            field = position.field
+            descending = position.descending
+            after = position.after
+
+        if field not in sorted_fields:
+            raise argument_exception(f"Сортировка по полю {field} не поддерживается. Доступны: {sorted_fields}")
+
+        data = self.__repo.data.get(key, [])
+        index = self.__repo.index(key) if len(data) > 0 else None
+        if index is None:
+            return [], None
+
+        if not index.has_sorted(field):
+            raise operation_exception(f"Упорядоченный индекс по полю {field} недоступен")
+
+        check = compiled_filter(filters) if len(filters) > 0 else None
+        result = []
+        last = None
+        for value, code, position in index.scan(field, after, descending):
+            item = data[position]
+            if check is not None and not check(item):
+                continue
+
+            if len(result) == limit:
+                return result, page_cursor(field, descending, *last).encode()
+
+            result.append(item)
+            last = (value, code, position)
+
+        return result, None
+
+    def top(self, key: str, filters: list, order_by: str, limit: int = 100) -> query_view:
+        """
+        Первые элементы в порядке поля без упорядоченного индекса.
+        Возвращается ленивый запрос прототипа: отбор, выбор первых элементов (без сортировки
+        всех данных) и ограничение выполняются за один проход при формировании ответа.
+        Курсор для продолжения не выдается
+
+        Args:
+            key (str): ключ данных репозитория
+            filters (list): список объектов filter_dto или filter_group_dto
+            order_by (str): поле сортировки (вложенные поля через "/"), "-" в начале - по убыванию
+            limit (int): количество элементов
+
+        Returns:
+            query_view: ленивое представление страницы
+        """
+        validator.validate(key, str)
+        validator.validate(filters, list)
+        validator.validate(order_by, str)
+        validator.validate(limit, int)
+        if limit <= 0:
+            raise argument_exception("Некорректный размер страницы")
+
+        descending = order_by.startswith("-")
+        field = order_by.lstrip("-").strip()
+        if field == "":
+            raise argument_exception("Не указано поле сортировки")
+
+        data = self.__repo.data.get(key, [])
+        getter = compiled_filter.getter(field)
+        if len(data) > 0:
+            try:
+                getter(data[0])
+            except Exception:
+                raise argument_exception(f"Сортировка по полю {field} не поддерживается")
+
+        # Элементы без значения поля идут первыми (при сортировке по убыванию - последними)
+        def sort_key(item):
+            try:
+                value = getter(item)
+            except Exception:
+                return (0, "")
+            return (0, "") if value is None else (1, value)
+
+        return prototype(data).query().filter(filters).sort(sort_key, descending).limit(limit)
+
+    def __data_version(self, key: str, filters: list) -> int:
+        """
+        Версия данных, от которой зависит результат: версия списка по ключу,
+        а при условиях по вложенным полям - общая версия репозитория
+        """
+        nested = any("/" in field for item in filters for field in query_planner.__fields(item))
+        return self.__repo.version() if nested else self.__repo.version(key)
+
+    def plan(self, key: str, filters: list) -> tuple:
+        """
+        Построить план: способ доступа к данным и упорядоченный список остальных фильтров
+
+        Args:
+            key (str): ключ данных репозитория
+            filters (list): список объектов filter_dto или filter_group_dto
+
+        Returns:
+            tuple: (доступ через индекс или None, список остальных фильтров с оценками)
+        """
+        data = self.__repo.data.get(key, [])
+        total = max(len(data), 1)
+        filters = query_planner.__flatten(filters)
+        leaves = [item for item in filters if isinstance(item, filter_dto)]
+        groups = [item for item in filters if isinstance(item, filter_group_dto)]
+        index = self.__repo.index(key) if len(data) > 0 and len(filters) > 0 else None
+
+        candidates = []
+        estimates = {}
+
+        if index is not None:
+            # Хеш-индексы: точное совпадение
+            for item in leaves:
+                if item.type == FilterType.EQUALS and item.field_name in index.hash_fields:
+                    positions = index.lookup(item.field_name, str(item.value))
+                    candidates.append({
+                        "method": "hash_index",
+                        "field": item.field_name,
+                        "filters": [item],
+                        "positions": positions
+                    })
+                    estimates[id(item)] = len(positions) / total
+
+            # Триграммные индексы: поиск подстроки
+            for item in leaves:
+                if item.type == FilterType.LIKE and item.field_name in index.text_fields:
+                    positions = index.search(item.field_name, item.value)
+                    candidates.append({
+                        "method": "trigram_index",
+                        "field": item.field_name,
+                        "filters": [item],
+                        "positions": positions
+                    })
+                    estimates[id(item)] = len(positions) / total
+
+            # Упорядоченные индексы: диапазоны, границы по одному полю объединяются
+            for field in index.sorted_fields:
+                if not index.has_sorted(field):
+                    continue
+
+                bounds = {"low": None, "high": None, "low_inclusive": True, "high_inclusive": True}
+                used = []
+                for item in leaves:
+                    if item.field_name != field:
+                        continue
+                    moment = query_planner.__parse_datetime(item.value)
+                    if moment is None:
+                        continue
+
+                    if item.type in query_planner.__lower_bounds:
+                        inclusive = query_planner.__lower_bounds[item.type]
+                        if bounds["low"] is None or moment > bounds["low"]:
+                            bounds["low"] = moment
+                            bounds["low_inclusive"] = inclusive
+                        elif moment == bounds["low"]:
+                            bounds["low_inclusive"] = bounds["low_inclusive"] and inclusive
+                        used.append(item)
+                    elif item.type in query_planner.__upper_bounds:
+                        inclusive = query_planner.__upper_bounds[item.type]
+                        if bounds["high"] is None or moment < bounds["high"]:
+                            bounds["high"] = moment
+                            bounds["high_inclusive"] = inclusive
+                        elif moment == bounds["high"]:
+                            bounds["high_inclusive"] = bounds["high_inclusive"] and inclusive
+                        used.append(item)
+
+                if len(used) == 0:
+                    continue
+
+                try:
+                    positions = index.range(field, bounds["low"], bounds["high"],
+                                            bounds["low_inclusive"], bounds["high_inclusive"])
+                except TypeError:
+                    continue
+
+                candidates.append({
+                    "method": "range_index",
+                    "field": field,
+                    "filters": used,
+                    "positions": positions
+                })
+                for item in used:
+                    estimates[id(item)] = len(positions) / total
+
+            # Группы: позиции собираются объединением / пересечением индексов элементов
+            for group in groups:
+                positions = query_planner.__positions(index, group)
+                if positions is None:
+                    continue
+
+                estimates[id(group)] = len(positions) / total
+                if group.operator == FilterOperator.OR:
+                    candidates.append({
+                        "method": "index_union",
+                        "field": ",".join(sorted(set(query_planner.__fields(group)))),
+                        "filters": [group],
+                        "positions": positions
+                    })
+
+        access = min(candidates, key=lambda entry: len(entry["positions"])) if candidates else None
+        served = set(id(item) for item in access["filters"]) if access is not None else set()
+
+        residual = []
+        for item in filters:
+            if id(item) in served:
+                continue
+            selectivity = estimates.get(id(item), query_planner.__estimate(item))
+            cost = query_planner.__cost(item)
+            residual.append({
+                "filter": item,
+                "selectivity": selectivity,
+                "cost": cost,
+                "rank": cost / max(1.0 - selectivity, 0.01)
+            })
+
+        # Первыми проверяются дешевые фильтры, отсекающие больше всего элементов
+        residual.sort(key=lambda entry: entry["rank"])
+        return access, residual
+
+    @staticmethod
+    def __flatten(filters: list) -> list:
+        """
+        Раскрыть группы И верхнего уровня в общий список условий
+        """
+        result = []
+        for item in filters:
+            if isinstance(item, filter_group_dto) and item.operator == FilterOperator.AND:
+                result.extend(query_planner.__flatten(item.filters))
+            else:
+                result.append(item)
+        return result
+
+    @staticmethod
+    def __positions(index, node) -> list:
+        """
+        Точный список позиций условия по индексам (по возрастанию) или None,
+        если условие нельзя полностью вычислить через индексы
+        """
+        if isinstance(node, filter_dto):
+            if node.type == FilterType.EQUALS and node.field_name in index.hash_fields:
+                return index.lookup(node.field_name, str(node.value))
+
+            if node.type == FilterType.LIKE and node.field_name in index.text_fields:
+                return index.search(node.field_name, node.value)
+
+            if node.field_name in index.sorted_fields and index.has_sorted(node.field_name):
+                moment = query_planner.__parse_datetime(node.value)
+                if moment is None:
+                    return None
+                try:
+                    if node.type in query_planner.__lower_bounds:
+                        return sorted(index.range(node.field_name, low=moment,
+                                                  low_inclusive=query_planner.__lower_bounds[node.type]))
+                    if node.type in query_planner.__upper_bounds:
+                        return sorted(index.range(node.field_name, high=moment,
+                                                  high_inclusive=query_planner.__upper_bounds[node.type]))
+                except TypeError:
+                    return None
+
+            return None
+
+        if node.operator == FilterOperator.NOT:
+            return None
+
+        parts = []
+        for item in node.filters:
+            positions = query_planner.__positions(index, item)
+            if positions is None:
+                return None
+            parts.append(positions)
+
+        if len(parts) == 0:
+            return None
+
+        if node.operator == FilterOperator.OR:
+            return sorted(set().union(*parts))
+
+        parts.sort(key=len)
+        return sorted(set(parts[0]).intersection(*parts[1:]))
+
+    @staticmethod
+    def __fields(node) -> list:
+        """
+        Поля всех простых условий выражения
+        """
+        if isinstance(node, filter_dto):
+            return [node.field_name]
+        return [field for item in node.filters for field in query_planner.__fields(item)]
+
+    @staticmethod
+    def __estimate(node) -> float:
+        """
+        Оценка доли прошедших элементов без индекса
+        """
+        if isinstance(node, filter_dto):
+            return query_planner.__selectivity.get(node.type, 0.5)
+
+        estimates = [query_planner.__estimate(item) for item in node.filters]
+        if node.operator == FilterOperator.NOT:
+            return 1.0 - estimates[0]
+
+        result = 1.0
+        if node.operator == FilterOperator.OR:
+            for estimate in estimates:
+                result *= 1.0 - estimate
+            return 1.0 - result
+
+        for estimate in estimates:
+            result *= estimate
+        return result
+
+    @staticmethod
+    def __cost(item) -> float:
+        """
+        Оценка стоимости проверки фильтра: переходы по вложенным полям и сравнение.
+        Для группы - стоимость проверки всех элементов
+        """
+        if isinstance(item, filter_group_dto):
+            return sum(query_planner.__cost(child) for child in item.filters)
+
+        cost = float(len(item.field_name.split("/")))
+        if item.type == FilterType.LIKE:
+            cost += 1.0
+        elif item.type not in [FilterType.EQUALS, FilterType.NOT_EQUAL]:
+            cost += 0.5
+        return cost
+
+    @staticmethod
+    def __parse_datetime(value):
+        """
+        Разбор значения фильтра как даты или None
+        """
+        try:
+            return datetime.fromisoformat(str(value))
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def __describe(key: str, total: int, access: dict, residual: list, result_rows: int) -> dict:
+        """
+        Описание выполненного плана
+        """
+        if access is None:
+            access_info = {"method": "full_scan", "estimated_rows": total}
+        else:
+            access_info = {
+                "method": access["method"],
+                "field": access["field"],
+                "filters": [query_planner.__describe_filter(item) for item in access["filters"]],
+                "estimated_rows": len(access["positions"])
+            }
+
+        return {
+            "model": key,
+            "total_rows": total,
+            "access": access_info,
+            "predicates": [dict(query_planner.__describe_filter(entry["filter"]),
+                                selectivity=round(entry["selectivity"], 4),
+                                cost=entry["cost"]) for entry in residual],
+            "result_rows": result_rows
+        }
+
+    @staticmethod
+    def __describe_filter(item) -> dict:
+        if isinstance(item, filter_group_dto):
+            return {"operator": item.operator.value,
+                    "filters": [query_planner.__describe_filter(child) for child in item.filters]}
+        return {"field_name": item.field_name, "value": item.value, "type": item.type.value}
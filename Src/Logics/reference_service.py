@@ -17,9 +17,10 @@ from Src.Dtos.nomenclature_dto import nomenclature_dto
 from Src.Dtos.category_dto import category_dto
 from Src.Dtos.range_dto import range_dto
 from Src.Logics.convert_factory import convert_factory
-from Src.Core.abstract_dto import object_to_dto
+from Src.Core.abstract_dto import abstact_dto
 from Src.Dtos.update_dependencies_dto import update_dependencies_dto
 from Src.Dtos.check_dependencies_dto import check_dependencies_dto
+from Src.Core.common import common
 
 class reference_service(abstract_subscriber):
     __service = start_service()
@@ -35,6 +36,7 @@ class reference_service(abstract_subscriber):
     def add(reference: str, properties: dict):
         validator.validate(reference, str)
         validator.validate(properties, dict)
+        reference = reference_service.__key(reference)
         params = reference_dto().create({"name": reference, "model_dto_dict": properties})
         observe_service.create_event(event_type.add_reference(), params)
 
@@ -47,6 +49,7 @@ class reference_service(abstract_subscriber):
         validator.validate(properties, dict)
         if "unique_code" not in properties:
             raise argument_exception("Отсутствует поле unique_code")
+        reference = reference_service.__key(reference)
         params = reference_dto().create({
             "name": reference, 
             "id": properties["unique_code"], 
@@ -63,6 +66,13 @@ class reference_service(abstract_subscriber):
         validator.validate(properties, dict)
         if "unique_code" not in properties:
             raise argument_exception("Отсутствует поле unique_code")
+        reference = reference_service.__key(reference)
+
+        # Зависимости проверяются до события, чтобы отказ не зависел от подписчиков
+        model = reference_service.__find(reference, properties["unique_code"])
+        if model is not None:
+            reference_service.__check_dependencies(model)
+
         params = reference_dto().create({
             "name": reference, 
             "id": properties["unique_code"], 
@@ -70,6 +80,74 @@ class reference_service(abstract_subscriber):
         })
         observe_service.create_event(event_type.remove_reference(), params)
 
+    """
+    Ключ данных по наименованию справочника ("nomenclature" или "nomenclature_model")
+    """
+    @staticmethod
+    def __key(reference: str) -> str:
+        keys = reposity.keys()
+        if reference not in keys and f"{reference}_model" in keys:
+            return f"{reference}_model"
+        return reference
+
+    """
+    Найти позицию элемента справочника по коду (по индексу репозитория)
+    """
+    @staticmethod
+    def __position(reference: str, unique_code: str):
+        index = reference_service.__service.data.index(reference)
+        if index is None:
+            return None
+
+        for position in index.lookup("unique_code", str(unique_code)):
+            return position
+        return None
+
+    """
+    Найти элемент справочника по коду (по индексу репозитория)
+    """
+    @staticmethod
+    def __find(reference: str, unique_code: str):
+        position = reference_service.__position(reference, unique_code)
+        if position is None:
+            return None
+        return reference_service.__service.data.data[reference][position]
+
+    """
+    Модели, на которые ссылается DTO (поля *_id), по кодам: поиск по индексам справочников
+    """
+    @staticmethod
+    def __references(dto: abstact_dto) -> dict:
+        keys = [reposity.range_key(), reposity.group_key(), reposity.nomenclature_key(), reposity.storage_key()]
+        result = {}
+        for field in common.get_fields(dto):
+            code = getattr(dto, field)
+            if not field.endswith("_id") or code is None or code in result:
+                continue
+
+            for key in keys:
+                model = reference_service.__find(key, code)
+                if model is not None:
+                    result[code] = model
+                    break
+        return result
+
+    """
+    Проверить, что на элемент никто не ссылается (по графу обратных ссылок)
+    """
+    @staticmethod
+    def __check_dependencies(model):
+        dependents = reference_service.__service.data.dependents(model)
+        if len(dependents) > 0:
+            raise operation_exception(
+                f"Отказ в удалении объекта по причине: удаляемый объект содержится в {dependents[0].unique_code}.")
+
+    """
+    События справочника, которые обрабатывает сервис
+    """
+    def events(self) -> list:
+        return [event_type.add_reference(), event_type.change_reference(), event_type.remove_reference()]
+
     """
     Обработка событий справочника
     """
@@ -104,17 +182,14 @@ class reference_service(abstract_subscriber):
             validator.validate(params, reference_dto)
             model_type = params.name
 
-            old_model = None
-            for item in self.__service.data.data.get(model_type, []):
-                if item.unique_code == params.id:
-                    old_model = item
-                    break
-
-            if not old_model:
+            position = reference_service.__position(model_type, params.id)
+            if position is None:
                 raise operation_exception(f"Объект с кодом {params.id} не найден.")
+            items = self.__service.data.data[model_type]
+            old_model = items[position]
 
             factory = convert_factory()
-            dto_dict = object_to_dto(factory.convert(old_model))
+            dto_dict = abstact_dto.object_to_dto(factory.convert(old_model))
             dto_dict.update(params.model_dto_dict)
 
             match = {
@@ -129,12 +204,9 @@ class reference_service(abstract_subscriber):
             dto_class, model_class = match[model_type]
             dto = dto_class().create(dto_dict)
 
-            cache = {}
-            for key in self.__service.data.data.keys():
-                for item in self.__service.data.data[key]:
-                    cache[item.unique_code] = item
-
-            model = model_class.from_dto(dto, cache)
+            model = model_class.from_dto(dto, reference_service.__references(dto))
+            # Измененный элемент остается тем же объектом справочника для ссылок на него
+            model.unique_code = old_model.unique_code
 
             update_dto = update_dependencies_dto().create({
                 "old_model": old_model, 
@@ -142,23 +214,21 @@ class reference_service(abstract_subscriber):
             })
 
             observe_service.create_event(event_type.update_dependencies(), update_dto)
+            self.__service.data.replace_references(old_model, model)
 
-            self.__service.data.data[model_type].remove(old_model)
-            self.__service.data.data[model_type].append(model)
+            # Замена на месте сохраняет порядок и позволяет обновить индексы инкрементально
+            items[position] = model
 
         elif event == event_type.remove_reference():
             validator.validate(params, reference_dto)
             model_type = params.name
 
-            model = None
-            for item in self.__service.data.data.get(model_type, []):
-                if item.unique_code == params.id:
-                    model = item
-                    break
-
+            model = reference_service.__find(model_type, params.id)
             if not model:
                 raise operation_exception(f"Объект с кодом {params.id} не найден.")
 
+            reference_service.__check_dependencies(model)
+
             check_dto = check_dependencies_dto().create({"model": model})
 
             observe_service.create_event(event_type.check_dependencies(), check_dto)
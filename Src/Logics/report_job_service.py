@@ -0,0 +1,220 @@
+from Src.reposity import reposity
+from Src.Logics.osv_service import osv_service
+from Src.Logics.balance_service import balance_service
+from Src.Models.settings_model import settings_model
+from Src.Models.report_job_model import report_job_model
+from Src.Core.job_status import JobStatus
+from Src.Core.validator import validator, operation_exception, argument_exception
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from datetime import datetime
+import threading
+
+"""
+Сервис фонового формирования тяжелых отчетов (ОСВ, остатки).
+Задания выполняются ограниченным пулом потоков, готовые результаты
+переиспользуются для одинаковых параметров на той же версии данных
+"""
+class report_job_service:
+    __repo: reposity = None
+    __settings: settings_model = None
+    __executor: ThreadPoolExecutor = None
+    __max_jobs: int = 100
+
+    def __init__(self, data: reposity, settings: settings_model, max_workers: int = 2, max_jobs: int = 100):
+        if not isinstance(data, reposity):
+            raise argument_exception("Некорректный тип данных")
+        if not isinstance(settings, settings_model):
+            raise argument_exception("Некорректный тип настроек")
+        validator.validate(max_workers, int)
+        validator.validate(max_jobs, int)
+        if max_workers <= 0 or max_jobs <= 0:
+            raise argument_exception("Некорректный аргумент!")
+
+        self.__repo = data
+        self.__settings = settings
+        self.__max_jobs = max_jobs
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report_job")
+        self.__lock = threading.Lock()
+        self.__jobs = OrderedDict()
+        self.__signatures = {}
+        self.__futures = {}
+        self.__osv_service = osv_service(data)
+        self.__balance_service = balance_service(data, settings)
+
+    @staticmethod
+    def report_types() -> list:
+        """
+        Список поддерживаемых типов отчетов
+        """
+        return ["osv", "balance"]
+
+    def submit(self, report_type: str, params: dict) -> report_job_model:
+        """
+        Поставить отчет в очередь на формирование
+
+        Args:
+            report_type (str): тип отчета (osv, balance)
+            params (dict): параметры отчета
+
+        Returns:
+            report_job_model: новое задание или уже существующее с теми же параметрами
+        """
+        validator.validate(report_type, str)
+        validator.validate(params, dict)
+
+        arguments = self.__parse_params(report_type, params)
+        signature = self.__signature(report_type, arguments)
+
+        with self.__lock:
+            job_id = self.__signatures.get(signature)
+            if job_id is not None and job_id in self.__jobs:
+                job = self.__jobs[job_id]
+                if job.status != JobStatus.FAILED:
+                    return job
+
+            job = report_job_model.create(report_type, params)
+            self.__jobs[job.unique_code] = job
+            self.__signatures[signature] = job.unique_code
+            self.__futures[job.unique_code] = self.__executor.submit(self.__run, job, arguments)
+            self.__evict()
+
+        return job
+
+    def get(self, job_id: str) -> report_job_model:
+        """
+        Получить задание по коду
+
+        Args:
+            job_id (str): код задания
+
+        Returns:
+            report_job_model: задание
+        """
+        validator.validate(job_id, str)
+        with self.__lock:
+            job = self.__jobs.get(job_id)
+
+        if job is None:
+            raise operation_exception(f"Задание с кодом {job_id} не найдено")
+
+        return job
+
+    def result(self, job_id: str) -> list:
+        """
+        Получить результат завершенного задания
+
+        Args:
+            job_id (str): код задания
+
+        Returns:
+            list: данные отчета
+        """
+        job = self.get(job_id)
+        if job.status == JobStatus.FAILED:
+            raise operation_exception(f"Задание завершилось с ошибкой: {job.error}")
+        if job.status != JobStatus.DONE:
+            raise operation_exception(f"Задание {job_id} еще не завершено")
+
+        return job.result
+
+    def wait(self, job_id: str, timeout: float = None) -> report_job_model:
+        """
+        Дождаться завершения задания
+
+        Args:
+            job_id (str): код задания
+            timeout (float): максимальное время ожидания в секундах
+
+        Returns:
+            report_job_model: задание
+        """
+        job = self.get(job_id)
+        future = self.__futures.get(job_id)
+        if future is not None:
+            future.exception(timeout)
+
+        return job
+
+    def shutdown(self):
+        """
+        Остановить пул обработчиков
+        """
+        self.__executor.shutdown(wait=True)
+
+    def __run(self, job: report_job_model, arguments: tuple):
+        """
+        Выполнение задания в пуле обработчиков
+        """
+        job.status = JobStatus.RUNNING
+        try:
+            if job.report_type == "osv":
+                result = self.__osv_service.generate_osv_report(*arguments)
+            else:
+                result = self.__balance_service.calculate_balance_with_block_period(*arguments)
+
+            job.result = result
+            job.status = JobStatus.DONE
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now()
+            with self.__lock:
+                self.__futures.pop(job.unique_code, None)
+
+    def __parse_params(self, report_type: str, params: dict) -> tuple:
+        """
+        Разбор и проверка параметров отчета
+        """
+        if report_type not in report_job_service.report_types():
+            raise argument_exception(f"Неизвестный тип отчета {report_type}. Доступны: {report_job_service.report_types()}")
+
+        try:
+            if report_type == "osv":
+                for name in ["start_date", "end_date", "storage_id"]:
+                    if not params.get(name):
+                        raise argument_exception(f"Не указан параметр {name}")
+
+                start_date = datetime.fromisoformat(params["start_date"])
+                end_date = datetime.fromisoformat(params["end_date"])
+                if start_date > end_date:
+                    raise argument_exception("Дата начала не может быть позже даты окончания")
+
+                return (start_date, end_date, params["storage_id"])
+
+            if not params.get("date"):
+                raise argument_exception("Не указан параметр date")
+
+            return (datetime.fromisoformat(params["date"]), params.get("storage_id") or None)
+        except (TypeError, ValueError) as e:
+            raise argument_exception(f"Некорректный формат даты: {str(e)}")
+
+    def __signature(self, report_type: str, arguments: tuple) -> tuple:
+        """
+        Ключ переиспользования результата: тип отчета, параметры и версия исходных данных
+        """
+        versions = tuple(self.__repo.version(key) for key in [
+            reposity.transaction_key(),
+            reposity.nomenclature_key(),
+            reposity.storage_key(),
+            reposity.range_key()
+        ])
+
+        block_period = self.__settings.block_period if report_type == "balance" else None
+        return (report_type, arguments, versions, block_period)
+
+    def __evict(self):
+        """
+        Удаление самых старых завершенных заданий сверх лимита
+        """
+        if len(self.__jobs) <= self.__max_jobs:
+            return
+
+        finished = [job_id for job_id, job in self.__jobs.items()
+                    if job.status in [JobStatus.DONE, JobStatus.FAILED]]
+        for job_id in finished[:len(self.__jobs) - self.__max_jobs]:
+            del self.__jobs[job_id]
+
+        alive = set(self.__jobs.keys())
+        self.__signatures = {signature: job_id for signature, job_id in self.__signatures.items() if job_id in alive}
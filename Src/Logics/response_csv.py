@@ -1,33 +1,37 @@
 from Src.Core.abstract_response import abstract_response
-from Src.Core.common import common
 from Src.Core.validator import validator, operation_exception
+import itertools
+import csv
+import io
 
 
 class response_csv(abstract_response):
-    def build(self, data: list) -> str:
-        super().build(data)
+    # Количество строк в одной части потокового ответа
+    __chunk_size: int = 500
 
-        if len(data) == 0:
-            return ""
+    def build(self, data) -> str:
+        return "".join(self.stream(data))
 
-        text = ""
-        # Шапка
-        item = data[0]
-        fields = common.get_fields(item)
-        text += ";".join(fields) + "\n"
+    def chunks(self, items):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";", lineterminator="\n")
+
+        # Шапка по первому элементу
+        first = next(items)
+        plan = self.plan(first)
+        writer.writerow(plan.columns)
 
         # Данные
-        for item in data:
-            row = []
-            for field in fields:
-                value = getattr(item, field, "")
-                # Преобразуем сложные объекты в строки
-                if hasattr(value, 'name'):
-                    row.append(str(value.name))
-                elif hasattr(value, 'unique_code'):
-                    row.append(str(value.unique_code))
-                else:
-                    row.append(str(value))
-            text += ";".join(row) + "\n"
+        texts = plan.texts
+        rows = []
+        for item in itertools.chain([first], items):
+            rows.append(texts(item))
+            if len(rows) >= self.__chunk_size:
+                writer.writerows(rows)
+                rows = []
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
 
-        return text
\ No newline at end of file
+        writer.writerows(rows)
+        yield buffer.getvalue()
@@ -6,17 +6,78 @@ import json
 
 
 class response_json(abstract_response):
-    
-    def build(self, data: list) -> str:
-        super().build(data)
+    # Количество элементов в одной части потокового ответа
+    __chunk_size: int = 100
+    __normalized: bool = False
 
+    # Нормализованный вывод: {"data": [...], "references": {код: модель}},
+    # вложенные модели в строках заменяются кодом и выводятся один раз
+    @property
+    def normalized(self) -> bool:
+        return self.__normalized
+
+    @normalized.setter
+    def normalized(self, value: bool):
+        validator.validate(value, bool)
+        self.__normalized = value
+
+    def build(self, data) -> str:
+        # Полный ответ совпадает с json.dumps(..., indent=2) по всему списку
+        return "".join(self.stream(data))
+
+    def chunks(self, items):
         # Используем фабрику для конвертации данных
-        factory = convert_factory()
-        result = []
-        
-        for item in data:
+        factory = convert_factory(self.__normalized)
+        convert = self.__make_convert(factory)
+
+        if not self.__normalized:
+            yield "["
+            yield from self.__rows(items, convert, "\n  ")
+            yield "\n]"
+            return
+
+        # Таблица связанных моделей заполняется по мере вывода строк и выводится после них
+        yield "{\n  \"data\": ["
+        yield from self.__rows(items, convert, "\n    ")
+        references = json.dumps(factory.references, ensure_ascii=False, indent=2)
+        yield "\n  ],\n  \"references\": " + references.replace("\n", "\n  ") + "\n}"
+
+    def __rows(self, items, convert, indent: str):
+        batch = []
+        separator = indent
+        for item in items:
+            # Элемент списка сериализуется отдельно и сдвигается на уровень вложенности
+            text = json.dumps(convert(item), ensure_ascii=False, indent=2)
+            batch.append(separator + text.replace("\n", indent))
+            separator = "," + indent
+
+            if len(batch) >= self.__chunk_size:
+                yield "".join(batch)
+                batch = []
+
+        if batch:
+            yield "".join(batch)
+
+    def __make_convert(self, factory: convert_factory):
+        if self.projection is None:
             # Конвертируем каждый объект через фабрику
-            converted_item = factory.convert(item)
-            result.append(converted_item)
+            return factory.convert
+
+        # Выводим только выбранные поля, вложенные поля - вложенными объектами
+        projection = self.projection
+        paths = [field.split("/") for field in projection.fields]
+
+        def convert(item) -> dict:
+            converted_item = {}
+            for path, value in zip(paths, projection.values(item)):
+                converted_value = factory._convert_value(value)
+                if converted_value is None:
+                    continue
+
+                target = converted_item
+                for part in path[:-1]:
+                    target = target.setdefault(part, {})
+                target[path[-1]] = converted_value
+            return converted_item
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return convert
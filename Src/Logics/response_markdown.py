@@ -1,34 +1,42 @@
 from Src.Core.abstract_response import abstract_response
-from Src.Core.common import common
 from Src.Core.validator import validator, operation_exception
+import itertools
 
 
 class response_markdown(abstract_response):
-    def build(self, data: list) -> str:
-        super().build(data)
+    # Количество строк в одной части потокового ответа
+    __chunk_size: int = 500
 
-        if len(data) == 0:
-            return ""
+    def build(self, data) -> str:
+        return "".join(self.stream(data))
 
-        text = ""
-        # Шапка таблицы
-        item = data[0]
-        fields = common.get_fields(item)
-        text += "| " + " | ".join(fields) + " |\n"
-        text += "|" + "|".join(["---"] * len(fields)) + "|\n"
+    def chunks(self, items):
+        # Шапка таблицы по первому элементу
+        first = next(items)
+        plan = self.plan(first)
+        columns = [response_markdown.__escape(field) for field in plan.columns]
+        header = "| " + " | ".join(columns) + " |\n"
+        header += "|" + "|".join(["---"] * len(columns)) + "|\n"
+        yield header
 
         # Данные
-        for item in data:
-            row = []
-            for field in fields:
-                value = getattr(item, field, "")
-                # Преобразуем сложные объекты в строки
-                if hasattr(value, 'name'):
-                    row.append(str(value.name))
-                elif hasattr(value, 'unique_code'):
-                    row.append(str(value.unique_code))
-                else:
-                    row.append(str(value))
-            text += "| " + " | ".join(row) + " |\n"
+        texts = plan.texts
+        escape = response_markdown.__escape
+        rows = []
+        for item in itertools.chain([first], items):
+            rows.append("| " + " | ".join([escape(text) for text in texts(item)]) + " |\n")
+            if len(rows) >= self.__chunk_size:
+                yield "".join(rows)
+                rows = []
 
-        return text
\ No newline at end of file
+        if len(rows) > 0:
+            yield "".join(rows)
+
+    @staticmethod
+    def __escape(text: str) -> str:
+        # Разделитель колонок и переводы строк ломают таблицу
+        if "|" in text:
+            text = text.replace("|", "\\|")
+        if "\n" in text:
+            text = text.replace("\r\n", "<br>").replace("\n", "<br>")
+        return text
@@ -0,0 +1,101 @@
+from Src.Core.abstract_response import abstract_response
+from Src.Core.abstract_model import abstact_model
+from Src.Core.msgpack_codec import msgpack_codec
+from Src.Core.common import common
+from datetime import datetime
+from enum import Enum
+import calendar
+import operator
+
+
+"""
+Двоичный формат ответа (MessagePack).
+Ответ - массив словарей полей. Даты передаются целым числом секунд
+от начала эпохи (UTC), ссылки на модели - кодом модели, пустые значения пропускаются
+"""
+class response_msgpack(abstract_response):
+    # Количество элементов в одной части потокового ответа
+    __chunk_size: int = 500
+
+    def build(self, data) -> bytes:
+        return b"".join(self.stream(data))
+
+    def stream(self, data):
+        # Для заголовка массива нужно количество элементов
+        data = self.materialize(data)
+        items = abstract_response.iterate(data)
+        return self.__chunks(items, len(data))
+
+    def __chunks(self, items, count: int):
+        buffer = bytearray()
+        msgpack_codec.encode_array_header(buffer, count)
+
+        plans = {}
+        written = 0
+        for item in items:
+            plan = plans.get(item.__class__)
+            if plan is None:
+                plan = self.__plan(item)
+                plans[item.__class__] = plan
+
+            row = {}
+            for field, value in plan(item):
+                value = response_msgpack.__convert(value)
+                if value is not None:
+                    row[field] = value
+            msgpack_codec.encode_into(buffer, row)
+
+            written += 1
+            if written >= self.__chunk_size:
+                yield bytes(buffer)
+                buffer = bytearray()
+                written = 0
+
+        yield bytes(buffer)
+
+    def __plan(self, item):
+        """
+        Функция получения пар (поле, значение) для класса элемента
+        """
+        if self.projection is not None:
+            projection = self.projection
+            return lambda source: zip(projection.fields, projection.values(source))
+
+        fields = common.get_fields(item)
+        getters = [operator.attrgetter(field) for field in fields]
+
+        def read(source):
+            for field, getter in zip(fields, getters):
+                try:
+                    yield field, getter(source)
+                except AttributeError:
+                    continue
+
+        return read
+
+    @staticmethod
+    def __convert(value):
+        """
+        Значение поля в виде, поддерживаемом MessagePack
+        """
+        value_type = value.__class__
+        if value is None or value_type is str or value_type is int or value_type is float or value_type is bool:
+            return value
+
+        if isinstance(value, datetime):
+            return calendar.timegm(value.utctimetuple())
+
+        if isinstance(value, abstact_model):
+            return value.unique_code
+
+        if isinstance(value, Enum):
+            return value.value
+
+        if isinstance(value, (list, tuple)):
+            result = [response_msgpack.__convert(item) for item in value]
+            return result if len(result) > 0 else None
+
+        if isinstance(value, dict):
+            return {str(key): response_msgpack.__convert(item) for key, item in value.items()}
+
+        return str(value)
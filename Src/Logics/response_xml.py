@@ -1,34 +1,48 @@
 from Src.Core.abstract_response import abstract_response
-from Src.Core.common import common
 from Src.Core.validator import validator, operation_exception
+from xml.sax.saxutils import escape
+import itertools
 
 
 class response_xml(abstract_response):
-    def build(self, data: list) -> str:
-        super().build(data)
-
-        root_name = "items"
-        if len(data) > 0:
-            root_name = data[0].__class__.__name__.lower() + "s"
-
-        xml_content = f'<?xml version="1.0" encoding="UTF-8"?>\n<{root_name}>\n'
-
-        for item in data:
-            item_name = item.__class__.__name__.lower()
-            xml_content += f'  <{item_name}>\n'
-
-            fields = common.get_fields(item)
-            for field in fields:
-                value = getattr(item, field, "")
-                # Преобразуем сложные объекты в строки
-                if hasattr(value, 'name'):
-                    xml_content += f'    <{field}>{value.name}</{field}>\n'
-                elif hasattr(value, 'unique_code'):
-                    xml_content += f'    <{field}>{value.unique_code}</{field}>\n'
-                else:
-                    xml_content += f'    <{field}>{value}</{field}>\n'
-
-            xml_content += f'  </{item_name}>\n'
-
-        xml_content += f'</{root_name}>'
-        return xml_content
\ No newline at end of file
+    # Количество элементов в одной части потокового ответа
+    __chunk_size: int = 200
+
+    def build(self, data) -> str:
+        return "".join(self.stream(data))
+
+    def chunks(self, items):
+        first = next(items)
+        root_name = first.__class__.__name__.lower() + "s"
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<{root_name}>\n'
+
+        # План колонок строится один раз для каждого класса элементов
+        plans = {}
+        parts = []
+        count = 0
+        for item in itertools.chain([first], items):
+            item_type = item.__class__
+            entry = plans.get(item_type)
+            if entry is None:
+                plan = self.plan(item)
+                # Вложенное поле "a/b" выводится тегом a_b
+                tags = [(f'    <{field.replace("/", "_")}>', f'</{field.replace("/", "_")}>\n') for field in plan.columns]
+                entry = (item_type.__name__.lower(), plan.texts, tags)
+                plans[item_type] = entry
+
+            item_name, texts, tags = entry
+            parts.append(f'  <{item_name}>\n')
+            for (opening, closing), text in zip(tags, texts(item)):
+                parts.append(opening)
+                parts.append(escape(text))
+                parts.append(closing)
+            parts.append(f'  </{item_name}>\n')
+
+            count += 1
+            if count >= self.__chunk_size:
+                yield "".join(parts)
+                parts = []
+                count = 0
+
+        parts.append(f'</{root_name}>')
+        yield "".join(parts)
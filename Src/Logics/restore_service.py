@@ -0,0 +1,353 @@
+import gzip
+import os
+import re
+from datetime import datetime
+from Src.Core.validator import validator, argument_exception, operation_exception
+from Src.Core.json_stream import json_stream
+from Src.reposity import reposity
+from Src.Logics.export_service import export_service
+from Src.Models.range_model import range_model
+from Src.Models.group_model import group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.Models.receipt_model import receipt_model
+from Src.Models.receipt_item_model import receipt_item_model
+
+"""
+Сервис восстановления данных из резервных копий.
+Применяет полную копию и цепочку инкрементальных копий к ней:
+измененные элементы заменяют прежние, удаленные - исключаются.
+Файлы читаются потоково, модели строятся по мере чтения,
+ссылки разрешаются по общей таблице кодов.
+В доверенном режиме (данные получены из собственной резервной копии) модели
+заполняются напрямую, без проверок в свойствах
+"""
+class restore_service:
+    __repo: reposity
+
+    # Поля заголовка резервной копии
+    __header: list = ["export_date", "chain", "version", "base_version"]
+
+    # Внутренние атрибуты свойств моделей: (класс, поле) -> имя атрибута
+    __attributes: dict = {}
+
+    # Имена файлов резервных копий (полных и инкрементальных, в том числе сжатых)
+    __backup_name = re.compile(r"backup_[A-Za-z0-9_]+\.json(\.gz)?")
+
+    def __init__(self, repository: reposity):
+        validator.validate(repository, reposity)
+        self.__repo = repository
+        self.__last_header = None
+
+    @property
+    def header(self) -> dict:
+        """
+        Заголовок последней примененной резервной копии (None - восстановления не было).
+        По нему продолжается цепочка резервных копий
+        """
+        return self.__last_header
+
+    @staticmethod
+    def backup_file(directory: str, name: str) -> str:
+        """
+        Путь к файлу резервной копии по имени. Принимаются только имена вида backup_*.json(.gz),
+        файл должен находиться в каталоге резервных копий (в том числе после разрешения ссылок)
+
+        Args:
+            directory (str): каталог резервных копий
+            name (str): имя файла резервной копии
+
+        Returns:
+            str: полный путь к файлу
+        """
+        validator.validate(directory, str)
+        validator.validate(name, str)
+        if restore_service.__backup_name.fullmatch(name) is None:
+            raise argument_exception(f"Некорректное имя резервной копии: {name}")
+
+        root = os.path.realpath(directory)
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.dirname(path) != root:
+            raise argument_exception(f"Резервная копия {name} вне каталога резервных копий")
+        return path
+
+    def restore(self, base_path: str, increments: list = None, trusted: bool = False) -> dict:
+        """
+        Восстановить данные репозитория из резервных копий
+
+        Args:
+            base_path (str): путь к полной резервной копии
+            increments (list): пути к инкрементальным копиям в порядке создания
+            trusted (bool): доверенный режим - модели заполняются без проверок в свойствах
+
+        Returns:
+            dict: количество восстановленных элементов по разделам
+        """
+        validator.validate(base_path, str)
+        validator.validate(trusted, bool)
+        increments = increments if increments is not None else []
+        validator.validate(increments, list)
+
+        # Разделы: код -> модель (порядок элементов сохраняется); общая таблица кодов для ссылок
+        names = [section for section, _ in export_service.sections()]
+        sections = {section: {} for section in names}
+        models = {}
+        builders = self.__builders(trusted)
+
+        def resolve(section: str, data: dict):
+            if data is None:
+                return None
+            model = models.get(data["unique_code"])
+            if model is None:
+                # Ссылка на элемент, которого нет в копии, - строим по вложенным данным
+                model = builders[section](data, resolve)
+                models[model.unique_code] = model
+            return model
+
+        header = self.__read(base_path, None, sections, models, builders, resolve)
+        if header.get("base_version") is not None:
+            raise argument_exception(f"{base_path} - не полная резервная копия")
+
+        for path in increments:
+            validator.validate(path, str)
+            header = self.__read(path, header, sections, models, builders, resolve)
+
+        result = {}
+        for section, key in export_service.sections():
+            self.__repo.data[key] = list(sections[section].values())
+            result[section] = len(sections[section])
+
+        self.__last_header = header
+        return result
+
+    def __read(self, path: str, previous: dict, sections: dict, models: dict, builders: dict, resolve) -> dict:
+        """
+        Прочитать резервную копию и применить ее к разделам.
+        Для инкрементальной копии проверяется, что она продолжает цепочку previous
+
+        Returns:
+            dict: заголовок прочитанной копии
+        """
+        header = {}
+        checked = previous is None
+
+        def check():
+            if header.get("chain") != previous.get("chain") or header.get("base_version") != previous.get("version"):
+                raise operation_exception(f"{path} - не продолжает цепочку резервных копий")
+
+        try:
+            with restore_service.__open(path) as file:
+                for name, value, is_item in json_stream(file).members():
+                    if name in restore_service.__header:
+                        header[name] = value
+                        continue
+
+                    if not checked:
+                        check()
+                        checked = True
+
+                    if name == "deleted" and not is_item:
+                        restore_service.__delete(value, sections, models)
+                        continue
+
+                    items = sections.get(name)
+                    if items is None or not is_item:
+                        continue
+
+                    model = builders[name](value, resolve)
+                    current = models.get(model.unique_code)
+                    if current is not None and current.__class__ is model.__class__:
+                        # Изменение на месте: ссылки других элементов остаются действительными
+                        current.__dict__.update(model.__dict__)
+                        model = current
+                    models[model.unique_code] = model
+                    items[model.unique_code] = model
+        except OSError as e:
+            raise operation_exception(f"Ошибка чтения резервной копии {path}: {str(e)}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise operation_exception(f"Некорректные данные в резервной копии {path}: {str(e)}")
+
+        if not checked:
+            check()
+        return header
+
+    @staticmethod
+    def __open(path: str):
+        """
+        Открыть резервную копию на чтение (сжатую gzip или нет)
+        """
+        with open(path, 'rb') as file:
+            compressed = file.read(2) == b"\x1f\x8b"
+
+        if compressed:
+            return gzip.open(path, 'rt', encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
+
+    @staticmethod
+    def __delete(deleted: dict, sections: dict, models: dict):
+        """
+        Исключить удаленные элементы по кодам
+        """
+        validator.validate(deleted, dict)
+        for section, codes in deleted.items():
+            items = sections.get(section)
+            if items is None:
+                continue
+            for code in codes:
+                items.pop(code, None)
+                models.pop(code, None)
+
+    def __builders(self, trusted: bool) -> dict:
+        """
+        Функции построения моделей по разделам
+        """
+        if trusted:
+            return restore_service.__trusted_builders()
+
+        return {
+            "ranges": restore_service.__build_range,
+            "groups": restore_service.__build_group,
+            "nomenclatures": restore_service.__build_nomenclature,
+            "storages": restore_service.__build_storage,
+            "transactions": restore_service.__build_transaction,
+            "receipts": restore_service.__build_receipt
+        }
+
+    @staticmethod
+    def __build_range(data: dict, resolve) -> range_model:
+        item = range_model.create(data["name"], data.get("value", 1), resolve("ranges", data.get("base")))
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __build_group(data: dict, resolve) -> group_model:
+        item = group_model()
+        item.name = data["name"]
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __build_nomenclature(data: dict, resolve) -> nomenclature_model:
+        item = nomenclature_model()
+        item.name = data["name"]
+        if data.get("group") is not None:
+            item.group = resolve("groups", data["group"])
+        if data.get("range") is not None:
+            item.range = resolve("ranges", data["range"])
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __build_storage(data: dict, resolve) -> storage_model:
+        item = storage_model.create(data["name"], data.get("address", ""))
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __build_transaction(data: dict, resolve) -> transaction_model:
+        item = transaction_model.create(
+            datetime.fromisoformat(data["date"]),
+            resolve("nomenclatures", data["nomenclature"]),
+            resolve("storages", data["storage"]),
+            data["quantity"],
+            data["unit"]
+        )
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __build_receipt(data: dict, resolve) -> receipt_model:
+        item = receipt_model.create(data["name"], data.get("cooking_time", ""), data.get("portions", 1))
+        item.steps.extend(data.get("steps", []))
+        for composition in data.get("composition", []):
+            element = receipt_item_model.create(
+                resolve("nomenclatures", composition["nomenclature"]),
+                resolve("ranges", composition["range"]),
+                composition["value"]
+            )
+            element.unique_code = composition["unique_code"]
+            item.composition.append(element)
+        item.unique_code = data["unique_code"]
+        return item
+
+    @staticmethod
+    def __attribute(cls, field: str) -> str:
+        """
+        Имя внутреннего атрибута свойства модели (с учетом класса, где свойство объявлено)
+        """
+        name = restore_service.__attributes.get((cls, field))
+        if name is None:
+            owner = next((klass for klass in cls.__mro__ if field in klass.__dict__), cls)
+            name = f"_{owner.__name__.lstrip('_')}__{field}"
+            restore_service.__attributes[(cls, field)] = name
+        return name
+
+    @staticmethod
+    def __maker(cls, fields: list):
+        """
+        Функция создания модели без конструктора и проверок в свойствах (доверенный режим).
+        Принимает значения полей в порядке fields
+        """
+        names = [restore_service.__attribute(cls, field) for field in fields]
+        create = cls.__new__
+
+        def make(*values):
+            item = create(cls)
+            item.__dict__.update(zip(names, values))
+            return item
+
+        return make
+
+    @staticmethod
+    def __trusted_builders() -> dict:
+        """
+        Функции построения моделей доверенного режима
+        """
+        make_range = restore_service.__maker(range_model, ["unique_code", "name", "value", "base"])
+        make_group = restore_service.__maker(group_model, ["unique_code", "name"])
+        make_nomenclature = restore_service.__maker(nomenclature_model, ["unique_code", "name", "group", "range"])
+        make_storage = restore_service.__maker(storage_model, ["unique_code", "name", "address"])
+        make_transaction = restore_service.__maker(transaction_model,
+                                                   ["unique_code", "date", "nomenclature", "storage", "quantity", "unit"])
+        make_receipt = restore_service.__maker(receipt_model,
+                                               ["unique_code", "name", "cooking_time", "portions", "steps", "composition"])
+        make_receipt_item = restore_service.__maker(receipt_item_model, ["unique_code", "nomenclature", "range", "value"])
+        parse_date = datetime.fromisoformat
+
+        def build_range(data: dict, resolve) -> range_model:
+            return make_range(data["unique_code"], data["name"], data.get("value", 1), resolve("ranges", data.get("base")))
+
+        def build_group(data: dict, resolve) -> group_model:
+            return make_group(data["unique_code"], data["name"])
+
+        def build_nomenclature(data: dict, resolve) -> nomenclature_model:
+            return make_nomenclature(data["unique_code"], data["name"],
+                                     resolve("groups", data.get("group")), resolve("ranges", data.get("range")))
+
+        def build_storage(data: dict, resolve) -> storage_model:
+            return make_storage(data["unique_code"], data["name"], data.get("address", ""))
+
+        def build_transaction(data: dict, resolve) -> transaction_model:
+            return make_transaction(data["unique_code"], parse_date(data["date"]),
+                                    resolve("nomenclatures", data["nomenclature"]),
+                                    resolve("storages", data["storage"]),
+                                    float(data["quantity"]), data["unit"])
+
+        def build_receipt(data: dict, resolve) -> receipt_model:
+            composition = [make_receipt_item(element["unique_code"],
+                                             resolve("nomenclatures", element["nomenclature"]),
+                                             resolve("ranges", element["range"]),
+                                             element["value"])
+                           for element in data.get("composition", [])]
+            return make_receipt(data["unique_code"], data["name"], data.get("cooking_time", ""),
+                                data.get("portions", 1), list(data.get("steps", [])), composition)
+
+        return {
+            "ranges": build_range,
+            "groups": build_group,
+            "nomenclatures": build_nomenclature,
+            "storages": build_storage,
+            "transactions": build_transaction,
+            "receipts": build_receipt
+        }
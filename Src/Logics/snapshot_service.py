@@ -0,0 +1,123 @@
+from Src.Core.validator import validator, argument_exception
+from Src.Core.abstract_subscriber import abstract_subscriber
+from Src.Core.observe_service import observe_service
+from Src.Core.event_type import event_type
+from Src.Logics.factory_entities import factory_entities
+from Src.Models.settings_model import settings_model
+from Src.reposity import reposity
+import threading
+
+"""
+Кеш готовых ответов по справочникам.
+Для пары (ключ данных, формат) хранится полностью сформированный ответ в байтах.
+Снимки сбрасываются по событиям изменения справочников и при смене версии данных,
+а формируются заново лениво - при следующем запросе
+"""
+class snapshot_service(abstract_subscriber):
+    # Справочники, для которых хранятся снимки (обороты не кешируются - их много и они часто меняются)
+    __keys: list = [
+        reposity.range_key(),
+        reposity.group_key(),
+        reposity.nomenclature_key(),
+        reposity.storage_key(),
+        reposity.receipt_key()
+    ]
+
+    def __init__(self, repo: reposity):
+        validator.validate(repo, reposity)
+        self.__repo = repo
+        self.__factory = factory_entities(settings_model())
+        self.__snapshots = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        observe_service.add(self)
+
+    @staticmethod
+    def supports(key: str) -> bool:
+        """
+        Хранятся ли снимки для ключа данных
+        """
+        return key in snapshot_service.__keys
+
+    def __version(self) -> tuple:
+        # Справочники ссылаются друг на друга, поэтому учитываются версии всех справочников
+        return tuple(self.__repo.version(key) for key in snapshot_service.__keys)
+
+    def get(self, key: str, format: str) -> bytes:
+        """
+        Получить готовый ответ по всем данным справочника
+
+        Args:
+            key (str): ключ данных репозитория
+            format (str): формат ответа
+
+        Returns:
+            bytes: сформированный ответ или None, если данных нет
+        """
+        validator.validate(key, str)
+        validator.validate(format, str)
+        if not snapshot_service.supports(key):
+            raise argument_exception(f"Снимки для {key} не поддерживаются")
+
+        version = self.__version()
+        with self.__lock:
+            entry = self.__snapshots.get((key, format))
+            if entry is not None and entry[0] == version:
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+
+        data = self.__repo.data.get(key, [])
+        if len(data) == 0:
+            return None
+
+        body = snapshot_service.__render(self.__factory.create(format), data)
+        with self.__lock:
+            self.__snapshots[(key, format)] = (version, body)
+        return body
+
+    @staticmethod
+    def __render(formatter, data: list) -> bytes:
+        chunks = formatter.stream(data)
+        if isinstance(chunks, (str, bytes)):
+            chunks = [chunks]
+        return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in chunks)
+
+    def clear(self):
+        """
+        Сбросить все снимки
+        """
+        with self.__lock:
+            self.__snapshots.clear()
+
+    def stats(self) -> dict:
+        """
+        Статистика использования снимков
+
+        Returns:
+            dict: количество снимков, их объем, попадания и промахи
+        """
+        with self.__lock:
+            return {
+                "size": len(self.__snapshots),
+                "bytes": sum(len(entry[1]) for entry in self.__snapshots.values()),
+                "hits": self.__hits,
+                "misses": self.__misses
+            }
+
+    """
+    События изменения справочников
+    """
+    def events(self) -> list:
+        return [event_type.add_reference(), event_type.change_reference(), event_type.remove_reference()]
+
+    """
+    Обработка событий: изменение справочника сбрасывает снимки
+    (связанные справочники выводят наименования друг друга, поэтому сбрасываются все)
+    """
+    def handle(self, event: str, params):
+        super().handle(event, params)
+
+        if event in self.events():
+            self.clear()
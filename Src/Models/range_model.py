@@ -24,7 +24,7 @@ class range_model(entity_model):
         self.__value = value
 
     @property
-    def base(self):
+    def base(self) -> "range_model":
         """
         Базовая единица измерения
         """
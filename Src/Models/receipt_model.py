@@ -15,6 +15,11 @@ class receipt_model(entity_model):
     # Время приготовления
     __cooking_time:str = ""
 
+    def __init__(self):
+        super().__init__()
+        # Шаги и состав у каждого рецепта свои
+        self.__steps = []
+        self.__composition = []
 
     # Количество порций
     @property
@@ -0,0 +1,88 @@
+from Src.Core.abstract_model import abstact_model
+from Src.Core.job_status import JobStatus
+from Src.Core.validator import validator
+from datetime import datetime
+
+"""
+Модель фонового задания формирования отчета
+"""
+class report_job_model(abstact_model):
+    __report_type: str = ""
+    __params: dict = None
+    __status: JobStatus = JobStatus.PENDING
+    __result: list = None
+    __error: str = ""
+    __created_at: datetime = None
+    __finished_at: datetime = None
+
+    @property
+    def report_type(self) -> str:
+        return self.__report_type
+
+    @report_type.setter
+    def report_type(self, value: str):
+        validator.validate(value, str)
+        self.__report_type = value.strip()
+
+    @property
+    def params(self) -> dict:
+        return self.__params
+
+    @params.setter
+    def params(self, value: dict):
+        validator.validate(value, dict)
+        self.__params = value
+
+    @property
+    def status(self) -> JobStatus:
+        return self.__status
+
+    @status.setter
+    def status(self, value: JobStatus):
+        validator.validate(value, JobStatus)
+        self.__status = value
+
+    @property
+    def result(self) -> list:
+        return self.__result
+
+    @result.setter
+    def result(self, value: list):
+        validator.validate(value, list)
+        self.__result = value
+
+    @property
+    def error(self) -> str:
+        return self.__error
+
+    @error.setter
+    def error(self, value: str):
+        validator.validate(value, str)
+        self.__error = value
+
+    @property
+    def created_at(self) -> datetime:
+        return self.__created_at
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        validator.validate(value, datetime)
+        self.__created_at = value
+
+    @property
+    def finished_at(self) -> datetime:
+        return self.__finished_at
+
+    @finished_at.setter
+    def finished_at(self, value: datetime):
+        validator.validate(value, datetime)
+        self.__finished_at = value
+
+    @staticmethod
+    def create(report_type: str, params: dict) -> "report_job_model":
+        item = report_job_model()
+        item.report_type = report_type
+        item.params = params
+        item.status = JobStatus.PENDING
+        item.created_at = datetime.now()
+        return item
@@ -1,14 +1,261 @@
 from Src.Core.common import common
+from Src.Core.tracked_list import tracked_dict
+from Src.Core.repository_index import repository_index
+from Src.Core.validator import operation_exception
+from Src.Core.abstract_model import abstact_model
+import itertools
+import threading
 
 """
 Репозиторий данных
 """
 class reposity:
-    __data = {}
+    __data: tracked_dict = None
+    __versions: dict = {}
+    __version: int = 0
+    __counter = itertools.count(1)
+    __indexes: dict = {}
+    __changes: dict = {}
+    __index_lock = threading.Lock()
+    # Версии и журнал изменений меняются и читаются согласованно
+    __change_lock = threading.Lock()
+
+    # Граф обратных ссылок: код модели -> {id ссылающейся модели: модель} (строится при первом обращении)
+    __graph: dict = None
+    # Прямые ссылки связанных моделей: id модели -> (модель, коды моделей, на которые она ссылается,
+    # составные части, ключ данных и элемент списка, которому модель принадлежит)
+    __links: dict = {}
+
+    def __init__(self):
+        if reposity.__data is None:
+            reposity.__data = tracked_dict(reposity.__on_change)
 
     @property
     def data(self):
         return self.__data
+
+    """
+    Текущая версия данных. По ключу - версия последнего изменения списка, без ключа - общая
+    """
+    def version(self, key: str = None) -> int:
+        if key is None:
+            return reposity.__version
+        return reposity.__versions.get(key, 0)
+
+    """
+    Изменения списка данных после указанной версии по журналу изменений.
+    Возвращает (измененные и добавленные элементы, коды удаленных элементов)
+    """
+    def changes(self, key: str, since: int = 0) -> tuple:
+        with reposity.__change_lock:
+            return reposity.__changes_since(key, since)
+
+    @staticmethod
+    def __changes_since(key: str, since: int) -> tuple:
+        entries = sorted((entry for entry in reposity.__changes.get(key, {}).items() if entry[1][0] > since),
+                         key=lambda entry: entry[1][0])
+        changed = [item for _, (_, item) in entries if item is not None]
+        deleted = [code for code, (_, item) in entries if item is None]
+        return changed, deleted
+
+    """
+    Снимок списков данных по ключам вместе с версией, на момент которой он сделан.
+    Все изменения с версией не больше возвращенной уже есть в снимке
+    """
+    def snapshot(self, keys: list) -> tuple:
+        with reposity.__change_lock:
+            return reposity.__version, {key: list(self.__data.get(key, [])) for key in keys}
+
+    """
+    Изменения по ключам после указанной версии вместе с версией, на момент которой они получены.
+    Возвращает (версия, словарь ключ -> (измененные и добавленные элементы, коды удаленных элементов))
+    """
+    def changes_snapshot(self, keys: list, since: int) -> tuple:
+        with reposity.__change_lock:
+            return reposity.__version, {key: reposity.__changes_since(key, since) for key in keys}
+
+    """
+    Удалить из журнала изменений записи до указанной версии включительно
+    (они уже попали в резервную копию и для следующих копий не нужны)
+    """
+    def prune_changes(self, version: int):
+        with reposity.__change_lock:
+            for entries in reposity.__changes.values():
+                for code in [code for code, (stamp, _) in entries.items() if stamp <= version]:
+                    del entries[code]
+
+    """
+    Модели, которые ссылаются на указанную модель (в том числе через составные части, например состав рецепта).
+    Граф обратных ссылок строится при первом обращении и далее поддерживается при изменении данных
+    """
+    def dependents(self, model) -> list:
+        if not isinstance(model, abstact_model):
+            raise operation_exception("Ожидается модель")
+
+        with reposity.__index_lock:
+            if reposity.__graph is None:
+                reposity.__graph = {}
+                reposity.__links.clear()
+                for key, items in self.__data.items():
+                    if key != reposity.turnover_cache_key():
+                        for item in items:
+                            reposity.__link(item, key)
+
+            return [item for item in reposity.__graph.get(model.unique_code, {}).values() if item is not model]
+
+    """
+    Заменить ссылки на прежнюю модель ссылками на новую у всех зависимых моделей.
+    Затрагиваются только модели из графа обратных ссылок; измененные элементы данных
+    попадают в журнал изменений, их ссылки в графе обновляются.
+    Возвращает измененные элементы данных
+    """
+    def replace_references(self, old_model, new_model) -> list:
+        if not isinstance(new_model, abstact_model):
+            raise operation_exception("Ожидается модель")
+
+        roots = {}
+        for dependent in self.dependents(old_model):
+            for field in common.get_fields(dependent):
+                if getattr(dependent, field) == old_model:
+                    setattr(dependent, field, new_model)
+
+            entry = reposity.__links.get(id(dependent))
+            if entry is not None:
+                _, _, _, key, root = entry
+                roots[id(root)] = (key, root)
+
+        # При сохранении кода значения индексируемых полей (коды ссылок) не меняются,
+        # иначе индексы зависимых данных перестраиваются
+        same_code = new_model.unique_code == old_model.unique_code
+        for key, root in roots.values():
+            reposity.__on_change(key, [root], [root], False, None, same_code)
+
+        return [root for _, root in roots.values()]
+    """
+    Добавить прямые ссылки модели (и ее составных частей) в граф обратных ссылок
+    """
+    @staticmethod
+    def __link(item, key: str, root=None):
+        if not isinstance(item, abstact_model) or id(item) in reposity.__links:
+            return
+
+        targets = []
+        parts = []
+        for field in common.get_schema(item.__class__):
+            value = getattr(item, field, None)
+            if isinstance(value, abstact_model):
+                targets.append(value.unique_code)
+            elif isinstance(value, list):
+                for element in value:
+                    if isinstance(element, abstact_model):
+                        targets.append(element.unique_code)
+                        parts.append(element)
+
+        root = root if root is not None else item
+        reposity.__links[id(item)] = (item, targets, parts, key, root)
+        for code in targets:
+            reposity.__graph.setdefault(code, {})[id(item)] = item
+        for part in parts:
+            reposity.__link(part, key, root)
+
+    """
+    Удалить прямые ссылки модели (и ее составных частей) из графа обратных ссылок
+    """
+    @staticmethod
+    def __unlink(item):
+        entry = reposity.__links.pop(id(item), None)
+        if entry is None:
+            return
+
+        _, targets, parts, _, _ = entry
+        for code in targets:
+            dependents = reposity.__graph.get(code)
+            if dependents is not None:
+                dependents.pop(id(item), None)
+                if len(dependents) == 0:
+                    del reposity.__graph[code]
+        for part in parts:
+            reposity.__unlink(part)
+
+    """
+    Отметить изменение элемента на месте (без замены в списке).
+    Вызывается для каждой модели, измененной на месте: изменение попадает в журнал
+    (и в инкрементальную копию), ссылки модели в графе обратных ссылок обновляются
+    """
+    def mark_changed(self, key: str, item):
+        items = self.__data.get(key)
+        if items is None or item not in items:
+            raise operation_exception(f"Элемент не найден в {key}")
+        reposity.__on_change(key, [item], [item], False, None)
+
+    """
+    Получить индексы списка данных по ключу (строятся при первом обращении)
+    """
+    def index(self, key: str) -> repository_index:
+        items = self.__data.get(key)
+        if items is None:
+            return None
+
+        with reposity.__index_lock:
+            index = reposity.__indexes.get(key)
+            if index is None:
+                hash_fields, sorted_fields, text_fields = reposity.indexed_fields(key)
+                index = repository_index(hash_fields, sorted_fields, text_fields)
+                reposity.__indexes[key] = index
+
+            if not index.valid or index.size != len(items):
+                index.rebuild(items)
+
+        return index
+
+    """
+    Индексируемые поля по ключу: (поля хеш-индекса, поля упорядоченного индекса, поля триграммного индекса)
+    """
+    @staticmethod
+    def indexed_fields(key: str) -> tuple:
+        if key == reposity.transaction_key():
+            return (["unique_code", "nomenclature/unique_code", "storage/unique_code"], ["date"], [])
+
+        return (["unique_code", "name"], ["name"], ["name"])
+
+    """
+    Обработка изменения списка данных по ключу
+    """
+    @staticmethod
+    def __on_change(key: str, added: list, removed: list, append_only: bool, position: int,
+                    keep_index: bool = False):
+        with reposity.__change_lock:
+            stamp = next(reposity.__counter)
+            reposity.__versions[key] = stamp
+            reposity.__version = stamp
+
+            # Служебный кэш оборотов пересчитывается целиком и в журнал не попадает
+            if key != reposity.turnover_cache_key():
+                changes = reposity.__changes.setdefault(key, {})
+                for item in removed:
+                    code = getattr(item, "unique_code", None)
+                    if code is not None:
+                        changes[code] = (stamp, None)
+                for item in added:
+                    code = getattr(item, "unique_code", None)
+                    if code is not None:
+                        changes[code] = (stamp, item)
+
+        with reposity.__index_lock:
+            if reposity.__graph is not None and key != reposity.turnover_cache_key():
+                for item in removed:
+                    reposity.__unlink(item)
+                for item in added:
+                    reposity.__link(item, key)
+
+            index = reposity.__indexes.get(key)
+            if index is not None and not keep_index:
+                if append_only:
+                    index.extend(added, len(reposity.__data[key]) - len(added))
+                elif position is not None:
+                    index.replace(position, removed[0], added[0])
+                else:
+                    index.invalidate()
     
     """
     Ключ для единиц измерений
@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime, timedelta
+from Src.Logics.aggregation_service import aggregation_service
+from Src.Dtos.aggregation_dto import aggregation_dto
+from Src.Core.validator import argument_exception
+from Src.reposity import reposity
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.Models.group_model import group_model
+from Src.Models.range_model import range_model
+
+"""
+Набор тестов для агрегации данных репозитория
+"""
+class test_aggregation(unittest.TestCase):
+
+    def _create_data(self, repo):
+        groups = [group_model.create("Ингредиенты"), group_model.create("Специи")]
+        range_gram = range_model.create_gramm()
+        nomenclatures = [nomenclature_model.create("Мука", groups[0], range_gram),
+                         nomenclature_model.create("Сахар", groups[0], range_gram),
+                         nomenclature_model.create("Перец", groups[1], range_gram)]
+        storage = storage_model.create("Главный склад")
+
+        transactions = []
+        for index in range(90):
+            transactions.append(transaction_model.create(
+                datetime(2024, 1, 1) + timedelta(days=index),
+                nomenclatures[index % len(nomenclatures)],
+                storage,
+                float(index % 10 - 3),
+                "г"
+            ))
+
+        repo.data[reposity.transaction_key()] = transactions
+        return transactions
+
+    # Проверить агрегаты по группе номенклатуры и месяцу
+    # Значения должны совпадать с прямым подсчетом
+    def test_equal_aggregation_group_by_month(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        transactions = self._create_data(repo)
+        service = aggregation_service(repo)
+        request = aggregation_dto().create({
+            "filters": [{"field_name": "date", "value": "2024-03-01", "type": "LESS"}],
+            "group_by": ["nomenclature/group/name", "date:month"],
+            "aggregates": ["count", "sum", "min", "max", "avg"]
+        })
+
+        # Действие
+        rows = service.aggregate(reposity.transaction_key(), request)
+
+        # Проверки
+        assert [(row["nomenclature/group/name"], row["date:month"]) for row in rows] == [
+            ("Ингредиенты", "2024-01"), ("Ингредиенты", "2024-02"), ("Специи", "2024-01"), ("Специи", "2024-02")]
+        selected = [item.quantity for item in transactions
+                    if item.nomenclature.group.name == "Специи" and item.date.month == 2]
+        row = rows[3]
+        assert row["count"] == len(selected)
+        assert row["sum"] == sum(selected)
+        assert row["min"] == min(selected)
+        assert row["max"] == max(selected)
+        assert row["avg"] == sum(selected) / len(selected)
+
+    # Проверить агрегацию без группировки и некорректные параметры
+    # Должна получиться одна строка, ошибки параметров - исключение
+    def test_throw_aggregation_invalid_request(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        transactions = self._create_data(repo)
+        service = aggregation_service(repo)
+
+        # Действие
+        rows = service.aggregate(reposity.transaction_key(), aggregation_dto().create({"aggregates": ["COUNT"]}))
+
+        # Проверки
+        assert rows == [{"count": len(transactions)}]
+        with self.assertRaises(argument_exception):
+            aggregation_dto().create({"group_by": ["date:week"]})
+        with self.assertRaises(argument_exception):
+            aggregation_dto().create({"aggregates": ["MEDIAN"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ from Src.Core.common import common
 
 # Тут указать любую модель
 from Src.Models.company_model import company_model
+from Src.Models.receipt_model import receipt_model
 
 # Набор тестов для основных методов
 class test_common(unittest.TestCase):
@@ -28,4 +29,22 @@ class test_common(unittest.TestCase):
         # Проверка
         assert len(result) > 0
 
+    # Проверить работу метода get_fields для списков свойств класса
+    def test_equal_common_get_fields_schema(self):
+        # Подготовка
+        receipt = receipt_model.create("Вафли", "20 мин", 10)
+        expected = [item for item in dir(receipt)
+                    if not item.startswith("_") and isinstance(getattr(receipt_model, item), property)]
+
+        # Действие
+        result = common.get_fields(receipt)
+        result_common = common.get_fields(receipt, True)
+
+        # Проверка
+        assert result == expected
+        assert common.get_schema(receipt_model) == tuple(expected)
+        assert "steps" in result
+        assert "steps" not in result_common
+        assert "composition" not in result_common
+
 
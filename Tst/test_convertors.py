@@ -7,6 +7,8 @@ from Src.Logics.convert_factory import convert_factory
 from Src.Models.range_model import range_model
 from Src.Models.group_model import group_model
 from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
 
 """
 Набор тестов для конвертеров и фабрики
@@ -188,6 +190,53 @@ class test_convertors(unittest.TestCase):
         # Проверяем что объекты в списке обработаны рекурсивно
         assert isinstance(result["objects"][0], dict)
 
+    # Проверить повторную конвертацию по сохраненному плану класса
+    # Результат должен совпадать для разных экземпляров и фабрик, None и пустые списки пропускаются
+    def test_convert_factory_cached_plan(self):
+        # Подготовка
+        range_gram = range_model.create("Грамм", 1, None)
+        nomenclature = nomenclature_model.create("Мука", group_model.create("Ингредиенты"), range_gram)
+        storage = storage_model.create("Главный склад")
+        transactions = [transaction_model.create(datetime(2024, 1, day), nomenclature, storage, float(day), "г")
+                        for day in range(1, 4)]
+        factory = convert_factory()
+
+        # Действие
+        first = [factory.convert(item) for item in transactions]
+        convert_factory.reset_plans()
+        second = [convert_factory().convert(item) for item in transactions]
+
+        # Проверка
+        assert first == second
+        assert first[0]["date"] == "2024-01-01 00:00:00"
+        assert first[2]["quantity"] == 3.0
+        assert first[0]["nomenclature"]["range"]["name"] == "Грамм"
+        assert "base" not in first[0]["nomenclature"]["range"]
+
+    # Проверить нормализованную конвертацию
+    # Вложенные модели заменяются кодом и попадают в таблицу связанных моделей один раз
+    def test_convert_factory_normalized(self):
+        # Подготовка
+        range_kilo = range_model.create("Килограмм", 1000, range_model.create("Грамм", 1, None))
+        group = group_model.create("Ингредиенты")
+        nomenclature = nomenclature_model.create("Мука", group, range_kilo)
+        storage = storage_model.create("Главный склад")
+        transactions = [transaction_model.create(datetime(2024, 1, day), nomenclature, storage, float(day), "г")
+                        for day in range(1, 4)]
+        factory = convert_factory(True)
+
+        # Действие
+        rows = [factory.convert(item) for item in transactions]
+
+        # Проверка
+        assert rows[0]["nomenclature"] == nomenclature.unique_code
+        assert rows[2]["storage"] == storage.unique_code
+        assert rows[1]["date"] == "2024-01-02 00:00:00"
+        assert len(factory.references) == 5
+        assert factory.references[nomenclature.unique_code]["group"] == group.unique_code
+        assert factory.references[range_kilo.unique_code]["base"] == range_kilo.base.unique_code
+        assert factory.references[range_kilo.base.unique_code]["name"] == "Грамм"
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,21 @@
 import unittest
 import os
+import threading
 import tempfile
+import json
+import gzip
 from Src.Logics.export_service import export_service
 from Src.reposity import reposity
 from Src.Models.nomenclature_model import nomenclature_model
 from Src.Models.storage_model import storage_model
 from Src.Models.group_model import group_model
 from Src.Models.range_model import range_model
+from Src.Models.transaction_model import transaction_model
+from Src.Logics.restore_service import restore_service
+from Src.Logics.reference_service import reference_service
+from Src.Core.observe_service import observe_service
+from Src.Core.validator import operation_exception, argument_exception
+from datetime import datetime
 
 """
 Набор тестов для сервиса экспорта данных
@@ -43,8 +52,406 @@ class test_export(unittest.TestCase):
             assert os.path.getsize(temp_path) > 0
 
         finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+            for path in [temp_path, export_service.signature_path(temp_path)]:
+                if os.path.exists(path):
+                    os.unlink(path)
+
+    def test_equal_export_all_data_stream(self):
+        """
+        Проверяет, что потоковый экспорт совпадает с json.dump по всем данным, в том числе со сжатием
+        """
+        repo = reposity()
+        repo.initalize()
+
+        group = group_model.create("Группа экспорта")
+        range_gram = range_model()
+        range_gram.name = "грамм"
+        range_gram.value = 1
+        nomenclatures = [nomenclature_model.create(f"Номенклатура {index}", group, range_gram) for index in range(1200)]
+
+        repo.data[reposity.group_key()] = [group]
+        repo.data[reposity.nomenclature_key()] = nomenclatures
+
+        service = export_service(repo)
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "export.json")
+
+        try:
+            service.export_all_data(path)
+            service.export_all_data(path + ".gz", True)
+
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+            data = json.loads(text)
+            with gzip.open(path + ".gz", "rt", encoding="utf-8") as file:
+                compressed = json.load(file)
+
+            assert text == json.dumps(data, ensure_ascii=False, indent=2)
+            assert len(data["nomenclatures"]) == 1200
+            assert data["nomenclatures"][0]["name"] == "Номенклатура 0"
+            assert data["storages"] == []
+            assert compressed["nomenclatures"] == data["nomenclatures"]
+            assert sorted(os.listdir(directory)) == ["export.json", "export.json.gz", "export.json.gz.sig", "export.json.sig"]
+
+            # Права файла - как у обычного файла по umask, а не только для владельца
+            mask = os.umask(0)
+            os.umask(mask)
+            assert os.stat(path).st_mode & 0o777 == 0o666 & ~mask
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_equal_export_all_data_parallel(self):
+        """
+        Проверяет, что параллельный экспорт совпадает с последовательным
+        """
+        repo = reposity()
+        repo.initalize()
+
+        group = group_model.create("Группа экспорта")
+        range_gram = range_model.create("грамм", 1, None)
+        nomenclature = nomenclature_model.create("Номенклатура экспорта", group, range_gram)
+        storage = storage_model.create("Склад экспорта", "ул. Первая, 1")
+        transactions = [transaction_model.create(datetime(2024, 1, 1 + index % 28), nomenclature, storage, float(index), "г")
+                        for index in range(12000)]
+
+        repo.data[reposity.nomenclature_key()] = [nomenclature]
+        repo.data[reposity.storage_key()] = [storage]
+        repo.data[reposity.transaction_key()] = transactions
+
+        service = export_service(repo)
+        directory = tempfile.mkdtemp()
+        sequential_path = os.path.join(directory, "sequential.json")
+        parallel_path = os.path.join(directory, "parallel.json")
+
+        try:
+            service.export_all_data(sequential_path)
+            service.export_all_data(parallel_path, workers=2)
+            service.export_all_data(parallel_path, workers=64)
+
+            with open(sequential_path, encoding="utf-8") as file:
+                sequential = json.load(file)
+            with open(parallel_path, encoding="utf-8") as file:
+                text = file.read()
+            parallel = json.loads(text)
+
+            assert text == json.dumps(parallel, ensure_ascii=False, indent=2)
+            assert parallel["transactions"] == sequential["transactions"]
+            assert parallel["transactions"][11999]["quantity"] == 11999.0
+            assert export_service.start_pool(64) == export_service.start_pool(2) <= 4
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_equal_restore_incremental_backups(self):
+        """
+        Проверяет восстановление из полной копии и цепочки инкрементальных копий
+        """
+        repo = reposity()
+        repo.initalize()
+
+        group = group_model.create("Группа копии")
+        range_gram = range_model.create("грамм", 1, None)
+        nomenclature = nomenclature_model.create("Номенклатура копии", group, range_gram)
+        storage = storage_model.create("Склад копии", "ул. Первая, 1")
+        transactions = [transaction_model.create(datetime(2024, 1, day), nomenclature, storage, float(day), "г")
+                        for day in range(1, 11)]
+
+        repo.data[reposity.range_key()] = [range_gram]
+        repo.data[reposity.group_key()] = [group]
+        repo.data[reposity.nomenclature_key()] = [nomenclature]
+        repo.data[reposity.storage_key()] = [storage]
+        repo.data[reposity.transaction_key()] = transactions
+
+        service = export_service(repo)
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.json")
+        first_path = os.path.join(directory, "first.json")
+        second_path = os.path.join(directory, "second.json.gz")
+
+        try:
+            service.export_all_data(base_path)
+
+            added = transaction_model.create(datetime(2024, 2, 1), nomenclature, storage, 100.0, "г")
+            removed = transactions[0]
+            repo.data[reposity.transaction_key()].append(added)
+            repo.data[reposity.transaction_key()].remove(removed)
+            service.export_changes(first_path)
+
+            storage.address = "ул. Вторая, 2"
+            repo.mark_changed(reposity.storage_key(), storage)
+            service.export_changes(second_path, True)
+
+            with open(first_path, encoding="utf-8") as file:
+                first = json.load(file)
+
+            repo.initalize()
+            result = restore_service(repo).restore(base_path, [first_path, second_path])
+
+            codes = [item.unique_code for item in repo.data[reposity.transaction_key()]]
+            assert len(first["transactions"]) == 1
+            assert first["deleted"]["transactions"] == [removed.unique_code]
+            assert result["transactions"] == 10
+            assert added.unique_code in codes
+            assert removed.unique_code not in codes
+            assert repo.data[reposity.storage_key()][0].address == "ул. Вторая, 2"
+            assert repo.data[reposity.transaction_key()][0].storage is repo.data[reposity.storage_key()][0]
+            with self.assertRaises(operation_exception):
+                restore_service(repo).restore(base_path, [second_path])
+
+            restore_service(repo).restore(base_path, [first_path, second_path], True)
+            trusted = repo.data[reposity.transaction_key()]
+            assert [item.unique_code for item in trusted] == codes
+            assert trusted[-1].date == datetime(2024, 2, 1)
+            assert trusted[-1].nomenclature is repo.data[reposity.nomenclature_key()][0]
+            assert trusted[-1].nomenclature.group.name == "Группа копии"
+            assert repo.data[reposity.storage_key()][0].address == "ул. Вторая, 2"
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_equal_restore_incremental_after_rename(self):
+        """
+        Проверяет, что модели, ссылки которых изменены при переименовании справочника,
+        попадают в инкрементальную копию и после восстановления ссылаются на измененный элемент
+        """
+        reference = reference_service()
+        self.addCleanup(observe_service.delete, reference)
+        repo = reposity()
+        old_range = [item for item in repo.data[reposity.range_key()] if item.name == "Киллограмм"][0]
+        dependents = [item for item in repo.data[reposity.nomenclature_key()] if item.range == old_range]
+
+        service = export_service(repo)
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.json")
+        changes_path = os.path.join(directory, "changes.json")
+
+        try:
+            service.export_all_data(base_path)
+            reference_service.change("range", {"unique_code": old_range.unique_code, "name": "Килограмм"})
+            service.export_changes(changes_path)
+
+            with open(changes_path, encoding="utf-8") as file:
+                changes = json.load(file)
+
+            restore_service(repo).restore(base_path, [changes_path])
+            restored_range = [item for item in repo.data[reposity.range_key()]
+                              if item.unique_code == old_range.unique_code][0]
+            restored = [item for item in repo.data[reposity.nomenclature_key()]
+                        if item.unique_code in [dependent.unique_code for dependent in dependents]]
+
+            assert len(dependents) > 0
+            assert sorted(item["unique_code"] for item in changes["nomenclatures"]) == \
+                sorted(item.unique_code for item in dependents)
+            assert restored_range.name == "Килограмм"
+            assert len(restored) == len(dependents)
+            assert all(item.range is restored_range for item in restored)
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_throw_restore_backup_file_outside_directory(self):
+        """
+        Проверяет, что резервная копия принимается только по имени файла из каталога резервных копий
+        """
+        directory = tempfile.mkdtemp()
+        outside = tempfile.mkdtemp()
+        link = os.path.join(directory, "backup_link.json")
+        os.symlink(os.path.join(outside, "backup_1.json"), link)
+
+        try:
+            path = restore_service.backup_file(directory, "backup_inc_20240101_120000.json.gz")
+
+            assert path == os.path.join(os.path.realpath(directory), "backup_inc_20240101_120000.json.gz")
+            for name in ["../backup_1.json", "/etc/passwd", "data.json", "backup_1.json/../settings.json",
+                         "backup_link.json"]:
+                with self.assertRaises(argument_exception):
+                    restore_service.backup_file(directory, name)
+
+        finally:
+            os.unlink(link)
+            os.rmdir(directory)
+            os.rmdir(outside)
+
+    def test_equal_export_produced_files(self):
+        """
+        Проверяет признак файла, записанного сервисом экспорта (условие доверенного восстановления).
+        Признак проверяется по подписи и сохраняется после перезапуска (новый сервис с тем же ключом)
+        """
+        repo = reposity()
+        repo.initalize()
+        repo.data[reposity.group_key()] = [group_model.create("Группа копии")]
+        directory = tempfile.mkdtemp()
+        secret_path = os.path.join(directory, ".backup_secret")
+        secret = export_service.load_secret(secret_path)
+        service = export_service(repo, secret)
+        path = os.path.join(directory, "backup_1.json")
+        other = os.path.join(directory, "backup_2.json")
+
+        try:
+            service.export_all_data(path)
+            with open(other, "w", encoding="utf-8") as file:
+                file.write("{}")
+            produced = service.produced(path)
+            restarted = export_service(repo, export_service.load_secret(secret_path)).produced(path)
+            foreign = service.produced(other)
+            another_key = export_service(repo).produced(path)
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(" ")
+
+            assert produced
+            assert restarted
+            assert not foreign
+            assert not another_key
+            assert not service.produced(path)
+            assert not service.produced(os.path.join(directory, "missing.json"))
+            assert os.stat(secret_path).st_mode & 0o777 == 0o600
+            with self.assertRaises(argument_exception):
+                export_service(repo, b"short")
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_equal_resume_backup_chain_after_restore(self):
+        """
+        Проверяет продолжение цепочки резервных копий после восстановления из нее
+        и очистку журнала изменений после каждой копии
+        """
+        repo = reposity()
+        repo.initalize()
+        groups = [group_model.create(f"Группа {index}") for index in range(5)]
+        repo.data[reposity.group_key()] = groups
+
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.json")
+        first_path = os.path.join(directory, "first.json")
+        second_path = os.path.join(directory, "second.json")
+
+        try:
+            export_service(repo).export_all_data(base_path)
+            logged = repo.changes(reposity.group_key())
+            added = group_model.create("Группа после копии")
+
+            # "Перезапуск": новые сервисы, данные восстанавливаются из цепочки
+            repo.initalize()
+            restore = restore_service(repo)
+            restore.restore(base_path)
+            service = export_service(repo)
+            service.resume(restore.header)
+            repo.data[reposity.group_key()].append(added)
+            service.export_changes(first_path)
+            removed = repo.data[reposity.group_key()][0]
+            repo.data[reposity.group_key()].remove(removed)
+            service.export_changes(second_path)
+
+            with open(second_path, encoding="utf-8") as file:
+                second = json.load(file)
+
+            repo.initalize()
+            restore_service(repo).restore(base_path, [first_path, second_path])
+            names = [item.name for item in repo.data[reposity.group_key()]]
+
+            assert logged == ([], [])
+            assert service.has_base
+            assert second["deleted"]["groups"] == [removed.unique_code]
+            assert second["groups"] == []
+            assert names == [item.name for item in groups[1:]] + ["Группа после копии"]
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_throw_export_changes_existing_file(self):
+        """
+        Проверяет, что инкрементальная копия не заменяет существующий файл и изменения не теряются
+        """
+        repo = reposity()
+        repo.initalize()
+        repo.data[reposity.group_key()] = [group_model.create("Группа копии")]
+        service = export_service(repo)
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "backup_base.json")
+        first_path = os.path.join(directory, "backup_inc_1.json")
+        second_path = os.path.join(directory, "backup_inc_2.json")
+
+        try:
+            service.export_all_data(base_path)
+            first = group_model.create("Первая группа")
+            repo.data[reposity.group_key()].append(first)
+            service.export_changes(first_path)
+            second = group_model.create("Вторая группа")
+            repo.data[reposity.group_key()].append(second)
+
+            with self.assertRaises(operation_exception):
+                service.export_changes(first_path)
+            service.export_changes(second_path)
+
+            with open(first_path, encoding="utf-8") as file:
+                first_data = json.load(file)
+            with open(second_path, encoding="utf-8") as file:
+                second_data = json.load(file)
+
+            assert [item["name"] for item in first_data["groups"]] == ["Первая группа"]
+            assert [item["name"] for item in second_data["groups"]] == ["Вторая группа"]
+            assert second_data["base_version"] == first_data["version"]
+            assert sorted(name for name in os.listdir(directory) if not name.endswith(".sig")) == \
+                ["backup_base.json", "backup_inc_1.json", "backup_inc_2.json"]
+
+        finally:
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_equal_repository_snapshot_during_changes(self):
+        """
+        Проверяет, что снимок данных для копии не зависит от изменений после него,
+        а журнал изменений читается при одновременных изменениях без ошибок
+        """
+        repo = reposity()
+        repo.initalize()
+        groups = [group_model.create(f"Группа {index}") for index in range(10)]
+        repo.data[reposity.group_key()] = list(groups)
+
+        version, data = repo.snapshot([reposity.group_key()])
+        repo.data[reposity.group_key()].remove(groups[0])
+
+        errors = []
+
+        def append():
+            try:
+                for index in range(3000):
+                    repo.data[reposity.group_key()].append(group_model.create(f"Элемент {index}"))
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=append)
+        thread.start()
+        try:
+            while thread.is_alive():
+                repo.changes(reposity.group_key(), version)
+                repo.changes_snapshot([reposity.group_key()], version)
+        except Exception as e:
+            errors.append(e)
+        thread.join()
+
+        assert data[reposity.group_key()] == groups
+        assert version < repo.version()
+        assert errors == []
+        changed, deleted = repo.changes(reposity.group_key(), version)
+        assert len(changed) == 3000
+        assert deleted == [groups[0].unique_code]
+        repo.initalize()
 
 if __name__ == '__main__':
     unittest.main()
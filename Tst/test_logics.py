@@ -6,6 +6,23 @@ from Src.Core.response_format import ResponseFormat
 from Src.Core.validator import validator
 from Src.Core.abstract_response import abstract_response
 from Src.Models.settings_model import settings_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.range_model import range_model
+from Src.Core.field_projection import field_projection
+from Src.Core.msgpack_codec import msgpack_codec
+from Src.Core.http_cache import http_cache
+from Src.Core.json_stream import json_stream
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from datetime import datetime
+from Src.Core.validator import argument_exception, operation_exception
+from Src.Logics.convert_factory import convert_factory
+import json
+from xml.etree import ElementTree
+import csv
+import io
+import gzip
+import hashlib
 
 
 # Тесты для проверки логики
@@ -43,6 +60,242 @@ class test_logics(unittest.TestCase):
         text = logic.build(data)
         assert len(text) > 0
 
+    # Проверим проекцию полей во всех форматах
+    def test_equal_response_projection(self):
+        # Подготовка
+        settings = settings_model()
+        factory = factory_entities(settings)
+        group = group_model.create("Ингредиенты")
+        data = [nomenclature_model.create("Мука", group, range_model.create_gramm())]
+        projection = field_projection.parse("name, group/name")
+
+        # Действие
+        results = {}
+        for format_type in ["csv", "markdown", "json", "xml"]:
+            logic = factory.create(format_type)
+            logic.projection = projection
+            results[format_type] = logic.build(data)
+
+        # Проверка
+        assert results["csv"] == "name;group/name\nМука;Ингредиенты\n"
+        assert results["markdown"].splitlines()[0] == "| name | group/name |"
+        assert json.loads(results["json"]) == [{"name": "Мука", "group": {"name": "Ингредиенты"}}]
+        assert "<group_name>Ингредиенты</group_name>" in results["xml"]
+        assert "unique_code" not in results["xml"]
+
+    # Проверим отказ при неизвестном поле проекции
+    def test_throw_response_projection_unknown_field(self):
+        # Подготовка
+        entity = group_model.create("test")
+        projection = field_projection.parse("name,price/value")
+
+        # Проверка
+        with self.assertRaises(argument_exception):
+            projection.validate(entity)
+        with self.assertRaises(argument_exception):
+            field_projection.parse("name,,unique_code")
+
+    # Проверим проверку вложенных звеньев пути поля проекции
+    def test_throw_response_projection_nested_field(self):
+        # Подготовка
+        entity = nomenclature_model.create("мука", group_model.create("группа"), range_model.create_gramm())
+
+        # Действие
+        # У грамма нет базовой единицы - вложенное поле проверяется по типу свойства
+        field_projection.parse("name,group/name,range/base/name").validate(entity)
+
+        # Проверка
+        for text in ["group/a><x", "group/__class__", "group/unknown", "name/upper", "range/base/x"]:
+            with self.assertRaises(argument_exception):
+                field_projection.parse(text).validate(entity)
+
+    # Проверим потоковое формирование JSON
+    def test_equal_response_json_stream(self):
+        # Подготовка
+        settings = settings_model()
+        factory = factory_entities(settings)
+        group = group_model.create("Ингредиенты")
+        data = [nomenclature_model.create(f"Номенклатура {index}", group, range_model.create_gramm())
+                for index in range(250)]
+        logic = factory.create("json")
+
+        # Действие
+        chunks = list(logic.stream(data))
+
+        # Проверка
+        expected = json.dumps([convert_factory().convert(item) for item in data], ensure_ascii=False, indent=2)
+        assert len(chunks) > 2
+        assert "".join(chunks) == expected
+        assert logic.build(data) == expected
+        with self.assertRaises(operation_exception):
+            logic.stream([])
+
+    # Проверим экранирование и потоковое формирование CSV
+    def test_equal_response_csv_stream(self):
+        # Подготовка
+        group = group_model.create("Ингредиенты")
+        data = [nomenclature_model.create(f"Номенклатура {index}", group, range_model.create_gramm())
+                for index in range(1200)]
+        data[0].name = 'Мука; "высший" сорт'
+        logic = response_csv()
+        logic.projection = field_projection.parse("name,group")
+
+        # Действие
+        chunks = list(logic.stream(data))
+        rows = list(csv.reader(io.StringIO("".join(chunks)), delimiter=";"))
+
+        # Проверка
+        assert len(chunks) == 3
+        assert rows[0] == ["name", "group"]
+        assert rows[1] == ['Мука; "высший" сорт', "Ингредиенты"]
+        assert len(rows) == len(data) + 1
+        assert "".join(chunks) == logic.build(data)
+
+    # Проверим экранирование и потоковое формирование XML и Markdown
+    def test_equal_response_xml_markdown_stream(self):
+        # Подготовка
+        settings = settings_model()
+        factory = factory_entities(settings)
+        group = group_model.create("Ингредиенты")
+        data = [nomenclature_model.create(f"Номенклатура {index}", group, range_model.create_gramm())
+                for index in range(600)]
+        data[0].name = "Соль <йодированная> & | крупная"
+        xml_logic = factory.create("xml")
+        markdown_logic = factory.create("markdown")
+        markdown_logic.projection = field_projection.parse("name,group/name")
+
+        # Действие
+        xml_chunks = list(xml_logic.stream(data))
+        markdown_chunks = list(markdown_logic.stream(data))
+        root = ElementTree.fromstring("".join(xml_chunks).encode("utf-8"))
+        markdown_lines = "".join(markdown_chunks).splitlines()
+
+        # Проверка
+        assert len(xml_chunks) > 2
+        assert len(root) == len(data)
+        assert root[0].find("name").text == "Соль <йодированная> & | крупная"
+        assert root[1].find("group").text == "Ингредиенты"
+        assert len(markdown_chunks) > 2
+        assert len(markdown_lines) == len(data) + 2
+        assert markdown_lines[2] == "| Соль <йодированная> & \\| крупная | Ингредиенты |"
+
+    # Проверим двоичный формат MessagePack
+    def test_equal_response_msgpack(self):
+        # Подготовка
+        settings = settings_model()
+        settings.response_format = ResponseFormat.MSGPACK
+        factory = factory_entities(settings)
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        storage = storage_model.create("Главный склад")
+        data = [transaction_model.create(datetime(2024, 1, 1 + index % 28, 12), nomenclature_model.create(
+            f"Номенклатура {index}", group, range_gram), storage, float(index - 300), "г") for index in range(600)]
+        logic = factory.create_default(data)
+
+        # Действие
+        result = logic.build(data)
+        decoded = msgpack_codec.decode(result)
+
+        # Проверка
+        assert isinstance(result, bytes)
+        assert len(decoded) == len(data)
+        assert decoded[0]["date"] == 1704110400
+        assert decoded[0]["nomenclature"] == data[0].nomenclature.unique_code
+        assert decoded[0]["storage"] == storage.unique_code
+        assert decoded[0]["quantity"] == -300.0
+        assert len(result) < len(factory.create("json").build(data).encode("utf-8")) / 2
+
+    # Проверим кодирование и декодирование MessagePack
+    def test_equal_msgpack_codec(self):
+        # Подготовка
+        values = [None, True, False, 0, 127, 128, 65536, 2 ** 40, -1, -33, -2 ** 40, 1.25, "",
+                  "а" * 40, "x" * 70000, b"\x01\x02", list(range(20)), {"ключ": [{"a": None}]}]
+
+        # Действие
+        result = [msgpack_codec.decode(msgpack_codec.encode(value)) for value in values]
+
+        # Проверка
+        assert result == values
+        assert msgpack_codec.encode({"a": 1, "b": [1, 2]}) == bytes.fromhex("82a16101a162920102")
+        with self.assertRaises(operation_exception):
+            msgpack_codec.decode(msgpack_codec.encode("строка")[:-1])
+
+    # Проверим ETag, условный запрос и сжатие ответа
+    def test_equal_http_cache(self):
+        # Подготовка
+        etag = http_cache.etag([1, 2], "/api/data/groups/json")
+        text = "строка;" * 1000
+        chunks = ["часть" * 100 for _ in range(10)]
+
+        # Действие
+        compressed, is_compressed = http_cache.compress(text)
+        streamed, is_streamed = http_cache.compress(iter(chunks))
+        small, is_small = http_cache.compress("мало")
+
+        # Проверка
+        assert etag == http_cache.etag([1, 2], "/api/data/groups/json")
+        assert etag != http_cache.etag([1, 3], "/api/data/groups/json")
+        # ETag зависит от эпохи процесса: те же версии в другом процессе дают другой ETag
+        parts = ([1, 2], "/api/data/groups/json")
+        assert etag[3:-1] == hashlib.sha1(json.dumps([http_cache.epoch(), parts]).encode("utf-8")).hexdigest()
+        assert etag[3:-1] != hashlib.sha1(json.dumps(["0" * 32, parts]).encode("utf-8")).hexdigest()
+        assert http_cache.matches(etag, etag)
+        assert http_cache.matches('"x", ' + etag[2:], etag)
+        assert http_cache.matches("*", etag)
+        assert not http_cache.matches(None, etag)
+        assert not http_cache.matches('W/"x"', etag)
+        assert http_cache.accepts_gzip("deflate, gzip;q=0.5")
+        assert not http_cache.accepts_gzip("gzip;q=0, br")
+        assert not http_cache.accepts_gzip(None)
+        assert is_compressed and gzip.decompress(compressed).decode("utf-8") == text
+        assert is_streamed and gzip.decompress(b"".join(streamed)).decode("utf-8") == "".join(chunks)
+        assert not is_small and small == "мало".encode("utf-8")
+
+
+    # Проверим нормализованный JSON: строки содержат коды, связанные модели выводятся один раз
+    def test_equal_response_json_normalized(self):
+        # Подготовка
+        group = group_model.create("Ингредиенты")
+        nomenclature = nomenclature_model.create("Мука", group, range_model.create("Грамм", 1, None))
+        storage = storage_model.create("Главный склад")
+        data = [transaction_model.create(datetime(2024, 1, day), nomenclature, storage, float(day), "г")
+                for day in range(1, 20)]
+        response = factory_entities(settings_model()).create("json")
+        response.normalized = True
+
+        # Действие
+        result = response.build(data)
+        document = json.loads(result)
+
+        # Проверка
+        assert result == json.dumps(document, ensure_ascii=False, indent=2)
+        assert len(document["data"]) == len(data)
+        assert document["data"][0]["nomenclature"] == nomenclature.unique_code
+        assert document["references"][nomenclature.unique_code]["group"] == group.unique_code
+        assert document["references"][storage.unique_code]["name"] == "Главный склад"
+        assert len(result) < len(factory_entities(settings_model()).create("json").build(data)) / 2
+
+    # Проверим потоковое чтение JSON при любой границе частей
+    def test_equal_json_stream_members(self):
+        # Подготовка
+        document = {"version": 123456, "items": [{"name": "элемент", "value": index * 1.5} for index in range(20)],
+                    "empty": [], "deleted": {"items": ["a", "b"]}}
+        text = json.dumps(document, ensure_ascii=False, indent=2)
+
+        for chunk_size in [1, 7, 64, 100000]:
+            # Действие
+            result = {}
+            for name, value, is_item in json_stream(io.StringIO(text), chunk_size).members():
+                if is_item:
+                    result.setdefault(name, []).append(value)
+                else:
+                    result[name] = value
+
+            # Проверка
+            assert result == {"version": 123456, "items": document["items"], "deleted": document["deleted"]}
+
+        with self.assertRaises(operation_exception):
+            list(json_stream(io.StringIO(text[:-10]), 16).members())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
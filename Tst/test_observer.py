@@ -4,6 +4,11 @@
 import unittest
 from Src.start_service import start_service
 from Src.Logics.reference_service import reference_service
+from Src.Logics.snapshot_service import snapshot_service
+from Src.Core.observe_service import observe_service
+from Src.Core.abstract_subscriber import abstract_subscriber
+from Src.Core.event_type import event_type
+from Src.reposity import reposity
 from Src.Core.validator import operation_exception
 
 class test_observer(unittest.TestCase):
@@ -40,5 +45,104 @@ class test_observer(unittest.TestCase):
             except operation_exception as e:
                 assert "Отказ в удалении" in str(e)
 
+    # Проверить, что снимок справочника переиспользуется и сбрасывается при добавлении элемента
+    def test_equal_snapshot_after_add_reference(self):
+        # Подготовка
+        start = start_service()
+        start.start()
+        references = reference_service()
+        snapshots = snapshot_service(start.data)
+        self.addCleanup(observe_service.delete, references)
+        self.addCleanup(observe_service.delete, snapshots)
+        before = snapshots.get(reposity.group_key(), "json")
+
+        # Действие
+        cached = snapshots.get(reposity.group_key(), "json")
+        reference_service.add(reposity.group_key(), {"id": "snapshot_group", "name": "Группа для снимка"})
+        after = snapshots.get(reposity.group_key(), "json")
+
+        # Проверки
+        assert cached is before
+        assert "Группа для снимка" not in before.decode("utf-8")
+        assert "Группа для снимка" in after.decode("utf-8")
+        assert snapshots.stats()["hits"] == 1
+
+    # Проверить, что событие получают только подписанные на него обработчики
+    def test_equal_dispatch_by_event_type(self):
+        # Подготовка
+        class info_subscriber(abstract_subscriber):
+            def __init__(self):
+                self.received = []
+
+            def events(self) -> list:
+                return [event_type.info()]
+
+            def handle(self, event: str, params):
+                super().handle(event, params)
+                self.received.append(params)
+
+        subscriber = info_subscriber()
+        observe_service.add(subscriber)
+        observe_service.add(subscriber)
+        self.addCleanup(observe_service.delete, subscriber)
+
+        # Действие
+        observe_service.create_event(event_type.info(), "сообщение")
+        observe_service.create_event(event_type.warning(), "предупреждение")
+
+        # Проверки
+        assert subscriber.received == ["сообщение"]
+        assert subscriber in observe_service.handlers(event_type.info())
+        assert subscriber not in observe_service.handlers(event_type.warning())
+        with self.assertRaises(operation_exception):
+            observe_service.create_event("unknown_event", None)
+
+    # Проверить граф обратных ссылок: зависимые модели и его обновление при изменении данных
+    def test_equal_dependents_graph(self):
+        # Подготовка
+        start = start_service()
+        start.start()
+        repo = start.data
+        transactions = repo.data[reposity.transaction_key()]
+        nomenclature = transactions[0].nomenclature
+        expected = [item for item in transactions if item.nomenclature is nomenclature]
+
+        # Действие
+        dependents = repo.dependents(nomenclature)
+        transactions.remove(expected[0])
+        after_remove = repo.dependents(nomenclature)
+        transactions.append(expected[0])
+        after_append = repo.dependents(nomenclature)
+
+        # Проверки
+        assert all(item in dependents for item in expected)
+        assert nomenclature not in dependents
+        assert len(after_remove) == len(dependents) - 1
+        assert expected[0] not in after_remove
+        assert len(after_append) == len(dependents)
+
+    # Проверить, что после переименования единицы измерения ссылки на нее остаются в графе
+    # Удаление переименованной единицы, на которую ссылается номенклатура, должно быть отклонено
+    def test_throw_delete_after_rename(self):
+        # Подготовка
+        service = reference_service()
+        self.addCleanup(observe_service.delete, service)
+        repo = reposity()
+        old_range = [item for item in repo.data[reposity.range_key()] if item.name == "Киллограмм"][0]
+        dependents = repo.dependents(old_range)
+
+        # Действие
+        reference_service.change("range", {"unique_code": old_range.unique_code, "name": "Килограмм"})
+        new_range = [item for item in repo.data[reposity.range_key()] if item.unique_code == old_range.unique_code][0]
+
+        # Проверки
+        assert new_range.name == "Килограмм"
+        assert len(dependents) > 0
+        assert len(repo.dependents(new_range)) == len(dependents)
+        assert all(item.range is new_range for item in repo.dependents(new_range))
+        with self.assertRaises(operation_exception):
+            reference_service.remove("range", {"unique_code": new_range.unique_code})
+        assert new_range in repo.data[reposity.range_key()]
+
 if __name__ == '__main__':
     unittest.main()
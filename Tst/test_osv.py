@@ -88,5 +88,52 @@ class test_osv(unittest.TestCase):
         assert report[0]["outcome"] == 0.0
         assert report[0]["end_balance"] == 0.0
 
+    def test_equal_osv_periods_with_single_reports(self):
+        """
+        Проверяет что сравнительная ОСВ по нескольким периодам
+        совпадает с отдельными отчетами по каждому периоду
+        """
+        repo = reposity()
+        repo.initalize()
+
+        storage = storage_model.create("Главный склад", "ул. Тестовая, 1")
+        other_storage = storage_model.create("Запасной склад", "ул. Тестовая, 2")
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model()
+        range_gram.name = "грамм"
+        range_gram.value = 1
+        nomenclature = nomenclature_model.create("Мука", group, range_gram)
+
+        repo.data[reposity.storage_key()] = [storage, other_storage]
+        repo.data[reposity.nomenclature_key()] = [nomenclature]
+        repo.data[reposity.transaction_key()] = [
+            transaction_model.create(datetime(2024, 9, 20), nomenclature, storage, 30.0, "г"),
+            transaction_model.create(datetime(2024, 10, 1), nomenclature, storage, 100.0, "г"),
+            transaction_model.create(datetime(2024, 10, 15), nomenclature, storage, -50.0, "г"),
+            transaction_model.create(datetime(2024, 11, 5), nomenclature, storage, -20.0, "г"),
+            transaction_model.create(datetime(2024, 11, 6), nomenclature, other_storage, 500.0, "г"),
+            transaction_model.create(datetime(2024, 12, 1), nomenclature, storage, 999.0, "г")
+        ]
+
+        service = osv_service(repo)
+        boundaries = [datetime(2024, 10, 1), datetime(2024, 11, 1), datetime(2024, 12, 1)]
+
+        report = service.generate_osv_report_periods(boundaries, storage.unique_code)
+
+        assert len(report) == 1
+        periods = report[0]["periods"]
+        assert len(periods) == 2
+        assert periods[0]["start_balance"] == 30.0
+        assert periods[0]["income"] == 100.0
+        assert periods[0]["outcome"] == 50.0
+        assert periods[0]["end_balance"] == 80.0
+        assert periods[1]["start_balance"] == 80.0
+        assert periods[1]["outcome"] == 20.0
+        assert periods[1]["end_balance"] == 60.0
+
+        single = service.generate_osv_report(datetime(2024, 11, 1), datetime(2024, 11, 30), storage.unique_code)
+        assert single[0]["start_balance"] == periods[1]["start_balance"]
+        assert single[0]["end_balance"] == periods[1]["end_balance"]
+
 if __name__ == '__main__':
     unittest.main()
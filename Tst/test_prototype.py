@@ -0,0 +1,188 @@
+import unittest
+from datetime import datetime, timedelta
+from Src.Core.prototype import prototype
+from Src.Dtos.filter_dto import filter_dto
+from Src.Dtos.filter_group_dto import filter_group_dto
+from Src.Core.validator import argument_exception
+from Src.Logics.response_csv import response_csv
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.Models.group_model import group_model
+from Src.Models.range_model import range_model
+
+"""
+Набор тестов для фильтрации данных через прототип
+"""
+class test_prototype(unittest.TestCase):
+
+    def _create_transactions(self, count: int = 200) -> list:
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        nomenclatures = [
+            nomenclature_model.create("Пшеничная мука", group, range_gram),
+            nomenclature_model.create("Сахар", group, range_gram),
+            nomenclature_model.create("Сливочное масло", group, range_gram)
+        ]
+        storage = storage_model.create("Главный склад", "ул. Тестовая, 1")
+
+        result = []
+        for index in range(count):
+            result.append(transaction_model.create(
+                datetime(2024, 1, 1) + timedelta(days=index),
+                nomenclatures[index % len(nomenclatures)],
+                storage,
+                float(index % 50 - 25),
+                "г"
+            ))
+        return result
+
+    def _filter(self, field_name: str, value: str, type_name: str) -> filter_dto:
+        return filter_dto().create({"field_name": field_name, "value": value, "type": type_name})
+
+    # Проверить совпадение скомпилированных фильтров с поэлементной проверкой
+    # Результаты должны совпадать для всех типов сравнения
+    def test_equal_prototype_filter_compiled_and_legacy(self):
+        # Подготовка
+        data = self._create_transactions()
+        filters_sets = [
+            [self._filter("nomenclature/name", "МУКА", "LIKE")],
+            [self._filter("quantity", "0", "GREATER"), self._filter("storage/name", "Главный склад", "EQUALS")],
+            [self._filter("quantity", "-10", "LESS_EQUAL"), self._filter("nomenclature/name", "Сахар", "NOT_EQUAL")],
+            [self._filter("nomenclature/group/name", "Ингредиенты", "EQUALS"), self._filter("unit", "г", "GREATER_EQUAL")],
+            [self._filter("missing/name", "x", "EQUALS")]
+        ]
+
+        for filters in filters_sets:
+            # Действие
+            expected = [item for item in data if all(prototype._apply_filter(item, f) for f in filters)]
+            result = prototype.filter(data, filters)
+
+            # Проверки
+            assert result == expected
+
+    # Проверить хронологическое сравнение дат
+    # Фильтр по дате должен отбирать элементы по времени, а не по строке
+    def test_notNone_prototype_filter_by_date(self):
+        # Подготовка
+        data = self._create_transactions(10)
+        filters = [self._filter("date", "2024-01-05T00:00:00", "GREATER_EQUAL"),
+                   self._filter("date", "2024-01-07", "LESS")]
+
+        # Действие
+        result = prototype.filter(data, filters)
+
+        # Проверки
+        assert len(result) == 2
+        assert result[0].date == datetime(2024, 1, 5)
+
+    # Проверить логические группы фильтров (И / ИЛИ / НЕ)
+    # Результат должен совпадать с поэлементной проверкой выражения
+    def test_equal_prototype_filter_groups(self):
+        # Подготовка
+        data = self._create_transactions(60)
+        expression = {
+            "operator": "AND",
+            "filters": [
+                {
+                    "operator": "OR",
+                    "filters": [
+                        {"field_name": "nomenclature/name", "value": "мука", "type": "LIKE"},
+                        {"field_name": "nomenclature/name", "value": "Сахар", "type": "EQUALS"}
+                    ]
+                },
+                {
+                    "operator": "NOT",
+                    "filters": [{"field_name": "quantity", "value": "0", "type": "LESS"}]
+                }
+            ]
+        }
+
+        # Действие
+        filters = filter_group_dto.parse(expression)
+        result = prototype.filter(data, filters)
+
+        # Проверки
+        expected = [item for item in data
+                    if item.nomenclature.name in ["Пшеничная мука", "Сахар"] and item.quantity >= 0]
+        assert len(filters) == 2
+        assert result == expected
+
+    # Проверить запоминание результатов по вложенным объектам, которые создаются при каждом обращении
+    # Освобожденный объект не должен подменять результат для нового объекта с тем же id
+    def test_equal_prototype_filter_transient_owner(self):
+        # Подготовка
+        class owner:
+            def __init__(self, name: str):
+                self.name = name
+
+        class item:
+            def __init__(self, name: str):
+                self.__name = name
+
+            @property
+            def owner(self):
+                return owner(self.__name)
+
+        data = [item("Сахар" if index % 2 == 0 else "Мука") for index in range(100)]
+
+        # Действие
+        result = prototype.filter(data, [self._filter("owner/name", "Сахар", "EQUALS")])
+
+        # Проверки
+        assert len(result) == 50
+        assert all(element.owner.name == "Сахар" for element in result)
+
+    # Проверить разбор некорректной группы
+    # NOT с несколькими условиями и неизвестный оператор должны вызывать исключение
+    def test_throw_prototype_filter_group_invalid(self):
+        # Подготовка
+        leaf = {"field_name": "quantity", "value": "0", "type": "LESS"}
+
+        # Проверки
+        with self.assertRaises(argument_exception):
+            filter_group_dto.parse({"operator": "NOT", "filters": [leaf, leaf]})
+        with self.assertRaises(argument_exception):
+            filter_group_dto.parse({"operator": "XOR", "filters": [leaf]})
+
+    # Проверить ленивый запрос к данным прототипа
+    # Результат должен совпадать с последовательной обработкой списков
+    def test_equal_prototype_query_lazy(self):
+        # Подготовка
+        data = self._create_transactions()
+        filters = [self._filter("nomenclature/name", "сахар", "LIKE")]
+        visited = []
+        query = prototype(data).query().where(lambda item: visited.append(item) or True).filter(filters)
+
+        # Действие
+        top = query.sort("quantity", True).limit(5).to_list()
+        sorted_all = query.sort("date", True).to_list()
+        first = query.map(lambda item: item.quantity).limit(3).to_list()
+        visited.clear()
+        query.limit(2).to_list()
+
+        # Проверки
+        filtered = prototype.filter(data, filters)
+        assert top == sorted(filtered, key=lambda item: item.quantity, reverse=True)[:5]
+        assert sorted_all == sorted(filtered, key=lambda item: item.date, reverse=True)
+        assert first == [item.quantity for item in filtered[:3]]
+        # Перебор прекращается после второго подходящего элемента
+        assert len(visited) == data.index(filtered[1]) + 1
+
+    # Проверить материализацию ленивого запроса форматом ответа
+    # Формат должен принимать запрос так же, как список
+    def test_equal_prototype_query_formatter(self):
+        # Подготовка
+        data = self._create_transactions(10)
+        query = prototype(data).query().filter([self._filter("quantity", "-20", "GREATER")]).limit(4)
+
+        # Действие
+        result = response_csv().build(query)
+
+        # Проверки
+        assert result == response_csv().build(query.to_list())
+        assert len(result.splitlines()) == 5
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,393 @@
+import unittest
+from datetime import datetime, timedelta
+from Src.Logics.query_planner import query_planner
+from Src.Core.filter_cache import filter_cache
+from Src.Core.prototype import prototype
+from Src.Core.query_view import query_view
+from Src.Logics.response_csv import response_csv
+from Src.Dtos.filter_dto import filter_dto
+from Src.Dtos.filter_group_dto import filter_group_dto
+from Src.reposity import reposity
+from Src.Core.validator import argument_exception
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.Models.group_model import group_model
+from Src.Models.range_model import range_model
+
+"""
+Набор тестов для планировщика фильтров и индексов репозитория
+"""
+class test_query_planner(unittest.TestCase):
+
+    def _create_data(self, repo, count: int = 300):
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        nomenclatures = [nomenclature_model.create(f"Номенклатура {i}", group, range_gram) for i in range(5)]
+        storages = [storage_model.create("Главный склад"), storage_model.create("Запасной склад")]
+
+        transactions = []
+        for index in range(count):
+            # Даты идут не по порядку, чтобы проверить упорядоченный индекс
+            transactions.append(transaction_model.create(
+                datetime(2024, 1, 1) + timedelta(days=(index * 7) % 365),
+                nomenclatures[index % len(nomenclatures)],
+                storages[index % len(storages)],
+                float(index % 40 - 20),
+                "г"
+            ))
+
+        repo.data[reposity.nomenclature_key()] = nomenclatures
+        repo.data[reposity.storage_key()] = storages
+        repo.data[reposity.transaction_key()] = transactions
+        return nomenclatures, storages
+
+    def _filter(self, field_name: str, value: str, type_name: str) -> filter_dto:
+        return filter_dto().create({"field_name": field_name, "value": value, "type": type_name})
+
+    # Проверить совпадение результата планировщика с последовательной фильтрацией
+    # Результат и порядок элементов должны совпадать
+    def test_equal_query_planner_and_prototype(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclatures, storages = self._create_data(repo)
+        planner = query_planner(repo)
+        data = repo.data[reposity.transaction_key()]
+        filters_sets = [
+            [self._filter("quantity", "0", "GREATER"),
+             self._filter("nomenclature/unique_code", nomenclatures[2].unique_code, "EQUALS")],
+            [self._filter("date", "2024-03-01", "GREATER_EQUAL"), self._filter("date", "2024-04-01", "LESS"),
+             self._filter("storage/unique_code", storages[1].unique_code, "EQUALS")],
+            [self._filter("date", "2024-06-01T00:00:00", "GREATER")],
+            [self._filter("unit", "г", "EQUALS"), self._filter("quantity", "5", "LESS_EQUAL")]
+        ]
+
+        for filters in filters_sets:
+            # Действие
+            result = planner.execute(reposity.transaction_key(), filters)
+
+            # Проверки
+            assert list(result) == prototype.filter(data, filters)
+
+    # Проверить выбор индекса в плане
+    # Для кода и диапазона дат должен использоваться индекс
+    def test_notNone_query_planner_explain(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclatures, _ = self._create_data(repo)
+        planner = query_planner(repo)
+
+        # Действие
+        _, hash_plan = planner.run(reposity.nomenclature_key(),
+                                   [self._filter("unique_code", nomenclatures[0].unique_code, "EQUALS")])
+        _, range_plan = planner.run(reposity.transaction_key(),
+                                    [self._filter("date", "2024-12-01", "GREATER"),
+                                     self._filter("nomenclature/name", "1", "LIKE"),
+                                     self._filter("quantity", "0", "NOT_EQUAL")])
+        _, scan_plan = planner.run(reposity.transaction_key(), [self._filter("quantity", "0", "GREATER")])
+
+        # Проверки
+        assert hash_plan["access"]["method"] == "hash_index"
+        assert hash_plan["result_rows"] == 1
+        assert range_plan["access"]["method"] == "range_index"
+        assert [item["type"] for item in range_plan["predicates"]] == ["LIKE", "NOT_EQUAL"]
+        assert scan_plan["access"]["method"] == "full_scan"
+
+    # Проверить актуальность индексов после изменения данных
+    # Добавленные и удаленные элементы должны учитываться
+    def test_equal_query_planner_after_changes(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclatures, storages = self._create_data(repo, 50)
+        planner = query_planner(repo)
+        transactions = repo.data[reposity.transaction_key()]
+        filters = [self._filter("nomenclature/unique_code", nomenclatures[0].unique_code, "EQUALS")]
+        before = len(planner.execute(reposity.transaction_key(), filters))
+
+        # Действие
+        transactions.append(transaction_model.create(datetime(2025, 1, 1), nomenclatures[0], storages[0], 1.0, "г"))
+        after_append = planner.execute(reposity.transaction_key(), filters)
+        transactions.remove(transactions[0])
+        after_remove = planner.execute(reposity.transaction_key(), filters)
+
+        # Проверки
+        assert len(after_append) == before + 1
+        assert len(after_remove) == before
+        assert list(after_remove) == prototype.filter(transactions, filters)
+
+    # Проверить поиск подстроки по наименованию через триграммный индекс
+    # Результат должен совпадать с прямым просмотром и учитывать изменения справочника
+    def test_equal_query_planner_like_trigram(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        names = ["Пшеничная мука", "Сахар", "Сахарная пудра", "Мука ржаная", "Соль", "Масло"]
+        repo.data[reposity.nomenclature_key()] = [nomenclature_model.create(name, group, range_gram) for name in names]
+        planner = query_planner(repo)
+        items = repo.data[reposity.nomenclature_key()]
+
+        # Действие
+        result, plan = planner.run(reposity.nomenclature_key(), [self._filter("name", "МУКА", "LIKE")])
+        items[1] = nomenclature_model.create("Мука овсяная", group, range_gram)
+        items.append(nomenclature_model.create("Мука кукурузная", group, range_gram))
+        changed = planner.execute(reposity.nomenclature_key(), [self._filter("name", "мука", "LIKE")])
+        short = planner.execute(reposity.nomenclature_key(), [self._filter("name", "ук", "LIKE")])
+
+        # Проверки
+        assert plan["access"]["method"] == "trigram_index"
+        assert [item.name for item in result] == ["Пшеничная мука", "Мука ржаная"]
+        assert [item.name for item in changed] == ["Пшеничная мука", "Мука овсяная", "Мука ржаная", "Мука кукурузная"]
+        assert list(short) == prototype.filter(items, [self._filter("name", "ук", "LIKE")])
+
+    # Проверить выполнение группы ИЛИ через объединение индексов
+    # Результат должен совпадать с последовательной фильтрацией
+    def test_equal_query_planner_or_union(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclatures, storages = self._create_data(repo)
+        planner = query_planner(repo)
+        data = repo.data[reposity.transaction_key()]
+        filters = filter_group_dto.parse([
+            {"operator": "OR", "filters": [
+                {"field_name": "nomenclature/unique_code", "value": nomenclatures[1].unique_code, "type": "EQUALS"},
+                {"operator": "AND", "filters": [
+                    {"field_name": "nomenclature/unique_code", "value": nomenclatures[3].unique_code, "type": "EQUALS"},
+                    {"field_name": "date", "value": "2024-07-01", "type": "GREATER_EQUAL"}
+                ]}
+            ]},
+            {"operator": "NOT", "filters": [
+                {"field_name": "storage/unique_code", "value": storages[0].unique_code, "type": "EQUALS"}
+            ]}
+        ])
+
+        # Действие
+        result, plan = planner.run(reposity.transaction_key(), filters)
+
+        # Проверки
+        assert plan["access"]["method"] == "index_union"
+        assert plan["predicates"][0]["operator"] == "NOT"
+        assert len(result) > 0
+        assert list(result) == prototype.filter(data, filters)
+
+    # Проверить кеширование результатов фильтрации
+    # Повтор запроса берется из кеша, изменение данных делает запись неактуальной
+    def test_equal_query_planner_cache(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclatures, storages = self._create_data(repo, 50)
+        cache = filter_cache(2)
+        planner = query_planner(repo, cache)
+        transactions = repo.data[reposity.transaction_key()]
+        filters = [self._filter("quantity", "0", "GREATER"),
+                   self._filter("nomenclature/unique_code", nomenclatures[0].unique_code, "EQUALS")]
+
+        # Действие
+        first, first_plan = planner.run(reposity.transaction_key(), filters)
+        second, second_plan = planner.run(reposity.transaction_key(), list(reversed(filters)))
+        transactions.append(transaction_model.create(datetime(2025, 1, 1), nomenclatures[0], storages[0], 1.0, "г"))
+        third, third_plan = planner.run(reposity.transaction_key(), filters)
+        planner.run(reposity.nomenclature_key(), [self._filter("name", "1", "LIKE")])
+        planner.run(reposity.storage_key(), [self._filter("name", "склад", "LIKE")])
+        stats = cache.stats()
+
+        # Проверки
+        assert first_plan["cache"] == "miss"
+        assert second_plan["cache"] == "hit"
+        assert isinstance(first, tuple)
+        assert second is first
+        assert third_plan["cache"] == "miss"
+        assert len(third) == len(first) + 1
+        assert list(third) == prototype.filter(transactions, filters)
+        assert stats["hits"] == 1
+        assert stats["size"] == 2
+        assert stats["evictions"] == 2
+        assert stats["rows"] <= stats["max_rows"]
+
+    # Проверить ограничение кеша фильтрации по общему количеству строк
+    # Записи вытесняются по объему, слишком большой результат не сохраняется
+    def test_equal_query_planner_cache_rows(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        self._create_data(repo, 50)
+        cache = filter_cache(16, 40)
+        planner = query_planner(repo, cache)
+        all_rows = [self._filter("quantity", "-100", "GREATER")]
+        main_storage = [self._filter("storage/name", "Главный склад", "EQUALS")]
+
+        # Действие
+        _, small_plan = planner.run(reposity.transaction_key(), main_storage)
+        _, large_plan = planner.run(reposity.transaction_key(), all_rows)
+        _, repeat_plan = planner.run(reposity.transaction_key(), all_rows)
+        cache.put(("a",), (), 30)
+        cache.put(("b",), (), 30)
+        stats = cache.stats()
+
+        # Проверки
+        assert small_plan["cache"] == "miss"
+        assert large_plan["cache"] == "skip"
+        assert repeat_plan["cache"] == "skip"
+        assert not cache.put(("c",), (), 41)
+        assert cache.get(("a",)) is None
+        assert cache.get(("b",)) == ()
+        assert stats["rows"] == 30
+        assert stats["size"] == 1
+        with self.assertRaises(argument_exception):
+            filter_cache(16, 0)
+
+    # Проверить постраничный вывод по упорядоченному индексу
+    # Страницы должны без пропусков и повторов покрывать отсортированные данные
+    def test_equal_query_planner_pages(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        self._create_data(repo, 95)
+        planner = query_planner(repo)
+        transactions = repo.data[reposity.transaction_key()]
+        filters = [self._filter("quantity", "0", "GREATER")]
+
+        # Действие
+        pages = []
+        cursor = None
+        while True:
+            items, cursor = planner.page(reposity.transaction_key(), filters, "-date", 10, cursor)
+            pages.append(items)
+            if cursor is None:
+                break
+
+        # Проверки
+        expected = sorted(prototype.filter(transactions, filters),
+                          key=lambda item: (item.date, item.unique_code), reverse=True)
+        assert [item for page in pages for item in page] == expected
+        assert all(len(page) == 10 for page in pages[:-1])
+
+    # Проверить постраничный вывод справочника по наименованию после изменений
+    # Замена и добавление элементов должны учитываться в упорядоченном индексе
+    def test_equal_query_planner_pages_after_changes(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        names = ["Соль", "Мука", "Сахар", "Масло", "Яйца"]
+        repo.data[reposity.nomenclature_key()] = [nomenclature_model.create(name, group, range_gram) for name in names]
+        planner = query_planner(repo)
+        items = repo.data[reposity.nomenclature_key()]
+        first, cursor = planner.page(reposity.nomenclature_key(), [], "name", 2)
+
+        # Действие
+        items[4] = nomenclature_model.create("Ваниль", group, range_gram)
+        items.append(nomenclature_model.create("Творог", group, range_gram))
+        second, cursor = planner.page(reposity.nomenclature_key(), [], None, 2, cursor)
+        third, cursor = planner.page(reposity.nomenclature_key(), [], None, 2, cursor)
+
+        # Проверки
+        assert [item.name for item in first] == ["Масло", "Мука"]
+        assert [item.name for item in second] == ["Сахар", "Соль"]
+        assert [item.name for item in third] == ["Творог"]
+        assert cursor is None
+        with self.assertRaises(argument_exception):
+            planner.page(reposity.nomenclature_key(), [], "unique_code", 2)
+        with self.assertRaises(argument_exception):
+            planner.page(reposity.nomenclature_key(), [], None, 2, "bad cursor")
+
+
+    # Проверить постраничный вывод при равных значениях поля сортировки и удалении элемента между страницами
+    # Страницы не должны пропускать и повторять элементы с одинаковой датой
+    def test_equal_query_planner_pages_equal_values_after_remove(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model.create_gramm()
+        nomenclature = nomenclature_model.create("Мука", group, range_gram)
+        storage = storage_model.create("Главный склад")
+        transactions = [transaction_model.create(datetime(2024, 1, 1 + index // 10), nomenclature, storage, 1.0, "г")
+                        for index in range(30)]
+        repo.data[reposity.transaction_key()] = transactions
+        expected = sorted(transactions, key=lambda item: (item.date, item.unique_code))
+        planner = query_planner(repo)
+        first, cursor = planner.page(reposity.transaction_key(), [], "date", 5)
+
+        # Действие
+        repo.data[reposity.transaction_key()].remove(first[0])
+        pages = [first]
+        while cursor is not None:
+            items, cursor = planner.page(reposity.transaction_key(), [], None, 5, cursor)
+            pages.append(items)
+
+        # Проверки
+        assert [item for page in pages for item in page] == expected
+
+    # Проверить постраничный вывод при повторяющихся кодах элементов
+    # Элементы с одинаковыми датой и кодом на границе страниц не должны пропускаться
+    def test_equal_query_planner_pages_duplicate_codes(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        nomenclature = nomenclature_model.create("Мука", group_model.create("Ингредиенты"), range_model.create_gramm())
+        storage = storage_model.create("Главный склад")
+        transactions = []
+        for index in range(24):
+            item = transaction_model.create(datetime(2024, 1, 1 + index % 2), nomenclature, storage, float(index), "г")
+            item.unique_code = "код" + str(index % 3)
+            transactions.append(item)
+        repo.data[reposity.transaction_key()] = transactions
+        planner = query_planner(repo)
+        planner.page(reposity.transaction_key(), [], "date", 5)
+
+        # Действие
+        replacement = transaction_model.create(datetime(2024, 1, 1), nomenclature, storage, 100.0, "г")
+        replacement.unique_code = "код0"
+        repo.data[reposity.transaction_key()][6] = replacement
+        result = {}
+        for order_by in ["date", "-date"]:
+            pages = []
+            cursor = None
+            while True:
+                items, cursor = planner.page(reposity.transaction_key(), [], order_by, 5, cursor)
+                pages.append(items)
+                if cursor is None:
+                    break
+            result[order_by] = [item.quantity for page in pages for item in page]
+
+        # Проверки
+        rows = sorted((item.date, item.unique_code, position, item.quantity)
+                      for position, item in enumerate(repo.data[reposity.transaction_key()]))
+        assert result["date"] == [row[3] for row in rows]
+        assert result["-date"] == [row[3] for row in reversed(rows)]
+
+    # Проверить выборку первых элементов по полю без упорядоченного индекса
+    # Результат - ленивый запрос, совпадающий с полной сортировкой отфильтрованных данных
+    def test_equal_query_planner_top(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        self._create_data(repo, 120)
+        planner = query_planner(repo)
+        transactions = repo.data[reposity.transaction_key()]
+        filters = [self._filter("storage/name", "Главный склад", "EQUALS")]
+
+        # Действие
+        view = planner.top(reposity.transaction_key(), filters, "-quantity", 7)
+        by_name = planner.top(reposity.transaction_key(), [], "nomenclature/name", 3).to_list()
+
+        # Проверки
+        expected = sorted(prototype.filter(transactions, filters), key=lambda item: item.quantity, reverse=True)
+        assert isinstance(view, query_view)
+        assert [item.quantity for item in view] == [item.quantity for item in expected[:7]]
+        assert all(item.storage.name == "Главный склад" for item in view)
+        assert [item.nomenclature.name for item in by_name] == ["Номенклатура 0"] * 3
+        assert response_csv().build(view) == response_csv().build(view.to_list())
+        with self.assertRaises(argument_exception):
+            planner.top(reposity.transaction_key(), [], "missing", 3)
+
+if __name__ == '__main__':
+    unittest.main()
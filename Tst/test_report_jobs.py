@@ -0,0 +1,100 @@
+import unittest
+from datetime import datetime
+from Src.Logics.report_job_service import report_job_service
+from Src.Logics.balance_service import balance_service
+from Src.Models.settings_model import settings_model
+from Src.Core.job_status import JobStatus
+from Src.Core.validator import operation_exception, argument_exception
+from Src.reposity import reposity
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.Models.group_model import group_model
+from Src.Models.range_model import range_model
+
+"""
+Набор тестов для сервиса фонового формирования отчетов
+"""
+class test_report_jobs(unittest.TestCase):
+
+    def _create_data(self, repo):
+        storage = storage_model.create("Главный склад", "ул. Тестовая, 1")
+        group = group_model.create("Ингредиенты")
+        range_gram = range_model()
+        range_gram.name = "грамм"
+        range_gram.value = 1
+        nomenclature = nomenclature_model.create("Мука", group, range_gram)
+
+        repo.data[reposity.storage_key()] = [storage]
+        repo.data[reposity.nomenclature_key()] = [nomenclature]
+        repo.data[reposity.transaction_key()] = [
+            transaction_model.create(datetime(2024, 10, 1), nomenclature, storage, 100.0, "г"),
+            transaction_model.create(datetime(2024, 10, 15), nomenclature, storage, -50.0, "г")
+        ]
+        return storage, nomenclature
+
+    # Проверить формирование отчета об остатках в фоне
+    # Результат должен совпадать с прямым расчетом
+    def test_equal_report_job_balance_result(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        self._create_data(repo)
+        settings = settings_model()
+        service = report_job_service(repo, settings)
+
+        # Действие
+        job = service.submit("balance", {"date": "2024-10-31"})
+        service.wait(job.unique_code, 10)
+
+        # Проверки
+        assert job.status == JobStatus.DONE
+        expected = balance_service(repo, settings).calculate_balance_with_block_period(datetime(2024, 10, 31))
+        assert service.result(job.unique_code) == expected
+        service.shutdown()
+
+    # Проверить переиспользование результата для одинаковых параметров
+    # Повторная постановка должна вернуть то же задание, пока данные не изменились
+    def test_reuse_report_job_same_params(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        storage, nomenclature = self._create_data(repo)
+        service = report_job_service(repo, settings_model())
+        params = {"date": "2024-10-31", "storage_id": storage.unique_code}
+
+        # Действие
+        first = service.submit("balance", params)
+        service.wait(first.unique_code, 10)
+        second = service.submit("balance", dict(params))
+        repo.data[reposity.transaction_key()].append(
+            transaction_model.create(datetime(2024, 10, 20), nomenclature, storage, 10.0, "г"))
+        third = service.submit("balance", dict(params))
+        service.wait(third.unique_code, 10)
+
+        # Проверки
+        assert first.unique_code == second.unique_code
+        assert first.unique_code != third.unique_code
+        assert service.result(third.unique_code)[0]["balance"] == 60.0
+        service.shutdown()
+
+    # Проверить обработку некорректных параметров и неизвестных заданий
+    # Должны возникать исключения
+    def test_throw_report_job_invalid(self):
+        # Подготовка
+        repo = reposity()
+        repo.initalize()
+        service = report_job_service(repo, settings_model())
+
+        # Действие и проверки
+        with self.assertRaises(argument_exception):
+            service.submit("unknown", {})
+        with self.assertRaises(argument_exception):
+            service.submit("osv", {"start_date": "2024-10-01"})
+        with self.assertRaises(operation_exception):
+            service.get("missing")
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,20 +10,29 @@ from Src.reposity import reposity
 from Src.Logics.convert_factory import convert_factory
 from Src.Logics.osv_service import osv_service
 from Src.Logics.export_service import export_service
+from Src.Logics.restore_service import restore_service
 from Src.settings_manager import settings_manager
 from Src.Core.validator import argument_exception, operation_exception
-from Src.Dtos.filter_dto import filter_dto
-from Src.Core.prototype import prototype
+from Src.Dtos.filter_group_dto import filter_group_dto
 from Src.Core.filter_type import FilterType
 from Src.Core.common import common
 from Src.Logics.balance_service import balance_service
 from Src.Logics.turnover_service import turnover_service
 from Src.Logics.reference_service import reference_service
+from Src.Logics.report_job_service import report_job_service
+from Src.Logics.query_planner import query_planner
+from Src.Core.filter_cache import filter_cache
+from Src.Core.field_projection import field_projection
+from Src.Logics.aggregation_service import aggregation_service
+from Src.Dtos.aggregation_dto import aggregation_dto
+from Src.Core.http_cache import http_cache
+from Src.Logics.snapshot_service import snapshot_service
 from Src.Core.observe_service import observe_service
 from Src.Core.event_type import event_type
 from Src.Dtos.block_date_dto import block_date_dto
 from datetime import datetime
 import json
+import os
 
 app = connexion.FlaskApp(__name__)
 
@@ -43,12 +52,91 @@ else:
 settings = settings_model()
 factory = factory_entities(settings)
 
+# Каталог резервных копий: файлы сохраняются и восстанавливаются только в нем
+backup_directory = os.path.abspath(".")
+
+# Ключ подписи резервных копий создается один раз и сохраняется между перезапусками
+backup_secret = export_service.load_secret(os.path.join(backup_directory, ".backup_secret"))
+
 osv_service_instance = osv_service(service.data)
-export_service_instance = export_service(service.data)
+export_service_instance = export_service(service.data, backup_secret)
+restore_service_instance = restore_service(service.data)
+
+# Общий пул процессов параллельного экспорта (количество процессов ограничено)
+export_workers = export_service.start_pool(os.cpu_count() or 1)
 balance_service_instance = balance_service(service.data, settings_mgr.settings)
 turnover_service_instance = turnover_service(service.data)
 
 reference_service_instance = reference_service()
+report_job_service_instance = report_job_service(service.data, settings_mgr.settings)
+filter_cache_instance = filter_cache(256)
+query_planner_instance = query_planner(service.data, filter_cache_instance)
+aggregation_service_instance = aggregation_service(service.data, query_planner_instance)
+snapshot_service_instance = snapshot_service(service.data)
+
+# Данные, от которых зависят ответы (служебный кэш оборотов не учитывается)
+response_data_keys = [
+    reposity.range_key(),
+    reposity.group_key(),
+    reposity.nomenclature_key(),
+    reposity.receipt_key(),
+    reposity.storage_key(),
+    reposity.transaction_key()
+]
+
+def response_etag(*parts) -> str:
+    """
+    ETag ответа по версиям данных, пути и параметрам запроса (с эпохой процесса - см. http_cache.etag)
+    """
+    versions = [service.data.version(key) for key in response_data_keys]
+    return http_cache.etag(versions, request.path, sorted(request.args.items(multi=True)), *parts)
+
+def is_normalized() -> bool:
+    """
+    Запрошен ли нормализованный вывод (?normalized=true)
+    """
+    return request.args.get('normalized', '').lower() in ['true', '1']
+
+def query_page(key: str, filters: list) -> tuple:
+    """
+    Страница данных по параметрам ?order_by=-date&limit=100&cursor=...
+    По полям с упорядоченным индексом - по индексу с курсором следующей страницы,
+    по остальным полям - ленивым запросом (query_view) без курсора
+    """
+    limit = request.args.get('limit', '100')
+    if not limit.isdigit():
+        raise argument_exception(f"Invalid limit: {limit}")
+
+    order_by = request.args.get('order_by')
+    cursor = request.args.get('cursor')
+    field = (order_by or "").lstrip("-").strip()
+    if (cursor is not None and cursor.strip() != "") or field == "" or field in reposity.indexed_fields(key)[1]:
+        return query_planner_instance.page(key, filters, order_by, int(limit), cursor)
+
+    return query_planner_instance.top(key, filters, order_by, int(limit)), None
+
+def not_modified(etag: str):
+    """
+    Ответ 304, если у клиента актуальная версия, иначе None
+    """
+    if http_cache.matches(request.headers.get("If-None-Match"), etag):
+        return Response(status=304, headers={"ETag": etag})
+    return None
+
+def cached_response(body, content_type: str, etag: str, status: int = 200, headers: dict = None) -> Response:
+    """
+    Ответ с ETag и сжатием gzip (если клиент его принимает и тело больше порога)
+    """
+    result_headers = dict(headers) if headers is not None else {}
+    result_headers["ETag"] = etag
+    result_headers["Vary"] = "Accept-Encoding"
+
+    if http_cache.accepts_gzip(request.headers.get("Accept-Encoding")):
+        body, compressed = http_cache.compress(body)
+        if compressed:
+            result_headers["Content-Encoding"] = "gzip"
+
+    return Response(body, status=status, content_type=content_type, headers=result_headers)
 
 @app.route("/api/accessibility", methods=['GET'])
 def accessibility():
@@ -58,7 +146,7 @@ def accessibility():
 def get_entities():
     return {
         "entities": ["ranges", "groups", "nomenclatures", "receipts", "storages", "transactions"],
-        "formats": ["csv", "markdown", "json", "xml"]
+        "formats": ["csv", "markdown", "json", "xml", "msgpack"]
     }
 
 @app.route("/api/data/<entity_type>/<format_type>", methods=['GET'])
@@ -75,47 +163,105 @@ def get_data(entity_type: str, format_type: str):
     if entity_type not in entity_map:
         return {"error": f"Unknown entity type: {entity_type}"}, 400
 
-    if format_type not in ["csv", "markdown", "json", "xml"]:
+    if format_type not in ["csv", "markdown", "json", "xml", "msgpack"]:
         return {"error": f"Unknown format type: {format_type}"}, 400
 
+    etag = response_etag()
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    content_types = {
+        "csv": "text/plain; charset=utf-8",
+        "markdown": "text/plain; charset=utf-8",
+        "json": "application/json; charset=utf-8",
+        "xml": "application/xml; charset=utf-8",
+        "msgpack": "application/x-msgpack"
+    }
+
+    # Полный список справочника отдается из готового снимка
+    if snapshot_service.supports(entity_map[entity_type]) and \
+            not any(request.args.get(name) for name in ['order_by', 'limit', 'cursor', 'fields', 'normalized']):
+        snapshot = snapshot_service_instance.get(entity_map[entity_type], format_type)
+        if snapshot is None:
+            return {"error": f"No data for entity: {entity_type}"}, 404
+        return cached_response(snapshot, content_types[format_type], etag)
+
     data = service.data.data.get(entity_map[entity_type], [])
 
     if not data:
         return {"error": f"No data for entity: {entity_type}"}, 404
 
+    # Постраничный вывод: ?order_by=-date&limit=100&cursor=...
+    headers = {}
+    source = data
+    if any(request.args.get(name) for name in ['order_by', 'limit', 'cursor']):
+        try:
+            data, next_cursor = query_page(entity_map[entity_type], [])
+        except (argument_exception, operation_exception) as e:
+            return {"error": str(e)}, 400
+
+        if isinstance(data, list) and not data:
+            return {"error": f"No data on page for entity: {entity_type}"}, 404
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = next_cursor
+
     settings.response_format = ResponseFormat(format_type)
     formatter = factory.create_default(data)
-    result = formatter.build(data)
 
-    content_types = {
-        "csv": "text/plain; charset=utf-8",
-        "markdown": "text/plain; charset=utf-8",
-        "json": "application/json; charset=utf-8",
-        "xml": "application/xml; charset=utf-8"
-    }
+    try:
+        # Проекция полей: ?fields=unique_code,name,group/name
+        projection = field_projection.parse(request.args.get('fields'))
+        if projection is not None:
+            projection.validate(source[0])
+        formatter.projection = projection
+
+        # Нормализованный JSON: ?normalized=true - связанные модели выводятся один раз по коду
+        if is_normalized():
+            if format_type != "json":
+                raise argument_exception("Normalized output is supported only for json format")
+            formatter.normalized = True
+    except argument_exception as e:
+        return {"error": str(e)}, 400
 
-    return Response(
-        result,
-        content_type=content_types.get(format_type, "text/plain")
-    )
+    # Ответ отдается частями по мере формирования (ленивый запрос выполняется здесь же)
+    try:
+        result = formatter.stream(data)
+    except operation_exception:
+        return {"error": f"No data on page for entity: {entity_type}"}, 404
+    except TypeError as e:
+        return {"error": f"Unsupported sort field: {str(e)}"}, 400
+
+    return cached_response(result, content_types.get(format_type, "text/plain"), etag, headers=headers)
 
 @app.route("/api/receipts", methods=['GET'])
 def get_receipts():
+    etag = response_etag()
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     receipts = service.data.data.get(reposity.receipt_key(), [])
-    factory_conv = convert_factory()
+    factory_conv = convert_factory(is_normalized())
 
     result = []
     for receipt in receipts:
         converted_data = factory_conv.convert(receipt)
         result.append(converted_data)
 
-    return Response(
-        json.dumps(result, ensure_ascii=False, indent=2),
-        content_type="application/json; charset=utf-8"
-    )
+    if factory_conv.normalized:
+        result = {"data": result, "references": factory_conv.references}
+
+    return cached_response(json.dumps(result, ensure_ascii=False, indent=2),
+                           "application/json; charset=utf-8", etag)
 
 @app.route("/api/receipt/<receipt_id>", methods=['GET'])
 def get_receipt(receipt_id: str):
+    etag = response_etag()
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     receipts = service.data.data.get(reposity.receipt_key(), [])
     factory_conv = convert_factory()
 
@@ -130,10 +276,8 @@ def get_receipt(receipt_id: str):
 
     converted_data = factory_conv.convert(found_receipt)
 
-    return Response(
-        json.dumps(converted_data, ensure_ascii=False, indent=2),
-        content_type="application/json; charset=utf-8"
-    )
+    return cached_response(json.dumps(converted_data, ensure_ascii=False, indent=2),
+                           "application/json; charset=utf-8", etag)
 
 @app.route("/api/reports/osv", methods=['GET'])
 def get_osv_report():
@@ -151,12 +295,44 @@ def get_osv_report():
         return {"error": f"Invalid date format: {str(e)}"}, 400
 
     try:
+        etag = response_etag()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
         report_data = osv_service_instance.generate_osv_report(start_date, end_date, storage_id)
 
-        return Response(
-            json.dumps(report_data, ensure_ascii=False, indent=2),
-            content_type="application/json; charset=utf-8"
-        )
+        return cached_response(json.dumps(report_data, ensure_ascii=False, indent=2),
+                               "application/json; charset=utf-8", etag)
+
+    except operation_exception as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        return {"error": f"Internal server error: {str(e)}"}, 500
+
+@app.route("/api/reports/osv/periods", methods=['GET'])
+def get_osv_report_periods():
+    boundaries_str = request.args.get('boundaries')
+    storage_id = request.args.get('storage_id')
+
+    if not all([boundaries_str, storage_id]):
+        return {"error": "Missing required parameters: boundaries, storage_id"}, 400
+
+    try:
+        boundaries = [datetime.fromisoformat(item.strip()) for item in boundaries_str.split(",")]
+    except ValueError as e:
+        return {"error": f"Invalid date format: {str(e)}"}, 400
+
+    try:
+        etag = response_etag()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        report_data = osv_service_instance.generate_osv_report_periods(boundaries, storage_id)
+
+        return cached_response(json.dumps(report_data, ensure_ascii=False, indent=2),
+                               "application/json; charset=utf-8", etag)
 
     except operation_exception as e:
         return {"error": str(e)}, 400
@@ -165,15 +341,33 @@ def get_osv_report():
 
 @app.route("/api/save-to-file", methods=['POST', 'GET'])
 def save_to_file():
-    filename = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    # Инкрементальная копия (изменения после предыдущей): ?incremental=true
+    # Без полной копии в текущем сеансе (или восстановления из цепочки копий) сохраняется полная
+    incremental = request.args.get('incremental', '').lower() in ['true', '1'] and export_service_instance.has_base
+    prefix = "backup_inc" if incremental else "backup"
+    # Время с микросекундами: имена копий не совпадают даже при нескольких сохранениях в секунду
+    filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json"
+
+    # Сжатие файла: ?compress=true
+    compress = request.args.get('compress', '').lower() in ['true', '1']
+    if compress:
+        filename += ".gz"
 
     try:
-        success = export_service_instance.export_all_data(filename)
+        path = os.path.join(backup_directory, filename)
+        if incremental:
+            success = export_service_instance.export_changes(path, compress)
+        else:
+            # Параллельная конвертация больших разделов по процессам: ?parallel=true
+            parallel = request.args.get('parallel', '').lower() in ['true', '1']
+            workers = export_workers if parallel else 1
+            success = export_service_instance.export_all_data(path, compress, workers)
 
         if success:
             return {
                 "message": f"Data saved to {filename}",
                 "filename": filename,
+                "type": "incremental" if incremental else "full",
                 "success": True
             }
         else:
@@ -182,6 +376,76 @@ def save_to_file():
     except Exception as e:
         return {"error": str(e), "success": False}, 500
 
+@app.route("/api/restore-from-file", methods=['POST'])
+def restore_from_file():
+    try:
+        data = request.get_json()
+
+        if not isinstance(data, dict) or 'base' not in data:
+            return Response(
+                json.dumps({
+                    "success": False,
+                    "error": "Missing base parameter"
+                }, ensure_ascii=False),
+                status=400,
+                content_type="application/json; charset=utf-8"
+            )
+
+        # Имена полной копии и цепочки инкрементальных копий в порядке создания (только из каталога копий)
+        increments = data.get('increments', [])
+        if not isinstance(data['base'], str) or not isinstance(increments, list):
+            raise argument_exception("Expected backup file names")
+        base = restore_service.backup_file(backup_directory, data['base'])
+        increments = [restore_service.backup_file(backup_directory, name) for name in increments]
+
+        # Доверенный режим (без проверок в свойствах) - только для копий с верной подписью сервера
+        # (записаны сервисом экспорта и не изменялись, в том числе до перезапуска); клиент его не выбирает
+        trusted = all(export_service_instance.produced(path) for path in [base] + increments)
+        counts = restore_service_instance.restore(base, increments, trusted)
+
+        # Данные соответствуют последней копии цепочки - следующие копии могут быть инкрементальными
+        export_service_instance.resume(restore_service_instance.header)
+
+        return Response(
+            json.dumps({
+                "success": True,
+                "restored": counts
+            }, ensure_ascii=False, indent=2),
+            status=200,
+            content_type="application/json; charset=utf-8"
+        )
+
+    except (operation_exception, argument_exception) as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=400,
+            content_type="application/json; charset=utf-8"
+        )
+    except Exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": f"Internal server error: {str(e)}"
+            }, ensure_ascii=False),
+            status=500,
+            content_type="application/json; charset=utf-8"
+        )
+
+@app.route("/api/cache/stats", methods=['GET'])
+def get_cache_stats():
+    return Response(
+        json.dumps({
+            "success": True,
+            "filter_cache": filter_cache_instance.stats(),
+            "snapshots": snapshot_service_instance.stats()
+        }, ensure_ascii=False, indent=2),
+        status=200,
+        content_type="application/json; charset=utf-8"
+    )
+
 @app.route("/api/filters/<model_type>", methods=['GET'])
 def get_filters_by_model(model_type: str):
     model_map = {
@@ -235,11 +499,11 @@ def get_data_filtered(model_type: str, format_type: str):
     try:
         filters_data = request.get_json()
 
-        if not filters_data or not isinstance(filters_data, list):
+        if not filters_data or not isinstance(filters_data, (list, dict)):
             return Response(
                 json.dumps({
                     "success": False,
-                    "error": "Expected array of filters in request body"
+                    "error": "Expected array of filters or filter group in request body"
                 }, ensure_ascii=False),
                 status=400,
                 content_type="application/json; charset=utf-8"
@@ -264,7 +528,7 @@ def get_data_filtered(model_type: str, format_type: str):
                 content_type="application/json; charset=utf-8"
             )
 
-        if format_type not in ["csv", "markdown", "json", "xml"]:
+        if format_type not in ["csv", "markdown", "json", "xml", "msgpack"]:
             return Response(
                 json.dumps({
                     "success": False,
@@ -274,6 +538,11 @@ def get_data_filtered(model_type: str, format_type: str):
                 content_type="application/json; charset=utf-8"
             )
 
+        etag = response_etag(request.get_data(as_text=True))
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
         data_key = model_map[model_type]
         data = service.data.data.get(data_key, [])
 
@@ -287,30 +556,80 @@ def get_data_filtered(model_type: str, format_type: str):
                 content_type="application/json; charset=utf-8"
             )
 
-        filters = []
-        for filter_item in filters_data:
-            filter_dto_obj = filter_dto().create(filter_item)
-            filters.append(filter_dto_obj)
+        # Массив - условия по И, объект - группа условий (AND / OR / NOT)
+        filters = filter_group_dto.parse(filters_data)
+
+        # Постраничный вывод: ?order_by=-date&limit=100&cursor=...
+        headers = {}
+        plan = None
+        if any(request.args.get(name) for name in ['order_by', 'limit', 'cursor']):
+            filtered_data, next_cursor = query_page(data_key, filters)
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
 
-        filtered_data = prototype.filter(data, filters)
+            if isinstance(filtered_data, list) and len(filtered_data) == 0:
+                return Response(
+                    json.dumps({
+                        "success": True,
+                        "count": 0,
+                        "data": []
+                    }, ensure_ascii=False),
+                    content_type="application/json; charset=utf-8"
+                )
+        else:
+            filtered_data, plan = query_planner_instance.run(data_key, filters)
+
+        if request.args.get('explain', '').lower() in ['true', '1'] and plan is not None:
+            return Response(
+                json.dumps({
+                    "success": True,
+                    "count": len(filtered_data),
+                    "plan": plan
+                }, ensure_ascii=False, indent=2),
+                content_type="application/json; charset=utf-8"
+            )
 
         settings.response_format = ResponseFormat(format_type)
         formatter = factory.create_default(filtered_data)
-        result = formatter.build(filtered_data)
+
+        # Проекция полей: ?fields=unique_code,name,group/name
+        projection = field_projection.parse(request.args.get('fields'))
+        if projection is not None:
+            projection.validate(data[0])
+        formatter.projection = projection
+
+        # Нормализованный JSON: ?normalized=true - связанные модели выводятся один раз по коду
+        if is_normalized():
+            if format_type != "json":
+                raise argument_exception("Normalized output is supported only for json format")
+            formatter.normalized = True
+
+        # Ответ отдается частями по мере формирования (ленивый запрос выполняется здесь же)
+        try:
+            result = formatter.stream(filtered_data)
+        except operation_exception:
+            if isinstance(filtered_data, (list, tuple)):
+                raise
+            return Response(
+                json.dumps({
+                    "success": True,
+                    "count": 0,
+                    "data": []
+                }, ensure_ascii=False),
+                content_type="application/json; charset=utf-8"
+            )
 
         content_types = {
             "csv": "text/plain; charset=utf-8",
             "markdown": "text/plain; charset=utf-8",
             "json": "application/json; charset=utf-8",
-            "xml": "application/xml; charset=utf-8"
+            "xml": "application/xml; charset=utf-8",
+            "msgpack": "application/x-msgpack"
         }
 
-        return Response(
-            result,
-            content_type=content_types.get(format_type, "text/plain")
-        )
+        return cached_response(result, content_types.get(format_type, "text/plain"), etag, headers=headers)
 
-    except operation_exception as e:
+    except (operation_exception, argument_exception) as e:
         return Response(
             json.dumps({
                 "success": False,
@@ -334,33 +653,37 @@ def get_osv_report_with_filters():
     try:
         filters_data = request.get_json()
 
-        if not filters_data or not isinstance(filters_data, list):
+        if not filters_data or not isinstance(filters_data, (list, dict)):
             return Response(
                 json.dumps({
                     "success": False,
-                    "error": "Expected array of filters in request body"
+                    "error": "Expected array of filters or filter group in request body"
                 }, ensure_ascii=False),
                 status=400,
                 content_type="application/json; charset=utf-8"
             )
 
-        filters = []
-        for filter_item in filters_data:
-            filter_dto_obj = filter_dto().create(filter_item)
-            filters.append(filter_dto_obj)
+        etag = response_etag(request.get_data(as_text=True))
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        # Массив - условия по И, объект - группа условий (AND / OR / NOT)
+        filters = filter_group_dto.parse(filters_data)
 
         report_data = osv_service_instance.generate_osv_report_with_filters(filters)
 
-        return Response(
+        return cached_response(
             json.dumps({
                 "success": True,
                 "count": len(report_data),
                 "data": report_data
             }, ensure_ascii=False, indent=2),
-            content_type="application/json; charset=utf-8"
+            "application/json; charset=utf-8",
+            etag
         )
 
-    except operation_exception as e:
+    except (operation_exception, argument_exception) as e:
         return Response(
             json.dumps({
                 "success": False,
@@ -490,21 +813,29 @@ def get_balances():
         
         try:
             target_date = datetime.fromisoformat(date_str)
+
+            # Остатки зависят еще от даты блокировки и сохраненных оборотов
+            turnovers_file = "turnovers_cache.json"
+            turnovers_mtime = os.path.getmtime(turnovers_file) if os.path.exists(turnovers_file) else None
+            etag = response_etag(settings_mgr.settings.block_period, turnovers_mtime)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
             
-            turnover_service_instance.load_turnovers_from_file("turnovers_cache.json")
+            turnover_service_instance.load_turnovers_from_file(turnovers_file)
             
             balances = balance_service_instance.calculate_balance_with_block_period(
                 target_date, storage_id
             )
             
-            return Response(
+            return cached_response(
                 json.dumps({
                     "success": True,
                     "count": len(balances),
                     "data": balances
                 }, ensure_ascii=False, indent=2),
-                status=200,
-                content_type="application/json; charset=utf-8"
+                "application/json; charset=utf-8",
+                etag
             )
             
         except ValueError as e:
@@ -536,6 +867,192 @@ def get_balances():
             content_type="application/json; charset=utf-8"
         )
 
+@app.route("/api/aggregate/<model_type>", methods=['POST'])
+def get_aggregate(model_type: str):
+    try:
+        request_data = request.get_json()
+
+        if not isinstance(request_data, dict):
+            return Response(
+                json.dumps({
+                    "success": False,
+                    "error": "Expected object with filters, group_by and aggregates in request body"
+                }, ensure_ascii=False),
+                status=400,
+                content_type="application/json; charset=utf-8"
+            )
+
+        model_map = {
+            "ranges": reposity.range_key(),
+            "groups": reposity.group_key(),
+            "nomenclatures": reposity.nomenclature_key(),
+            "receipts": reposity.receipt_key(),
+            "storages": reposity.storage_key(),
+            "transactions": reposity.transaction_key()
+        }
+
+        if model_type not in model_map:
+            return Response(
+                json.dumps({
+                    "success": False,
+                    "error": f"Unknown model type: {model_type}. Available: {list(model_map.keys())}"
+                }, ensure_ascii=False),
+                status=400,
+                content_type="application/json; charset=utf-8"
+            )
+
+        aggregation = aggregation_dto().create(request_data)
+        rows = aggregation_service_instance.aggregate(model_map[model_type], aggregation)
+
+        return Response(
+            json.dumps({
+                "success": True,
+                "count": len(rows),
+                "data": rows
+            }, ensure_ascii=False, indent=2),
+            content_type="application/json; charset=utf-8"
+        )
+
+    except (operation_exception, argument_exception) as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=400,
+            content_type="application/json; charset=utf-8"
+        )
+    except Exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": f"Internal server error: {str(e)}"
+            }, ensure_ascii=False),
+            status=500,
+            content_type="application/json; charset=utf-8"
+        )
+
+@app.route("/api/reports/jobs", methods=['POST'])
+def submit_report_job():
+    """
+    Поставить тяжелый отчет (osv, balance) в очередь на формирование
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'report' not in data:
+            return Response(
+                json.dumps({
+                    "success": False,
+                    "error": "Missing report parameter"
+                }, ensure_ascii=False),
+                status=400,
+                content_type="application/json; charset=utf-8"
+            )
+
+        job = report_job_service_instance.submit(data['report'], data.get('params', {}))
+
+        return Response(
+            json.dumps({
+                "success": True,
+                "job_id": job.unique_code,
+                "status": job.status.value
+            }, ensure_ascii=False),
+            status=202,
+            content_type="application/json; charset=utf-8"
+        )
+
+    except argument_exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=400,
+            content_type="application/json; charset=utf-8"
+        )
+    except Exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": f"Internal server error: {str(e)}"
+            }, ensure_ascii=False),
+            status=500,
+            content_type="application/json; charset=utf-8"
+        )
+
+@app.route("/api/reports/jobs/<job_id>", methods=['GET'])
+def get_report_job(job_id: str):
+    """
+    Получить состояние задания формирования отчета
+    """
+    try:
+        job = report_job_service_instance.get(job_id)
+
+        return Response(
+            json.dumps({
+                "success": True,
+                "job_id": job.unique_code,
+                "report": job.report_type,
+                "status": job.status.value,
+                "error": job.error,
+                "created_at": job.created_at.isoformat(),
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None
+            }, ensure_ascii=False),
+            status=200,
+            content_type="application/json; charset=utf-8"
+        )
+
+    except operation_exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=404,
+            content_type="application/json; charset=utf-8"
+        )
+
+@app.route("/api/reports/jobs/<job_id>/result", methods=['GET'])
+def get_report_job_result(job_id: str):
+    """
+    Получить результат завершенного задания формирования отчета
+    """
+    try:
+        report_job_service_instance.get(job_id)
+    except operation_exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=404,
+            content_type="application/json; charset=utf-8"
+        )
+
+    try:
+        result = report_job_service_instance.result(job_id)
+
+        return Response(
+            json.dumps({
+                "success": True,
+                "count": len(result),
+                "data": result
+            }, ensure_ascii=False, indent=2, default=str),
+            status=200,
+            content_type="application/json; charset=utf-8"
+        )
+
+    except operation_exception as e:
+        return Response(
+            json.dumps({
+                "success": False,
+                "error": str(e)
+            }, ensure_ascii=False),
+            status=409,
+            content_type="application/json; charset=utf-8"
+        )
+
 @app.route("/api/reference/<reference_type>", methods=['GET'])
 def get_reference(reference_type: str):
     """